@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+from typing import Dict, List
+
+from .. import ETL_DIR
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Startup commands
+###########################################################################################################################################
+
+# Directory above the ETL package, put on PYTHONPATH so the stage modules import as ETL.<stage>
+PACKAGE_ROOT = os.path.dirname(ETL_DIR)
+
+# Command line invocations that should start without loading the stages they do not run
+START_ETL_COMMANDS = {
+    "--help": ["--help"],
+    "models --dry-run": ["models", "--dry-run"],
+    "load --dry-run": ["load", "--dry-run"],
+}
+
+# Stage modules imported on their own, as the stages of Start_ETL import them
+STAGE_MODULES = [
+    "ETL.Extract_API_NHL_Data.API_Web_Scraper_NHL",
+    "ETL.Transform_Load.Transform_Load_NHL",
+    "ETL.Create_Cumulative_Data_Model.Create_Cumulative_Models",
+]
+
+# Heavy third-party modules reported for each stage module
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "requests", "lxml", "psycopg2"]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Timed subprocesses
+###########################################################################################################################################
+
+
+def time_process(args: List[str], cwd: str, repeat: int) -> float:
+    """
+    Times a fresh Python process, so every run pays the full import cost.
+
+    Args:
+        args (List[str]): The arguments passed to the Python interpreter.
+        cwd (str): The working directory of the process.
+        repeat (int): The number of timed runs; the fastest is reported.
+
+    Returns:
+        float: The fastest run in milliseconds.
+    """
+    env = dict(os.environ, PYTHONPATH=PACKAGE_ROOT)
+
+    def run() -> None:
+        subprocess.run(
+            [sys.executable] + args,
+            cwd=cwd,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    return min(timeit.repeat(run, number=1, repeat=repeat)) * 1000
+
+
+def loaded_heavy_modules(module: str, cwd: str) -> List[str]:
+    """
+    Imports a module in a fresh Python process and lists the heavy modules it loaded.
+
+    Args:
+        module (str): The dotted module name.
+        cwd (str): The working directory of the process.
+
+    Returns:
+        List[str]: The entries of HEAVY_MODULES in the process's sys.modules.
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=dict(os.environ, PYTHONPATH=PACKAGE_ROOT),
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    return output.split(",") if output else []
+
+
+def benchmark(repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmarks the startup of the ETL from a directory outside the repository:
+      - commands: Start_ETL.py run as a script with --help and single-stage dry runs.
+      - imports: each stage module imported on its own, with the heavy modules it loads.
+
+    The bare interpreter start is reported as the floor of both.
+
+    Args:
+        repeat (int): The number of timed runs; the fastest is reported.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The timings of each scenario in milliseconds.
+    """
+    start_etl = os.path.join(ETL_DIR, "Start_ETL.py")
+    timings: Dict[str, Dict[str, float]] = {"commands": {}, "imports": {}}
+
+    with tempfile.TemporaryDirectory() as cwd:
+        interpreter = time_process(["-c", "pass"], cwd=cwd, repeat=repeat)
+        print(f"{'interpreter':>60}: {interpreter:8.1f} ms")
+
+        print("commands: python ETL/Start_ETL.py ...")
+        for name, args in START_ETL_COMMANDS.items():
+            milliseconds = time_process([start_etl] + args, cwd=cwd, repeat=repeat)
+            timings["commands"][name] = milliseconds
+            print(f"{name:>60}: {milliseconds:8.1f} ms")
+
+        print("imports: python -c 'import ...'")
+        for module in STAGE_MODULES:
+            milliseconds = time_process(
+                ["-c", f"import {module}"], cwd=cwd, repeat=repeat
+            )
+            timings["imports"][module] = milliseconds
+            heavy = loaded_heavy_modules(module, cwd=cwd)
+            print(
+                f"{module:>60}: {milliseconds:8.1f} ms  [{', '.join(heavy) or 'none'}]"
+            )
+
+    timings["interpreter"] = {"pass": interpreter}
+
+    return timings
+
+
+if __name__ == "__main__":
+    benchmark()
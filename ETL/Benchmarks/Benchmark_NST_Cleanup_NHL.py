@@ -0,0 +1,217 @@
+import timeit
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..Extract_API_NHL_Data.Normalize_Data_NHL import normalize_nst_data
+from ..Extract_API_NHL_Data.Table_Parser_NHL import typed_column
+from ..SQL_Queries.Season_Stats_Columns_NHL import (
+    nst_numeric_columns,
+    nst_percentage_columns,
+)
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Synthetic naturalstattrick frame
+###########################################################################################################################################
+
+# Team names including the accents and periods the cleanup removes
+TEAM_NAMES = [
+    "Montréal Canadiens",
+    "St. Louis Blues",
+    "Boston Bruins",
+    "Toronto Maple Leafs",
+    "Edmonton Oilers",
+    "Tampa Bay Lightning",
+    "Colorado Avalanche",
+    "New York Rangers",
+]
+
+
+def synthetic_nst_frame(
+    seasons: int = 100, teams: int = 32, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Builds a renamed naturalstattrick.com frame of text cells, as scraped, with one row per team,
+    season and game type. About 2% of the stat cells are missing ('-').
+
+    Args:
+        seasons (int): The number of seasons.
+        teams (int): The number of teams per season.
+        seed (int): The random seed.
+
+    Returns:
+        pd.DataFrame: The synthetic frame.
+    """
+    rng = np.random.default_rng(seed)
+    rows = seasons * teams * 2
+    df = pd.DataFrame(
+        {
+            "team": [
+                f"{TEAM_NAMES[i % len(TEAM_NAMES)]} {i // len(TEAM_NAMES)}"
+                for i in range(teams)
+            ]
+            * seasons
+            * 2,
+            "season": np.repeat(
+                [f"{year}{year + 1}" for year in range(1925, 1925 + seasons)] * 2,
+                teams,
+            ),
+            "game_type": np.repeat(["Regular Season", "Playoffs"], seasons * teams),
+            "time_on_ice": ["3952:31"] * rows,
+        }
+    )
+    for column in nst_numeric_columns():
+        cells = np.round(rng.uniform(0, 100, rows), 2).astype(str).astype(object)
+        cells[rng.random(rows) < 0.02] = "-"
+        df[column] = cells
+
+    return df
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Previous cleanups
+###########################################################################################################################################
+
+
+def text_loop_cleanup(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The original cleanup of scraped text cells: percentage columns converted one at a time
+    (astype(str) -> str.replace('-', '0') -> astype(float) -> / 100) and team names rewritten
+    with one str.replace pass per character.
+
+    Args:
+        df (pd.DataFrame): The renamed naturalstattrick.com frame of text cells.
+
+    Returns:
+        pd.DataFrame: The cleaned frame.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col.endswith("_pct"):
+            df[col] = df[col].astype(str)
+            df[col] = df[col].str.replace("-", "0")
+            df[col] = df[col].astype(float)
+            df[col] = df[col] / 100
+    df["team"] = df["team"].str.replace("é", "e")
+    df["team"] = df["team"].str.replace(".", "")
+    df["season"] = df["season"].astype(str)
+
+    return df
+
+
+def typed_loop_cleanup(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The cleanup extract() used on the table parser's typed frame before normalize_nst_data:
+    percentage columns converted one at a time and team names rewritten one character at a time.
+
+    Args:
+        df (pd.DataFrame): The renamed, typed naturalstattrick.com frame.
+
+    Returns:
+        pd.DataFrame: The cleaned frame.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if col.endswith("_pct"):
+            df[col] = df[col].fillna(0) / 100
+    df["team"] = df["team"].str.replace("é", "e")
+    df["team"] = df["team"].str.replace(".", "")
+    df["season"] = df["season"].astype(str)
+
+    return df
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Run benchmark
+###########################################################################################################################################
+
+
+def time_cleanup(
+    name: str,
+    df: pd.DataFrame,
+    loop_cleanup: Callable[[pd.DataFrame], pd.DataFrame],
+    numeric_columns: List[str],
+    repeat: int,
+) -> Dict[str, float]:
+    """
+    Times a loop cleanup against normalize_nst_data on the same frame and checks both agree on the
+    percentage columns and merge keys.
+
+    Args:
+        name (str): The scenario name printed with the timings.
+        df (pd.DataFrame): The renamed naturalstattrick.com frame.
+        loop_cleanup (Callable[[pd.DataFrame], pd.DataFrame]): The previous cleanup.
+        numeric_columns (List[str]): The stats normalize_nst_data parses.
+        repeat (int): The number of timed runs; the fastest is reported.
+
+    Returns:
+        Dict[str, float]: The fastest run of each cleanup in milliseconds.
+    """
+    compared = nst_percentage_columns() + ["team", "season"]
+    pd.testing.assert_frame_equal(
+        loop_cleanup(df)[compared].astype({"season": "int64"}),
+        normalize_nst_data(df, numeric_columns=numeric_columns)[compared],
+        check_dtype=False,
+    )
+
+    timings = {
+        "loop": min(timeit.repeat(lambda: loop_cleanup(df), number=1, repeat=repeat)),
+        "vectorized": min(
+            timeit.repeat(
+                lambda: normalize_nst_data(df, numeric_columns=numeric_columns),
+                number=1,
+                repeat=repeat,
+            )
+        ),
+    }
+    timings = {key: seconds * 1000 for key, seconds in timings.items()}
+
+    print(f"{name}: {df.shape[0]} rows x {df.shape[1]} columns")
+    for key, milliseconds in timings.items():
+        print(f"{key:>12}: {milliseconds:8.1f} ms")
+    print(f"{'speedup':>12}: {timings['loop'] / timings['vectorized']:8.1f}x")
+
+    return timings
+
+
+def benchmark(seasons: int = 100, repeat: int = 7) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmarks the naturalstattrick.com cleanup on a synthetic frame in two scenarios:
+      - typed: the frame as parse_team_table returns it (the input extract() sees), against the
+        previous per-column loop, with every registry stat parsed.
+      - text: the frame as raw text cells, against the original astype(str) loop, with only the
+        percentage columns parsed so both do the same work.
+
+    Args:
+        seasons (int): The number of seasons in the synthetic frame.
+        repeat (int): The number of timed runs; the fastest is reported.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The timings of each scenario in milliseconds.
+    """
+    text_df = synthetic_nst_frame(seasons=seasons)
+    typed_df = text_df.copy()
+    for column in nst_numeric_columns():
+        typed_df[column] = typed_column(text_df[column].tolist())
+
+    return {
+        "typed": time_cleanup(
+            "typed",
+            typed_df,
+            typed_loop_cleanup,
+            numeric_columns=nst_numeric_columns(),
+            repeat=repeat,
+        ),
+        "text": time_cleanup(
+            "text",
+            text_df,
+            text_loop_cleanup,
+            numeric_columns=nst_percentage_columns(),
+            repeat=repeat,
+        ),
+    }
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,414 @@
+import json
+import sys
+import textwrap
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2 as ps
+
+from ..Create_Cumulative_Data_Model.Create_Cumulative_Models import (
+    CUMULATIVE_FIRST_SEASON,
+    cumulative_model_select,
+)
+from ..Database.Connection_Pool_NHL import ConnectionPool, get_pool
+from ..SQL_Queries.Season_Stats_Columns_NHL import (
+    season_stats_column_names,
+    season_stats_row_constructor,
+)
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Previous physical design
+###########################################################################################################################################
+
+# Added by migration 3; the previous layout is planned inside a transaction that drops them and
+# is rolled back, so the benchmark needs nhldb to itself while it runs
+READ_INDEXES = [
+    "raw.season_stats_game_type_season_idx",
+    "raw.team_stats_regular_season_current_season_idx",
+    "raw.team_stats_playoffs_current_season_idx",
+]
+
+# Cumulative model tables and the game type each one is built from
+MODEL_TABLES = {
+    "regular season": ("raw.team_stats_regular_season", 2, "Regular Season"),
+    "playoffs": ("raw.team_stats_playoffs", 3, "Playoffs"),
+}
+
+# Offset added to the team IDs of each synthetic copy of the data
+SCALE_TEAM_ID_OFFSET = 100000
+
+
+def previous_cumulative_model_select(
+    table: str, game_type: str, from_season: int
+) -> str:
+    """
+    The cumulative model SELECT before the stored start_year column: raw.season_stats joined to
+    raw.teams, raw.season and raw.game_type, with the start year parsed from the season string and
+    the game type matched by name.
+
+    Args:
+        table (str): The cumulative model table.
+        game_type (str): The game type name ('Regular Season' or 'Playoffs').
+        from_season (int): The first start year built.
+
+    Returns:
+        str: The SELECT statement.
+    """
+    season_stats_row = textwrap.indent(
+        season_stats_row_constructor(alias="ts"), " " * 20
+    ).lstrip()
+
+    return f"""
+
+        WITH season_stats_basic_view AS (
+            SELECT
+                st.*,
+                t.team_full_name,
+                g.game_type,
+                s.season,
+                SPLIT_PART(s.season, '/', 1)::int AS start_year,
+                SPLIT_PART(s.season, '/', 2)::int AS end_year
+            FROM raw.season_stats AS st LEFT JOIN raw.teams AS t
+            ON st.team_id = t.team_id
+            LEFT JOIN raw.season AS s
+            ON st.season_id = s.season_id
+            LEFT JOIN raw.game_type AS g
+            ON st.game_type_id = g.game_type_id
+        ),
+
+        latest_season AS (
+            SELECT MAX(start_year) AS start_year
+            FROM season_stats_basic_view
+        ),
+
+        last_season AS (
+            SELECT *
+            FROM {table}
+            WHERE current_season = {from_season - 1}
+        ),
+
+        this_season AS (
+            SELECT *
+            FROM season_stats_basic_view
+            WHERE game_type = '{game_type}' AND start_year >= {from_season}
+        ),
+
+        first_season AS (
+            SELECT DISTINCT ON (team_id)
+                team_id,
+                season_id,
+                game_type_id,
+                start_year
+            FROM this_season
+            ORDER BY team_id, start_year
+        ),
+
+        team_start AS (
+            SELECT
+                COALESCE(ls.season_id, fs.season_id) AS season_id,
+                COALESCE(ls.team_id, fs.team_id) AS team_id,
+                COALESCE(ls.game_type_id, fs.game_type_id) AS game_type_id,
+                COALESCE(ls.current_season + 1, fs.start_year) AS start_year,
+                ls.seasons AS last_seasons,
+                ls.years_since_last_active AS last_years_since_last_active
+            FROM last_season ls FULL OUTER JOIN first_season fs
+            ON ls.team_id = fs.team_id
+        ),
+
+        team_years AS (
+            SELECT
+                tst.*,
+                years.current_season
+            FROM team_start tst CROSS JOIN latest_season lts CROSS JOIN LATERAL
+                generate_series(tst.start_year, lts.start_year) AS years(current_season)
+        )
+
+        SELECT
+            ty.season_id,
+            ty.team_id,
+            ty.game_type_id,
+            COALESCE(ty.last_seasons, ARRAY[]::raw.season_stats_type[]) || COALESCE(
+                ARRAY_AGG(
+                    {season_stats_row}
+                ) FILTER (WHERE ts.team_id IS NOT NULL) OVER team_history,
+                ARRAY[]::raw.season_stats_type[]
+            ) AS seasons,
+            ty.current_season,
+            ts.team_id IS NOT NULL AS is_active,
+            COALESCE(
+                ty.current_season - MAX(ts.start_year) OVER team_history,
+                ty.last_years_since_last_active + ty.current_season - {from_season - 1}
+            ) AS years_since_last_active
+        FROM team_years ty LEFT JOIN this_season ts
+        ON ty.team_id = ts.team_id AND ty.current_season = ts.start_year
+        WINDOW team_history AS (PARTITION BY ty.team_id ORDER BY ty.current_season)
+    """
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Benchmarked queries
+###########################################################################################################################################
+
+
+def dbt_queries(table: str, current_season: int) -> Dict[str, str]:
+    """
+    The dbt queries reading a cumulative model table, with the staging view over it inlined:
+      - staging: the season_stats_cumulative_*_view filter on one current_season.
+      - mart: team_improvement_regular_season's filter on the newest current_season.
+
+    Args:
+        table (str): The cumulative model table.
+        current_season (int): The season the staging view reads.
+
+    Returns:
+        Dict[str, str]: The SELECT statement of each query.
+    """
+    return {
+        "staging": f"""
+            SELECT
+                team_id,
+                game_type_id,
+                years_since_last_active,
+                UNNEST(seasons)::raw.season_stats_type AS season_stats
+            FROM {table}
+            WHERE current_season = {current_season}
+        """,
+        "mart": f"""
+            SELECT *
+            FROM {table}
+            WHERE current_season = (
+                SELECT MAX(current_season)
+                FROM {table}
+            )
+        """,
+    }
+
+
+def benchmark_queries(cur: ps.extensions.cursor) -> Dict[str, Tuple[str, str]]:
+    """
+    Builds the previous and current form of every benchmarked query: the full and incremental
+    cumulative model builds and the dbt queries, for each game type.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: The (previous, current) SELECT statements of each query.
+    """
+    queries: Dict[str, Tuple[str, str]] = {}
+    for name, (table, game_type_id, game_type) in MODEL_TABLES.items():
+        cur.execute(f"SELECT MAX(current_season) FROM {table};")
+        latest = cur.fetchone()[0] or CUMULATIVE_FIRST_SEASON
+        for build, from_season in (
+            ("full", CUMULATIVE_FIRST_SEASON),
+            ("incremental", latest),
+        ):
+            queries[f"model {name} ({build})"] = (
+                previous_cumulative_model_select(
+                    table=table, game_type=game_type, from_season=from_season
+                ),
+                cumulative_model_select(
+                    table=table, game_type_id=game_type_id, from_season=from_season
+                ),
+            )
+        for query_name, query in dbt_queries(table, current_season=latest).items():
+            queries[f"dbt {query_name} {name}"] = (query, query)
+
+    return queries
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Query plans
+###########################################################################################################################################
+
+
+def scale_data(cur: ps.extensions.cursor, scale: int) -> None:
+    """
+    Adds `scale - 1` copies of raw.season_stats and the cumulative tables under offset team IDs,
+    so the plans reflect a larger history. The caller rolls the copies back.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        scale (int): The total number of copies of the data.
+    """
+    if scale <= 1:
+        return None
+
+    columns = season_stats_column_names()
+    copied = [
+        f"team_id + copy * {SCALE_TEAM_ID_OFFSET}" if column == "team_id" else column
+        for column in columns
+    ]
+    cur.execute(
+        f"""
+        INSERT INTO raw.season_stats ({", ".join(columns)})
+        SELECT {", ".join(copied)}
+        FROM raw.season_stats CROSS JOIN generate_series(1, {scale - 1}) AS copy;
+        """
+    )
+    for table, _, _ in MODEL_TABLES.values():
+        cur.execute(
+            f"""
+            INSERT INTO {table}
+            SELECT season_id, team_id + copy * {SCALE_TEAM_ID_OFFSET}, game_type_id, seasons,
+                current_season, is_active, years_since_last_active
+            FROM {table} CROSS JOIN generate_series(1, {scale - 1}) AS copy;
+            """
+        )
+
+    return None
+
+
+def plan_nodes(plan: Dict[str, Any]) -> List[str]:
+    """
+    Args:
+        plan (Dict[str, Any]): A JSON plan node.
+
+    Returns:
+        List[str]: The scan nodes of the plan and its children, e.g. 'Index Scan using ... on ...'.
+    """
+    nodes = []
+    if "Relation Name" in plan:
+        node = plan["Node Type"]
+        if "Index Name" in plan:
+            node += " using " + plan["Index Name"]
+        nodes.append(node + " on " + plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+
+    return nodes
+
+
+def explain(cur: ps.extensions.cursor, query: str, repeat: int) -> Dict[str, Any]:
+    """
+    Runs EXPLAIN (ANALYZE, BUFFERS) on a query `repeat` times.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        query (str): The SELECT statement.
+        repeat (int): The number of runs; the fastest is reported.
+
+    Returns:
+        Dict[str, Any]: The fastest execution time in milliseconds ('ms'), the shared buffers it
+            touched ('buffers') and its distinct scan nodes ('scans').
+    """
+    runs = []
+    for _ in range(repeat):
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query)
+        result = cur.fetchone()[0]
+        runs.append(json.loads(result)[0] if isinstance(result, str) else result[0])
+    fastest = min(runs, key=lambda run: run["Execution Time"])
+    plan = fastest["Plan"]
+
+    return {
+        "ms": fastest["Execution Time"],
+        "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+        "scans": sorted(set(plan_nodes(plan))),
+    }
+
+
+def plan_layout(
+    conn: ps.extensions.connection,
+    queries: Dict[str, Tuple[str, str]],
+    previous: bool,
+    scale: int,
+    repeat: int,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Plans every query in one layout, inside a transaction that is rolled back:
+      - previous: the read indexes and the stored start_year column are dropped and the previous
+        form of each query runs.
+      - current: the current form of each query runs on the migrated layout.
+
+    Args:
+        conn (ps.extensions.connection): The database connection.
+        queries (Dict[str, Tuple[str, str]]): The (previous, current) SELECT statements.
+        previous (bool): Whether to plan the previous layout.
+        scale (int): The total number of copies of the data.
+        repeat (int): The number of runs per query; the fastest is reported.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The plan summary of each query, with a checksum of its rows.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        with conn.cursor() as cur:
+            scale_data(cur, scale)
+            if previous:
+                for index in READ_INDEXES:
+                    cur.execute(f"DROP INDEX IF EXISTS {index};")
+                cur.execute(
+                    "ALTER TABLE raw.season_stats DROP COLUMN IF EXISTS start_year CASCADE;"
+                )
+            cur.execute("ANALYZE raw.season_stats;")
+            for table, _, _ in MODEL_TABLES.values():
+                cur.execute(f"ANALYZE {table};")
+
+            for name, (previous_query, current_query) in queries.items():
+                query = previous_query if previous else current_query
+                results[name] = explain(cur, query, repeat=repeat)
+                cur.execute(
+                    "SELECT md5(string_agg(q::text, '|' ORDER BY q::text)) FROM ("
+                    + query
+                    + ") AS q;"
+                )
+                results[name]["checksum"] = cur.fetchone()[0]
+    finally:
+        conn.rollback()
+
+    return results
+
+
+def benchmark(
+    connection_pool: Optional[ConnectionPool] = None, scale: int = 1, repeat: int = 5
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Benchmarks the query plans of the cumulative model builds and the dbt queries on nhldb, before
+    and after the stored start_year column and read indexes, and checks both forms of each query
+    return the same rows. Needs a migrated nhldb with the models built; nothing is changed.
+
+    Args:
+        connection_pool (Optional[ConnectionPool]): The nhldb pool. Defaults to the shared pool.
+        scale (int): The total number of copies of the data planned against (1 = as loaded).
+        repeat (int): The number of runs per query; the fastest is reported.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, Any]]]: The plan summaries of the 'previous' and 'current' layouts.
+    """
+    with (connection_pool or get_pool()).connection() as conn:
+        with conn.cursor() as cur:
+            queries = benchmark_queries(cur)
+            cur.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'raw.season_stats'::regclass;"
+            )
+            partitioned = cur.fetchone() is not None
+        conn.rollback()
+        timings = {
+            "previous": plan_layout(
+                conn, queries, previous=True, scale=scale, repeat=repeat
+            ),
+            "current": plan_layout(
+                conn, queries, previous=False, scale=scale, repeat=repeat
+            ),
+        }
+
+    print(
+        f"scale {scale}, raw.season_stats "
+        + ("partitioned by game type" if partitioned else "not partitioned")
+    )
+    for name in queries:
+        previous, current = timings["previous"][name], timings["current"][name]
+        if previous["checksum"] != current["checksum"]:
+            raise AssertionError(name + ": the previous and current queries differ")
+        print(
+            f"{name:>36}: {previous['ms']:9.1f} ms -> {current['ms']:9.1f} ms "
+            f"({previous['ms'] / max(current['ms'], 0.001):5.1f}x), "
+            f"buffers {previous['buffers']} -> {current['buffers']}"
+        )
+        for layout, summary in (("previous", previous), ("current", current)):
+            print(f"{layout:>48}: " + "; ".join(summary["scans"]))
+
+    return timings
+
+
+if __name__ == "__main__":
+    benchmark(scale=int(sys.argv[1]) if len(sys.argv) > 1 else 1)
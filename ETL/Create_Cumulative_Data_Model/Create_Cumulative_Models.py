@@ -1,319 +1,315 @@
 # Import libraries
-import pandas as pd
-
-pd.set_option("display.max_rows", None)
-pd.set_option("display.max_columns", None)
-
-import time
+import textwrap
 import warnings
 
+from ..Create_Tables.Migrations_NHL import (
+    clear_model_rebuild,
+    model_rebuild_requested,
+    require_migrations,
+)
+from ..Database.Connection_Pool_NHL import get_pool
+from ..Progress_Reporting.Progress_Reporting_NHL import get_reporter
+from ..SQL_Queries.Season_Stats_Columns_NHL import season_stats_row_constructor
+from .Model_Scheduler_NHL import ModelTask, run_model_tasks
+
 warnings.filterwarnings("ignore")
 
+###########################################################################################################################################
+# NEW CODE BLOCK - Cumulative model bounds
+###########################################################################################################################################
+
+# First season (by start year) built into the cumulative models; both run through the newest
+# season in raw.season_stats across game types, so the playoff model gets rows (all inactive)
+# for a season whose playoffs have not been played yet, as with the old fixed range(1918, 2026)
+CUMULATIVE_FIRST_SEASON = 1917
+
+# Schema version the models read: migration 3 adds the stored raw.season_stats.start_year column
+MODELS_SCHEMA_VERSION = 3
+
 
 ###########################################################################################################################################
 # NEW CODE BLOCK - Cumulative SQL functions
 ###########################################################################################################################################
 
 
+def latest_built_season(cur, table):
+    """
+    - Returns the newest current_season already built into a cumulative model table
+    - Returns None when the table is empty
+    """
+    cur.execute(f"SELECT MAX(current_season) FROM {table};")
+
+    return cur.fetchone()[0]
+
+
+def cumulative_model_select(table, game_type_id, from_season):
+    """
+    - Returns the set-based SELECT building a cumulative model table for one game type from
+      from_season (a start year) through the newest season of any game type, so the regular
+      season and playoff models always end on the same season
+    - Every team gets one row per season from its first season through the newest season:
+        - season_id / game_type_id: the team's first season in this game type
+        - seasons: every season played so far, ordered by start year
+        - is_active: whether the team played that season
+        - years_since_last_active: seasons since the team last played (0 when active)
+    - The seasons array is accumulated with a window over each team's years, so raw.season_stats
+      is scanned once instead of once per season; the rows match the old year-by-year loop
+    - raw.season_stats is read through its (game_type_id, season_id) index and its stored
+      start_year, so neither raw.season nor raw.game_type is joined
+    - Each team's state is carried forward from its row for the season before from_season
+    """
+    from_season_id = int(f"{from_season}{from_season + 1}")
+    season_stats_row = textwrap.indent(
+        season_stats_row_constructor(alias="ts"), " " * 20
+    ).lstrip()
+
+    return f"""
+
+        WITH latest_season AS (
+            SELECT MAX(newest.start_year) AS start_year
+            FROM raw.game_type AS g CROSS JOIN LATERAL (
+                SELECT start_year
+                FROM raw.season_stats
+                WHERE game_type_id = g.game_type_id
+                ORDER BY season_id DESC
+                LIMIT 1
+            ) AS newest
+        ),
+
+        last_season AS (
+            SELECT * 
+            FROM {table}
+            WHERE current_season = {from_season - 1}
+        ),
+
+        this_season AS (
+            SELECT * 
+            FROM raw.season_stats
+            WHERE game_type_id = {game_type_id} AND season_id >= {from_season_id}
+        ),
+
+        first_season AS (
+            SELECT DISTINCT ON (team_id)
+                team_id,
+                season_id,
+                game_type_id,
+                start_year
+            FROM this_season
+            ORDER BY team_id, start_year
+        ),
+
+        team_start AS (
+            SELECT
+                COALESCE(ls.season_id, fs.season_id) AS season_id,
+                COALESCE(ls.team_id, fs.team_id) AS team_id,
+                COALESCE(ls.game_type_id, fs.game_type_id) AS game_type_id,
+                COALESCE(ls.current_season + 1, fs.start_year) AS start_year,
+                ls.seasons AS last_seasons,
+                ls.years_since_last_active AS last_years_since_last_active
+            FROM last_season ls FULL OUTER JOIN first_season fs
+            ON ls.team_id = fs.team_id
+        ),
+
+        team_years AS (
+            SELECT
+                tst.*,
+                years.current_season
+            FROM team_start tst CROSS JOIN latest_season lts CROSS JOIN LATERAL
+                generate_series(tst.start_year, lts.start_year) AS years(current_season)
+        )
+
+        -- The window frame runs from the team's start season up to the current one, in start year
+        -- order, so ARRAY_AGG appends seasons after those carried over from last_season in the
+        -- same order the year-by-year loop did
+        SELECT
+            ty.season_id,
+            ty.team_id,
+            ty.game_type_id,
+            COALESCE(ty.last_seasons, ARRAY[]::raw.season_stats_type[]) || COALESCE(
+                ARRAY_AGG(
+                    {season_stats_row}
+                ) FILTER (WHERE ts.team_id IS NOT NULL) OVER team_history,
+                ARRAY[]::raw.season_stats_type[]
+            ) AS seasons,
+            ty.current_season,
+            ts.team_id IS NOT NULL AS is_active,
+            COALESCE(
+                ty.current_season - MAX(ts.start_year) OVER team_history,
+                ty.last_years_since_last_active + ty.current_season - {from_season - 1}
+            ) AS years_since_last_active
+        FROM team_years ty LEFT JOIN this_season ts
+        ON ty.team_id = ts.team_id AND ty.current_season = ts.start_year
+        WINDOW team_history AS (PARTITION BY ty.team_id ORDER BY ty.current_season)
+    """
+
+
+def build_team_stats_cumulative_model(
+    conn, cur, table, game_type_id, stage, incremental=False, reporter=None
+):
+    """
+    - Builds a cumulative model table for one game type in a single set-based statement
+      (see cumulative_model_select)
+    - A full build starts from CUMULATIVE_FIRST_SEASON; an incremental build starts from the newest
+      season already built, so that season is rebuilt in place (it may still be in progress) and
+      only the missing seasons after it are appended. Either way each team's state is carried
+      forward from its row for the season before the start
+    - Rows from the start season on are deleted and rebuilt in one transaction, so reruns are idempotent
+    - A table a migration asked to rebuild (e.g. migration 2, which recreates the tables empty) is
+      built in full even when incremental; the request is cleared in the same transaction
+    """
+    reporter = reporter or get_reporter()
+
+    rebuild_version = model_rebuild_requested(cur=cur, table=table)
+    from_season = CUMULATIVE_FIRST_SEASON
+    if incremental and rebuild_version is None:
+        from_season = latest_built_season(cur=cur, table=table) or from_season
+    elif incremental:
+        reporter.progress(
+            stage, f"full rebuild requested by migration {rebuild_version}"
+        )
+
+    query = f"""
+        INSERT INTO {table}
+        {cumulative_model_select(table=table, game_type_id=game_type_id, from_season=from_season)};
+    """
+
+    cur.execute(f"DELETE FROM {table} WHERE current_season >= {from_season};")
+    cur.execute(query)
+    rows = cur.rowcount
+    if rebuild_version is not None:
+        clear_model_rebuild(cur=cur, table=table)
+    conn.commit()
+
+    reporter.progress(
+        stage,
+        f"built seasons {from_season} onwards",
+        rows=rows,
+    )
+
+
 # Playoffs
 #####################################################################
-def create_team_stats_cumulative_playoffs_model(conn, cur):
+def create_team_stats_cumulative_playoffs_model(
+    conn, cur, incremental=False, reporter=None
+):
     """
     - Creates a cumulative idempotent view for teams stats in the playoffs
-    - - Old range: range(1918,2025)
+    - Builds seasons CUMULATIVE_FIRST_SEASON through the newest season of any game type
+      (old range: range(1918, 2026), i.e. 1917-2024); a season without playoffs yet has every
+      team inactive
+    - With incremental=True only the newest built season and any missing seasons are rebuilt
+    - Reports the rebuilt rows to the progress reporter (defaults to the shared reporter)
     """
-    for start_year in range(1918, 2026):
-
-        query = f"""
-
-                WITH season_stats_basic_view AS (
-                    SELECT 
-                        st.*,
-                        t.team_full_name,
-                        g.game_type,
-                        s.season,
-                        SPLIT_PART(s.season, '/', 1)::int AS start_year,
-                        SPLIT_PART(s.season, '/', 2)::int AS end_year
-                    FROM raw.season_stats AS st LEFT JOIN raw.teams AS t
-                    ON st.team_id = t.team_id
-                    LEFT JOIN raw.season AS s
-                    ON st.season_id = s.season_id 
-                    LEFT JOIN raw.game_type AS g
-                    ON st.game_type_id = g.game_type_id  
-                ),
-
-                last_season AS (
-                    SELECT * 
-                    FROM raw.team_stats_playoffs
-                    WHERE current_season = {start_year - 2}
-                ), 
-
-                this_season AS (
-                    SELECT * 
-                    FROM season_stats_basic_view
-                    WHERE start_year = {start_year - 1} AND game_type = 'Playoffs'
-                )
-
-                INSERT INTO raw.team_stats_playoffs
-                SELECT
-                    COALESCE(ls.season_id, ts.season_id) as season_id,
-                    COALESCE(ls.team_id, ts.team_id) as team_id,
-                    COALESCE(ls.game_type_id, ts.game_type_id) as game_type_id,
-                    COALESCE(ls.seasons,
-                        ARRAY[]::raw.season_stats_type[]
-                        ) || CASE WHEN ts.season IS NOT NULL THEN
-                            ARRAY[ROW(
-                                ts.start_year::int,
-                                ts.faceoff_win_pct::real,
-                                ts.games_played::int,
-                                ts.goals_against::int,
-                                ts.goals_against_per_game::real,
-                                ts.goals_for::int,
-                                ts.goals_for_per_game::real,
-                                ts.losses::int,
-                                ts.overtime_losses::real,
-                                ts.penalty_kill_net_pct::real,
-                                ts.penalty_kill_pct::real,
-                                ts.points_pct::real,
-                                ts.points::int,
-                                ts.power_play_net_pct::real,
-                                ts.power_play_pct::real,
-                                ts.regulation_and_overtime_wins::int,
-                                ts.shots_against_per_game::real,
-                                ts.shots_for_per_game::real,
-                                ts.ties::real,
-                                ts.wins::int,
-                                ts.wins_in_regulation::int,
-                                ts.wins_in_shootout::int,
-                                ts.time_on_ice::text,
-                                ts.corsi_for::real,
-                                ts.corsi_against::real,
-                                ts.corsi_for_pct::real,
-                                ts.fenwick_for::real,
-                                ts.fenwick_against::real,
-                                ts.fenwick_for_pct::real,
-                                ts.shots_for::real,
-                                ts.shots_against::real,
-                                ts.shots_for_pct::real,
-                                ts.goals_for_pct::real,
-                                ts.expected_goals_for::real,
-                                ts.expected_goals_against::real,
-                                ts.expected_goals_for_pct::real,
-                                ts.scoring_chances_for::real,
-                                ts.scoring_chances_against::real,
-                                ts.scoring_chances_for_pct::real,
-                                ts.scoring_chances_shots_for::real,
-                                ts.scoring_chances_shots_against::real,
-                                ts.scoring_chances_shots_for_pct::real,
-                                ts.scoring_chances_goals_for::real,
-                                ts.scoring_chances_goals_against::real,
-                                ts.scoring_chances_goals_for_pct::real,
-                                ts.scoring_chances_shooting_pct::real,
-                                ts.scoring_chances_save_pct::real,
-                                ts.high_danger_chances_for::real,
-                                ts.high_danger_chances_against::real,
-                                ts.high_danger_chances_for_pct::real,
-                                ts.high_danger_shots_for::real,
-                                ts.high_danger_shots_against::real,
-                                ts.high_danger_shots_for_pct::real,
-                                ts.high_danger_goals_for::real,
-                                ts.high_danger_goals_against::real,
-                                ts.high_danger_goals_for_pct::real,
-                                ts.high_danger_shooting_pct::real,
-                                ts.high_danger_save_pct::real,
-                                ts.medium_danger_chances_for::real,
-                                ts.medium_danger_chances_against::real,
-                                ts.medium_danger_chances_for_pct::real,
-                                ts.medium_danger_shots_for::real,
-                                ts.medium_danger_shots_against::real,
-                                ts.medium_danger_shots_for_pct::real,
-                                ts.medium_danger_goals_for::real,
-                                ts.medium_danger_goals_against::real,
-                                ts.medium_danger_goals_for_pct::real,
-                                ts.medium_danger_shooting_pct::real,
-                                ts.medium_danger_save_pct::real,
-                                ts.low_danger_chances_for::real,
-                                ts.low_danger_chances_against::real,
-                                ts.low_danger_chances_for_pct::real,
-                                ts.low_danger_shots_for::real,
-                                ts.low_danger_shots_against::real,
-                                ts.low_danger_shots_for_pct::real,
-                                ts.low_danger_goals_for::real,
-                                ts.low_danger_goals_against::real,
-                                ts.low_danger_goals_for_pct::real,
-                                ts.low_danger_shooting_pct::real,
-                                ts.low_danger_save_pct::real,
-                                ts.shooting_pct::real,
-                                ts.save_pct::real,
-                                ts.pdo_rating::real
-                            )::raw.season_stats_type]
-                            ELSE ARRAY[]::raw.season_stats_type[] 
-                        END AS seasons,
-                    COALESCE(ts.start_year, ls.current_season + 1) AS current_season,
-                    ts.season_id IS NOT NULL AS is_active,
-                    CASE 
-                        WHEN ts.start_year IS NOT NULL 
-                        THEN 0
-                        ELSE ls.years_since_last_active + 1
-                    END AS years_since_last_active
-                FROM last_season ls FULL OUTER JOIN this_season ts
-                ON ls.team_id = ts.team_id;
-        """
-
-        cur.execute(query)
-        conn.commit()
-
-        print(query)
-        time.sleep(1)
+    build_team_stats_cumulative_model(
+        conn=conn,
+        cur=cur,
+        table="raw.team_stats_playoffs",
+        game_type_id=3,
+        stage="model raw.team_stats_playoffs",
+        incremental=incremental,
+        reporter=reporter,
+    )
 
 
 # Regular Season
 #####################################################################
-def create_team_stats_cumulative_regular_season_model(cur, conn):
+def create_team_stats_cumulative_regular_season_model(
+    cur, conn, incremental=False, reporter=None
+):
     """
     - Creates a cumulative idempotent view for teams stats during the regular season
-    - Old range: range(1918,2025)
+    - Builds seasons CUMULATIVE_FIRST_SEASON through the newest season of any game type
+      (old range: range(1918, 2026), i.e. 1917-2024)
+    - With incremental=True only the newest built season and any missing seasons are rebuilt
+    - Reports the rebuilt rows to the progress reporter (defaults to the shared reporter)
+    """
+    build_team_stats_cumulative_model(
+        conn=conn,
+        cur=cur,
+        table="raw.team_stats_regular_season",
+        game_type_id=2,
+        stage="model raw.team_stats_regular_season",
+        incremental=incremental,
+        reporter=reporter,
+    )
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Cumulative model tasks
+###########################################################################################################################################
+
+
+def cumulative_model_tasks(incremental=False, reporter=None, game_type_ids=None):
     """
-    for start_year in range(1918, 2026):
-
-        query = f"""
-
-                WITH season_stats_basic_view AS (
-                    SELECT 
-                        st.*,
-                        t.team_full_name,
-                        g.game_type,
-                        s.season,
-                        SPLIT_PART(s.season, '/', 1)::int AS start_year,
-                        SPLIT_PART(s.season, '/', 2)::int AS end_year
-                    FROM raw.season_stats AS st LEFT JOIN raw.teams AS t
-                    ON st.team_id = t.team_id
-                    LEFT JOIN raw.season AS s
-                    ON st.season_id = s.season_id 
-                    LEFT JOIN raw.game_type AS g
-                    ON st.game_type_id = g.game_type_id  
-                ),
-
-                last_season AS (
-                    SELECT * 
-                    FROM raw.team_stats_regular_season
-                    WHERE current_season = {start_year - 2}
-                ), 
-
-                this_season AS (
-                    SELECT * 
-                    FROM season_stats_basic_view
-                    WHERE start_year = {start_year - 1} AND game_type = 'Regular Season'
-                )
-
-                INSERT INTO raw.team_stats_regular_season
-                SELECT
-                    COALESCE(ls.season_id, ts.season_id) as season_id,
-                    COALESCE(ls.team_id, ts.team_id) as team_id,
-                    COALESCE(ls.game_type_id, ts.game_type_id) as game_type_id,
-                    COALESCE(ls.seasons,
-                        ARRAY[]::raw.season_stats_type[]
-                        ) || CASE WHEN ts.season IS NOT NULL THEN
-                            ARRAY[ROW(
-                                ts.start_year::int,
-                                ts.faceoff_win_pct::real,
-                                ts.games_played::int,
-                                ts.goals_against::int,
-                                ts.goals_against_per_game::real,
-                                ts.goals_for::int,
-                                ts.goals_for_per_game::real,
-                                ts.losses::int,
-                                ts.overtime_losses::real,
-                                ts.penalty_kill_net_pct::real,
-                                ts.penalty_kill_pct::real,
-                                ts.points_pct::real,
-                                ts.points::int,
-                                ts.power_play_net_pct::real,
-                                ts.power_play_pct::real,
-                                ts.regulation_and_overtime_wins::int,
-                                ts.shots_against_per_game::real,
-                                ts.shots_for_per_game::real,
-                                ts.ties::real,
-                                ts.wins::int,
-                                ts.wins_in_regulation::int,
-                                ts.wins_in_shootout::int,
-                                ts.time_on_ice::text,
-                                ts.corsi_for::real,
-                                ts.corsi_against::real,
-                                ts.corsi_for_pct::real,
-                                ts.fenwick_for::real,
-                                ts.fenwick_against::real,
-                                ts.fenwick_for_pct::real,
-                                ts.shots_for::real,
-                                ts.shots_against::real,
-                                ts.shots_for_pct::real,
-                                ts.goals_for_pct::real,
-                                ts.expected_goals_for::real,
-                                ts.expected_goals_against::real,
-                                ts.expected_goals_for_pct::real,
-                                ts.scoring_chances_for::real,
-                                ts.scoring_chances_against::real,
-                                ts.scoring_chances_for_pct::real,
-                                ts.scoring_chances_shots_for::real,
-                                ts.scoring_chances_shots_against::real,
-                                ts.scoring_chances_shots_for_pct::real,
-                                ts.scoring_chances_goals_for::real,
-                                ts.scoring_chances_goals_against::real,
-                                ts.scoring_chances_goals_for_pct::real,
-                                ts.scoring_chances_shooting_pct::real,
-                                ts.scoring_chances_save_pct::real,
-                                ts.high_danger_chances_for::real,
-                                ts.high_danger_chances_against::real,
-                                ts.high_danger_chances_for_pct::real,
-                                ts.high_danger_shots_for::real,
-                                ts.high_danger_shots_against::real,
-                                ts.high_danger_shots_for_pct::real,
-                                ts.high_danger_goals_for::real,
-                                ts.high_danger_goals_against::real,
-                                ts.high_danger_goals_for_pct::real,
-                                ts.high_danger_shooting_pct::real,
-                                ts.high_danger_save_pct::real,
-                                ts.medium_danger_chances_for::real,
-                                ts.medium_danger_chances_against::real,
-                                ts.medium_danger_chances_for_pct::real,
-                                ts.medium_danger_shots_for::real,
-                                ts.medium_danger_shots_against::real,
-                                ts.medium_danger_shots_for_pct::real,
-                                ts.medium_danger_goals_for::real,
-                                ts.medium_danger_goals_against::real,
-                                ts.medium_danger_goals_for_pct::real,
-                                ts.medium_danger_shooting_pct::real,
-                                ts.medium_danger_save_pct::real,
-                                ts.low_danger_chances_for::real,
-                                ts.low_danger_chances_against::real,
-                                ts.low_danger_chances_for_pct::real,
-                                ts.low_danger_shots_for::real,
-                                ts.low_danger_shots_against::real,
-                                ts.low_danger_shots_for_pct::real,
-                                ts.low_danger_goals_for::real,
-                                ts.low_danger_goals_against::real,
-                                ts.low_danger_goals_for_pct::real,
-                                ts.low_danger_shooting_pct::real,
-                                ts.low_danger_save_pct::real,
-                                ts.shooting_pct::real,
-                                ts.save_pct::real,
-                                ts.pdo_rating::real
-                            )::raw.season_stats_type]
-                            ELSE ARRAY[]::raw.season_stats_type[] 
-                        END AS seasons,
-                    COALESCE(ts.start_year, ls.current_season + 1) AS current_season,
-                    ts.season_id IS NOT NULL AS is_active,
-                    CASE 
-                        WHEN ts.start_year IS NOT NULL 
-                        THEN 0
-                        ELSE ls.years_since_last_active + 1
-                    END AS years_since_last_active
-                FROM last_season ls FULL OUTER JOIN this_season ts
-                ON ls.team_id = ts.team_id;
-        """
-
-        cur.execute(query)
-        conn.commit()
-
-        print(query)
-        time.sleep(1)
+    - Returns the cumulative model builds as scheduler tasks
+    - The regular season and playoff models only read raw tables, so they have no dependencies
+      and the scheduler builds them concurrently on separate connections
+    - game_type_ids limits the tasks to some game types (2 = regular season, 3 = playoffs)
+    """
+    tasks = {
+        2: ModelTask(
+            name="model raw.team_stats_regular_season",
+            build=lambda conn, cur: create_team_stats_cumulative_regular_season_model(
+                cur=cur, conn=conn, incremental=incremental, reporter=reporter
+            ),
+        ),
+        3: ModelTask(
+            name="model raw.team_stats_playoffs",
+            build=lambda conn, cur: create_team_stats_cumulative_playoffs_model(
+                conn=conn, cur=cur, incremental=incremental, reporter=reporter
+            ),
+        ),
+    }
+
+    return [
+        task
+        for game_type_id, task in tasks.items()
+        if game_type_ids is None or game_type_id in game_type_ids
+    ]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Build cumulative models
+###########################################################################################################################################
+
+
+def build_cumulative_models(
+    connection_pool=None,
+    incremental=False,
+    reporter=None,
+    game_type_ids=None,
+    dry_run=False,
+):
+    """
+    - Builds the cumulative models for regular season and playoffs concurrently, each on its own
+      pooled connection
+    - connection_pool defaults to the shared nhldb pool; builds beyond its size wait for a connection
+    - game_type_ids limits the builds to some game types (2 = regular season, 3 = playoffs)
+    - With dry_run=True only prints the models that would be built
+    - Raises RuntimeError before building if nhldb is missing a migration the models need
+      (run `Start_ETL.py migrate` first)
+    - Only needs psycopg2, so the models stage starts without loading pandas
+    """
+    reporter = reporter or get_reporter()
+    model_tasks = cumulative_model_tasks(
+        incremental=incremental, reporter=reporter, game_type_ids=game_type_ids
+    )
+    if dry_run:
+        for task in model_tasks:
+            print(
+                "Would build " + task.name + (" incrementally" if incremental else "")
+            )
+        return None
+
+    connection_pool = connection_pool or get_pool()
+    with connection_pool.transaction() as cur:
+        require_migrations(cur, MODELS_SCHEMA_VERSION)
+
+    with reporter.stage("models"):
+        run_model_tasks(
+            tasks=model_tasks,
+            connection_pool=connection_pool,
+            reporter=reporter,
+        )
+
+    return None
@@ -0,0 +1,160 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ..Database.Connection_Pool_NHL import ConnectionPool
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Model tasks
+###########################################################################################################################################
+
+
+class ModelTask:
+    """
+    A model build that runs on its own pooled connection once its dependencies have finished.
+
+    Args:
+        name (str): The unique task name, also used as its progress stage name.
+        build (Callable[..., Any]): Called as build(conn=conn, cur=cur) to build the model.
+        depends_on (Iterable[str]): Names of the tasks that must succeed before this one starts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[..., Any],
+        depends_on: Iterable[str] = (),
+    ) -> None:
+        self.name = name
+        self.build = build
+        self.depends_on = tuple(depends_on)
+
+
+def check_model_tasks(tasks: List[ModelTask]) -> None:
+    """
+    Validates that task names are unique, every dependency exists and there are no cycles.
+
+    Args:
+        tasks (List[ModelTask]): The tasks to schedule.
+
+    Raises:
+        ValueError: If a name is duplicated, a dependency is unknown or the dependencies form a cycle.
+    """
+    names = [task.name for task in tasks]
+    if len(names) != len(set(names)):
+        raise ValueError(f"Duplicate model task names: {names}")
+    for task in tasks:
+        unknown = set(task.depends_on) - set(names)
+        if unknown:
+            raise ValueError(
+                f"Model task '{task.name}' depends on unknown tasks: {sorted(unknown)}"
+            )
+
+    # Repeatedly resolve tasks whose dependencies are all resolved; anything left is in a cycle
+    resolved: Set[str] = set()
+    remaining = list(tasks)
+    while remaining:
+        ready = [task for task in remaining if set(task.depends_on) <= resolved]
+        if not ready:
+            raise ValueError(
+                f"Model task dependencies form a cycle: {[task.name for task in remaining]}"
+            )
+        resolved.update(task.name for task in ready)
+        remaining = [task for task in remaining if task.name not in resolved]
+
+    return None
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Run model tasks concurrently
+###########################################################################################################################################
+
+
+def run_model_task(
+    task: ModelTask, connection_pool: ConnectionPool, reporter: Any
+) -> None:
+    """
+    Builds one model on a connection borrowed from the pool, reporting it as its own stage.
+    The connection is rolled back on failure and always returned to the pool.
+
+    Args:
+        task (ModelTask): The task to run.
+        connection_pool (ConnectionPool): The pool to borrow a connection from.
+        reporter (Any): The progress reporter.
+    """
+    with connection_pool.connection() as conn:
+        with reporter.stage(task.name):
+            with conn.cursor() as cur:
+                task.build(conn=conn, cur=cur)
+
+    return None
+
+
+def run_model_tasks(
+    tasks: List[ModelTask],
+    connection_pool: ConnectionPool,
+    reporter: Any,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Runs model tasks concurrently, each on a separate pooled connection, starting every task as
+    soon as all of its dependencies have succeeded. Independent tasks therefore overlap and the
+    total time approaches the longest dependency chain rather than the sum of all builds.
+
+    When a task fails, the tasks depending on it (directly or not) are skipped, the others still
+    run, and the first failure is re-raised once everything has finished.
+
+    Args:
+        tasks (List[ModelTask]): The tasks to run.
+        connection_pool (ConnectionPool): The pool the tasks borrow connections from; tasks
+            beyond its size wait for a connection to be returned.
+        reporter (Any): The progress reporter each task reports its stage to.
+        max_workers (Optional[int]): The maximum number of concurrent tasks. Defaults to the number of tasks.
+
+    Returns:
+        Dict[str, str]: Each task's outcome: 'succeeded', 'failed' or 'skipped'.
+
+    Raises:
+        ValueError: If the task dependencies are invalid.
+        Exception: The first task failure, after all runnable tasks have finished.
+    """
+    check_model_tasks(tasks)
+    outcomes: Dict[str, str] = {}
+    errors: List[BaseException] = []
+    pending = list(tasks)
+    running: Dict[Future, ModelTask] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(tasks), 1)) as executor:
+        while pending or running:
+            # Skip tasks with a failed or skipped dependency, and start tasks whose dependencies succeeded
+            for task in list(pending):
+                dependency_outcomes = [outcomes.get(name) for name in task.depends_on]
+                if any(
+                    outcome in ("failed", "skipped") for outcome in dependency_outcomes
+                ):
+                    outcomes[task.name] = "skipped"
+                    reporter.progress(task.name, "skipped after a dependency failed")
+                    pending.remove(task)
+                elif all(outcome == "succeeded" for outcome in dependency_outcomes):
+                    future = executor.submit(
+                        run_model_task, task, connection_pool, reporter
+                    )
+                    running[future] = task
+                    pending.remove(task)
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    outcomes[task.name] = "succeeded"
+                else:
+                    outcomes[task.name] = "failed"
+                    errors.append(error)
+
+    if errors:
+        raise errors[0]
+
+    return outcomes
@@ -1,169 +1,160 @@
-import os
-import sys
+import argparse
+from typing import List, Optional
 
 import psycopg2 as ps
+from psycopg2 import sql
+from psycopg2.extensions import make_dsn, parse_dsn
 
-current_dir = os.getcwd()
-# Add the target directory to the system path
-sys.path.append(os.path.abspath(os.path.join(current_dir, "..", "SQL_Queries")))
-from dotenv import load_dotenv
-from SQL_Queries import *
-
-load_dotenv()
-DB_PASSWORD = os.getenv("DB_PASSWORD")
+from ..Database.Connection_Pool_NHL import ConnectionPool, get_pool
+from ..SQL_Queries.SQL_Queries import database_exists_select
+from .Migrations_NHL import MIGRATIONS, migrate, partition_season_stats
 
 ###########################################################################################################################################
 # NEW CODE BLOCK - Create nhldb
 ###########################################################################################################################################
 
 
-def create_database(password=DB_PASSWORD):
+def create_database(connection_pool=None, rebuild=False, dry_run=False) -> bool:
     """
-    - Creates and connects to the nhldb
-    - Returns the connection and cursor to nhldb
+    - Creates the nhldb database from the maintenance database 'postgres' if it does not exist
+    - With rebuild=True drops nhldb first, losing every loaded season and model; the migrations
+      then recreate the schema from scratch
+    - With dry_run=True only prints what would be done
 
     Args:
-        password: The database password.
-    """
+        connection_pool: The nhldb pool. Defaults to the shared pool.
+        rebuild: Whether to drop and recreate nhldb.
+        dry_run: Whether to only print what would be done.
 
-    # connect to default database port: 5432
-    conn = ps.connect(
-        f"""
-    
-        host=localhost
-        dbname=postgres
-        user=postgres
-        password={password}
-        
+    Returns:
+        bool: True if nhldb was (or would be) created.
     """
-    )
+    connection_pool = connection_pool or get_pool()
+    dbname = parse_dsn(connection_pool.dsn).get("dbname", "nhldb")
 
-    conn.set_session(autocommit=True)
-    cur = conn.cursor()
-
-    # create nhldb database with UTF8 encoding
-    cur.execute("DROP DATABASE IF EXISTS nhldb;")
-    cur.execute("CREATE DATABASE nhldb WITH ENCODING 'utf8' TEMPLATE template0;")
-
-    # close connection to default database
-    conn.close()
-
-    # connect to nhldb database
-    conn = ps.connect(
-        f"""
-    
-        host=localhost
-        dbname=nhldb
-        user=postgres
-        password={password}
-        
-    """
+    # connect to the default database; CREATE DATABASE cannot run inside a transaction
+    admin_pool = ConnectionPool(
+        dsn=make_dsn(connection_pool.dsn, dbname="postgres"), size=1
     )
-
-    cur = conn.cursor()
-
-    # Create schema raw
-    cur.execute("CREATE SCHEMA IF NOT EXISTS raw;")
-    # Create Season Stats Type
-    cur.execute(create_season_stats_type_raw)
-    # Create schema analytics
-    cur.execute("CREATE SCHEMA IF NOT EXISTS analytics;")
-    # Create Season Stats Type
-    cur.execute(create_season_stats_type_analytics)
-    conn.commit()
-
-    return cur, conn
+    try:
+        with admin_pool.autocommit() as cur:
+            cur.execute(database_exists_select, (dbname,))
+            exists = cur.fetchone() is not None
+            if dry_run:
+                if rebuild and exists:
+                    print(f"Would drop {dbname} and every row in it")
+                if rebuild or not exists:
+                    print(f"Would create {dbname}")
+                return rebuild or not exists
+
+            if rebuild and exists:
+                # Close pooled connections to the database about to be dropped
+                connection_pool.close()
+                cur.execute(
+                    sql.SQL("DROP DATABASE IF EXISTS {dbname};").format(
+                        dbname=sql.Identifier(dbname)
+                    )
+                )
+                print(f"Dropped {dbname}")
+            if rebuild or not exists:
+                # create nhldb database with UTF8 encoding
+                cur.execute(
+                    sql.SQL(
+                        "CREATE DATABASE {dbname} WITH ENCODING 'utf8' TEMPLATE template0;"
+                    ).format(dbname=sql.Identifier(dbname))
+                )
+                print(f"Created {dbname}")
+    finally:
+        admin_pool.close()
+
+    return rebuild or not exists
 
 
 ###########################################################################################################################################
-# NEW CODE BLOCK - Create tables in nhldb
+# NEW CODE BLOCK - Set up nhldb
 ###########################################################################################################################################
 
 
-def drop_tables(cur, conn) -> None:
+def setup_database(
+    connection_pool=None, rebuild=False, partition=False, dry_run=False
+) -> List[int]:
     """
-    Drops each table using the queries in `drop_table_queries` list
+    - Creates nhldb if it does not exist (or drops and recreates it with rebuild=True)
+    - Applies the pending schema migrations, keeping every loaded row
+    - With partition=True then partitions raw.season_stats by game type, if it is not already
+    - With dry_run=True only prints what would be done
 
     Args:
-        conn (ps.extensions.connection): The database connection.
-        cur (ps.extensions.cursor): The database cursor.
-    """
-    for query in drop_table_queries:
-        cur.execute(query)
-        conn.commit()
-
-    return None
-
+        connection_pool: The nhldb pool. Defaults to the shared pool.
+        rebuild: Whether to drop nhldb and rebuild it from scratch.
+        partition: Whether to partition raw.season_stats by game type.
+        dry_run: Whether to only print what would be done.
 
-def create_tables(cur, conn) -> None:
+    Returns:
+        List[int]: The migration versions applied (or, in a dry run, pending).
     """
-    Creates each table using the queries in `create_table_queries` list
+    connection_pool = connection_pool or get_pool()
+    created = create_database(
+        connection_pool=connection_pool, rebuild=rebuild, dry_run=dry_run
+    )
+    if dry_run and created:
+        # A new database would have every migration pending, and cannot be queried yet
+        for migration in MIGRATIONS:
+            print(f"Would apply migration {migration.version}: {migration.name}")
+        if partition:
+            print("Would partition raw.season_stats by game type")
+        return [migration.version for migration in MIGRATIONS]
 
-    Args:
-        conn (ps.extensions.connection): The database connection.
-        cur (ps.extensions.cursor): The database cursor.
-    """
-    for query in create_table_queries:
-        cur.execute(query)
-        conn.commit()
+    versions = migrate(connection_pool=connection_pool, dry_run=dry_run)
+    if partition:
+        partition_season_stats(connection_pool=connection_pool, dry_run=dry_run)
 
-    return None
+    return versions
 
 
-def create_view(cur, conn) -> None:
+def main(argv: Optional[List[str]] = None) -> None:
     """
-    Creates nhl view
+    - Creates nhldb if needed and applies the pending schema migrations
+    - --rebuild drops nhldb and rebuilds it from scratch instead
+    - --partition partitions raw.season_stats by game type
+    - Finally, closes the pooled connections
 
     Args:
-        conn (ps.extensions.connection): The database connection.
-        cur (ps.extensions.cursor): The database cursor.
-    """
-    cur.execute(nhl_view_create)
-    conn.commit()
-
-    return None
-
-
-###########################################################################################################################################
-# NEW CODE BLOCK - Team names and IDs from NHL API
-###########################################################################################################################################
-
-
-def main() -> None:
-    """
-    - Drops (if exists) and creates the nhldb database
-    - Establishes connection with the nhldb database and gets cursor to it
-    - Drops all the tables
-    - Creates all tables needed
-    - Finally, closes the connection
+        argv (Optional[List[str]]): The arguments. Defaults to sys.argv[1:].
     """
+    parser = argparse.ArgumentParser(
+        description="Create nhldb if needed and apply the pending schema migrations."
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="drop nhldb and rebuild it from scratch; every season must be loaded again",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="partition raw.season_stats by game type (regular season, playoffs)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print what would be done without changing nhldb",
+    )
+    args = parser.parse_args(argv)
 
+    connection_pool = get_pool()
     try:
-        cur, conn = create_database()
-
-        # Drop tables
-        drop_tables(cur=cur, conn=conn)
-
-        # Create tables
-        create_tables(cur=cur, conn=conn)
-
-        print(
-            """
-        Tables in nhldb have been created: 
-        - teams
-        - season
-        - game_type
-        - season_stats
-        - team_stats_regular_season
-        - team_stats_playoffs
-        """
+        setup_database(
+            connection_pool=connection_pool,
+            rebuild=args.rebuild,
+            partition=args.partition,
+            dry_run=args.dry_run,
         )
-
-        conn.close()
-
     except ps.Error as e:
         print("\n Error:")
         print(e)
+    finally:
+        connection_pool.close()
 
     return None
 
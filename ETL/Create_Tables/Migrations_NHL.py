@@ -0,0 +1,421 @@
+from typing import Callable, List, Optional
+
+import psycopg2 as ps
+from psycopg2 import sql
+
+from ..Database.Connection_Pool_NHL import ConnectionPool, get_pool
+from ..SQL_Queries.Migration_Schemas_NHL import (
+    v1_create_table_queries,
+    v1_create_type_queries,
+    v2_compact_types_alter,
+    v2_cumulative_data_model_create_queries,
+    v2_cumulative_data_model_drop_queries,
+    v2_model_rebuilds_table_create,
+    v2_season_stats_type_create_queries,
+    v2_season_stats_type_drop_queries,
+)
+from ..SQL_Queries.SQL_Queries import (
+    column_types_select,
+    create_index_queries,
+    dependent_views_select,
+    model_rebuild_delete,
+    model_rebuild_insert,
+    model_rebuild_select,
+    partitioned_table_select,
+    schema_migration_insert,
+    schema_migrations_lock,
+    schema_migrations_select,
+    schema_migrations_table_create,
+    schema_migrations_unlock,
+    schema_migrations_xact_lock,
+    season_stats_partition_queries,
+    table_exists_select,
+    type_exists_select,
+)
+
+# Advisory lock key held while migrations are applied
+MIGRATION_LOCK_ID = 20_242_025
+
+# Cumulative model tables a migration can ask the next model run to rebuild in full
+CUMULATIVE_MODEL_TABLES = ["raw.team_stats_regular_season", "raw.team_stats_playoffs"]
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Migrations
+###########################################################################################################################################
+
+
+class Migration:
+    """
+    One versioned, non-destructive schema change. Migrations are applied in version order, each in
+    its own transaction together with the row recording it in public.schema_migrations, so a
+    failed migration leaves the database at the previous version.
+
+    Args:
+        version (int): The unique version; a higher version is applied after a lower one.
+        name (str): A short description printed and recorded when the migration is applied.
+        apply (Callable[[ps.extensions.cursor], None]): Runs the migration's DDL on a cursor.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        name: str,
+        apply: Callable[[ps.extensions.cursor], None],
+    ) -> None:
+        self.version = version
+        self.name = name
+        self.apply = apply
+
+
+def drop_dependent_views(cur: ps.extensions.cursor, table: str) -> None:
+    """
+    Drops the views (e.g. dbt models) reading a table, which block changes to its columns or its
+    removal; dbt recreates them on its next run.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        table (str): The schema-qualified table.
+    """
+    cur.execute(table_exists_select, (table,))
+    if cur.fetchone()[0] is None:
+        return None
+    cur.execute(dependent_views_select, (table,))
+    for view_schema, view_name in cur.fetchall():
+        cur.execute(
+            sql.SQL("DROP VIEW IF EXISTS {view} CASCADE;").format(
+                view=sql.Identifier(view_schema, view_name)
+            )
+        )
+        print(f"Dropped dependent view {view_schema}.{view_name}")
+
+    return None
+
+
+def request_model_rebuild(cur: ps.extensions.cursor, table: str, version: int) -> None:
+    """
+    Records that a cumulative model table must be rebuilt in full, so the next model run ignores
+    incremental mode for it.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        table (str): The schema-qualified cumulative model table.
+        version (int): The migration asking for the rebuild.
+    """
+    cur.execute(model_rebuild_insert, (table, version))
+    print(f"{table} will be rebuilt in full by the next model run")
+
+    return None
+
+
+def model_rebuild_requested(cur: ps.extensions.cursor, table: str) -> Optional[int]:
+    """
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        table (str): The schema-qualified cumulative model table.
+
+    Returns:
+        Optional[int]: The migration that asked for a full rebuild of the table, or None if none did.
+    """
+    cur.execute(table_exists_select, ("public.model_rebuilds",))
+    if cur.fetchone()[0] is None:
+        return None
+    cur.execute(model_rebuild_select, (table,))
+    row = cur.fetchone()
+
+    return row[0] if row is not None else None
+
+
+def clear_model_rebuild(cur: ps.extensions.cursor, table: str) -> None:
+    """
+    Removes the rebuild request of a cumulative model table; called in the transaction that
+    rebuilds it, so the request is only dropped together with the rebuilt rows.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        table (str): The schema-qualified cumulative model table.
+    """
+    cur.execute(model_rebuild_delete, (table,))
+
+    return None
+
+
+def create_schema(cur: ps.extensions.cursor) -> None:
+    """
+    Creates the raw and analytics schemas, their season stats types and every table in the
+    original float/varchar layout, from the DDL frozen in Migration_Schemas_NHL. Objects that
+    already exist are kept, so a database created before migrations were versioned adopts this
+    version without losing rows.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+    """
+    cur.execute("CREATE SCHEMA IF NOT EXISTS raw;")
+    cur.execute("CREATE SCHEMA IF NOT EXISTS analytics;")
+    for type_name, query in v1_create_type_queries.items():
+        cur.execute(type_exists_select, (type_name,))
+        if cur.fetchone()[0] is None:
+            cur.execute(query)
+    for query in v1_create_table_queries:
+        cur.execute(query)
+
+    return None
+
+
+def compact_season_stats_types(cur: ps.extensions.cursor) -> None:
+    """
+    Converts every raw.season_stats stat not yet in its compact type, keeping every row, from the
+    DDL frozen in Migration_Schemas_NHL. A table whose stats all have their compact types is left
+    untouched:
+      - Drops the views reading the changed tables (dbt recreates them on its next run).
+      - Converts counts to smallint, rates to real and time on ice to seconds.
+      - Recreates raw/analytics.season_stats_type with the compact types.
+      - Recreates the cumulative tables empty and records in public.model_rebuilds that the next
+        model run must rebuild them in full, even an incremental one.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+    """
+    cur.execute(v2_model_rebuilds_table_create)
+    cur.execute(column_types_select, ("raw", "season_stats"))
+    alter_query = v2_compact_types_alter(dict(cur.fetchall()))
+    if alter_query is None:
+        return None
+
+    for table in ["raw.season_stats"] + CUMULATIVE_MODEL_TABLES:
+        drop_dependent_views(cur, table)
+
+    for query in (
+        v2_cumulative_data_model_drop_queries + v2_season_stats_type_drop_queries
+    ):
+        cur.execute(query)
+    cur.execute(alter_query)
+    for query in (
+        v2_season_stats_type_create_queries() + v2_cumulative_data_model_create_queries
+    ):
+        cur.execute(query)
+    for table in CUMULATIVE_MODEL_TABLES:
+        request_model_rebuild(cur, table, version=2)
+
+    return None
+
+
+def create_indexes(cur: ps.extensions.cursor) -> None:
+    """
+    Adds the physical design the cumulative models and dbt read through:
+      - A stored start_year column on raw.season_stats, generated from season_id, so the models
+        no longer join raw.season and parse its season string.
+      - An index on raw.season_stats (game_type_id, season_id) for the models' game type and
+        start season filters.
+      - An index on current_season in each cumulative table for the dbt staging views, the marts
+        and incremental builds.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+    """
+    for query in create_index_queries:
+        cur.execute(query)
+
+    return None
+
+
+# Every schema change, in version order. Append new migrations; never edit or renumber applied ones
+MIGRATIONS = [
+    Migration(1, "create raw and analytics schemas and tables", create_schema),
+    Migration(2, "compact raw.season_stats column types", compact_season_stats_types),
+    Migration(3, "stored start_year column and read indexes", create_indexes),
+]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Apply pending migrations
+###########################################################################################################################################
+
+
+def check_migrations(migrations: List[Migration]) -> None:
+    """
+    Checks that migration versions are positive, unique and in ascending order.
+
+    Args:
+        migrations (List[Migration]): The migrations.
+
+    Raises:
+        ValueError: If the versions are out of order or repeated.
+    """
+    versions = [migration.version for migration in migrations]
+    if any(version < 1 for version in versions) or versions != sorted(set(versions)):
+        raise ValueError(
+            "migration versions must be positive, unique and ascending: "
+            + str(versions)
+        )
+
+    return None
+
+
+def applied_versions(cur: ps.extensions.cursor) -> List[int]:
+    """
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        List[int]: The applied migration versions in ascending order; empty for a new database.
+    """
+    cur.execute(table_exists_select, ("public.schema_migrations",))
+    if cur.fetchone()[0] is None:
+        return []
+    cur.execute(schema_migrations_select)
+
+    return [version for (version,) in cur.fetchall()]
+
+
+def require_migrations(cur: ps.extensions.cursor, version: int) -> None:
+    """
+    Checks that every migration up to a version has been applied, so a stage relying on the
+    schema fails with a clear message instead of e.g. a missing column error.
+
+    Args:
+        cur (ps.extensions.cursor): The database cursor.
+        version (int): The version the stage needs.
+
+    Raises:
+        RuntimeError: If a migration up to the version has not been applied.
+    """
+    applied = set(applied_versions(cur))
+    missing = [
+        migration
+        for migration in MIGRATIONS
+        if migration.version <= version and migration.version not in applied
+    ]
+    if missing:
+        raise RuntimeError(
+            "nhldb is missing schema migration "
+            + ", ".join(
+                f"{migration.version} ({migration.name})" for migration in missing
+            )
+            + "; run `python ETL/Start_ETL.py migrate` first"
+        )
+
+    return None
+
+
+def migrate(
+    connection_pool: Optional[ConnectionPool] = None,
+    migrations: Optional[List[Migration]] = None,
+    target: Optional[int] = None,
+    dry_run: bool = False,
+) -> List[int]:
+    """
+    Applies the pending migrations to nhldb in version order. Applied versions are recorded in
+    public.schema_migrations, so each run only applies DDL the database does not have yet and
+    never drops data the migrations do not explicitly change.
+
+    An advisory lock is held while migrating, so concurrent runs apply each migration once.
+
+    Args:
+        connection_pool (Optional[ConnectionPool]): The nhldb pool. Defaults to the shared pool.
+        migrations (Optional[List[Migration]]): The migrations. Defaults to MIGRATIONS.
+        target (Optional[int]): The highest version to apply. Defaults to the newest.
+        dry_run (bool): Whether to only print the pending migrations.
+
+    Returns:
+        List[int]: The versions applied (or, in a dry run, pending).
+
+    Raises:
+        ValueError: If the migration versions are invalid.
+        ps.Error: If a migration fails; it is rolled back and later ones are not applied.
+    """
+    migrations = MIGRATIONS if migrations is None else migrations
+    check_migrations(migrations)
+    connection_pool = connection_pool or get_pool()
+
+    if dry_run:
+        with connection_pool.transaction() as cur:
+            applied = set(applied_versions(cur))
+        pending = [
+            migration
+            for migration in migrations
+            if migration.version not in applied
+            and (target is None or migration.version <= target)
+        ]
+        for migration in pending:
+            print(f"Would apply migration {migration.version}: {migration.name}")
+        if not pending:
+            print("Would apply nothing: nhldb is up to date")
+        return [migration.version for migration in pending]
+
+    done: List[int] = []
+    with connection_pool.connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(schema_migrations_lock, (MIGRATION_LOCK_ID,))
+            try:
+                cur.execute(schema_migrations_table_create)
+                conn.commit()
+                applied = set(applied_versions(cur))
+                for migration in migrations:
+                    if migration.version in applied or (
+                        target is not None and migration.version > target
+                    ):
+                        continue
+                    try:
+                        migration.apply(cur)
+                        cur.execute(
+                            schema_migration_insert,
+                            (migration.version, migration.name),
+                        )
+                        conn.commit()
+                    except ps.Error:
+                        conn.rollback()
+                        print(f"Migration {migration.version} failed: {migration.name}")
+                        raise
+                    done.append(migration.version)
+                    print(f"Applied migration {migration.version}: {migration.name}")
+            finally:
+                conn.rollback()
+                cur.execute(schema_migrations_unlock, (MIGRATION_LOCK_ID,))
+                conn.commit()
+
+    if not done:
+        print("nhldb is up to date")
+
+    return done
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Optional partitioning
+###########################################################################################################################################
+
+
+def partition_season_stats(
+    connection_pool: Optional[ConnectionPool] = None, dry_run: bool = False
+) -> bool:
+    """
+    Rebuilds raw.season_stats as a table list-partitioned by game type (regular season, playoffs
+    and a default partition), copying every row in one transaction. The cumulative models and
+    the loads then only touch their game type's partition.
+
+    This is optional and not a versioned migration: it rewrites the table and drops the views
+    reading it (dbt recreates them), so it only runs when asked for. It needs migration 3 and is
+    skipped if the table is already partitioned; rebuilding nhldb returns to one table.
+
+    Args:
+        connection_pool (Optional[ConnectionPool]): The nhldb pool. Defaults to the shared pool.
+        dry_run (bool): Whether to only print whether the table would be partitioned.
+
+    Returns:
+        bool: True if the table was (or would be) partitioned.
+    """
+    with (connection_pool or get_pool()).transaction() as cur:
+        cur.execute(schema_migrations_xact_lock, (MIGRATION_LOCK_ID,))
+        cur.execute(partitioned_table_select, ("raw.season_stats",))
+        if cur.fetchone() is not None:
+            print("raw.season_stats is already partitioned by game type")
+            return False
+        if dry_run:
+            print("Would partition raw.season_stats by game type")
+            return True
+
+        drop_dependent_views(cur, "raw.season_stats")
+        for query in season_stats_partition_queries:
+            cur.execute(query)
+    print("raw.season_stats partitioned by game type")
+
+    return True
@@ -0,0 +1,240 @@
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+import psycopg2 as ps
+from dotenv import load_dotenv
+from psycopg2.extensions import make_dsn
+from psycopg2.pool import ThreadedConnectionPool
+
+load_dotenv()
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Connection settings
+###########################################################################################################################################
+
+# A complete libpq connection string or URI (e.g. postgresql://user@host:5432/nhldb); when set it
+# replaces the DB_HOST/DB_PORT/DB_USER/DB_NAME settings, and DB_PASSWORD still fills in the password
+DB_DSN = os.getenv("DB_DSN")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT")
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_NAME = os.getenv("DB_NAME", "nhldb")
+DB_PASSWORD = os.getenv("DB_PASSWORD")
+
+# Maximum number of open nhldb connections; callers beyond it wait for a connection to be returned
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+
+# Rows fetched per round trip by server-side cursors
+STREAM_ITERSIZE = 10000
+
+
+def build_dsn(password: Optional[str] = None, dbname: Optional[str] = None) -> str:
+    """
+    Builds the connection string from DB_DSN, or from the DB_HOST/DB_PORT/DB_USER/DB_NAME settings.
+
+    Args:
+        password (Optional[str]): The database password. Defaults to DB_PASSWORD from environment variables.
+        dbname (Optional[str]): The database to connect to, e.g. 'postgres' to create nhldb. Defaults to DB_NAME.
+
+    Returns:
+        str: The libpq connection string.
+    """
+    overrides = {
+        key: value
+        for key, value in (
+            ("password", password or DB_PASSWORD),
+            ("dbname", dbname),
+        )
+        if value
+    }
+    if DB_DSN:
+        return make_dsn(DB_DSN, **overrides)
+
+    settings = {"host": DB_HOST, "port": DB_PORT, "user": DB_USER, "dbname": DB_NAME}
+    settings.update(overrides)
+
+    return make_dsn(**{key: value for key, value in settings.items() if value})
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Connection pool
+###########################################################################################################################################
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of nhldb connections shared by every loader, model builder and reader.
+
+    Connections are opened on first use, so creating a pool (e.g. for a dry run) never connects.
+    Borrowing a connection when all `size` are in use waits until one is returned instead of
+    failing, so parallel loads and model builds can share a small pool. A connection returned
+    with an open transaction is rolled back, and one that was closed is replaced.
+
+    Args:
+        dsn (Optional[str]): The libpq connection string. Defaults to build_dsn().
+        size (int): The maximum number of open connections.
+    """
+
+    def __init__(self, dsn: Optional[str] = None, size: int = DB_POOL_SIZE) -> None:
+        self.dsn = dsn or build_dsn()
+        self.size = max(size, 1)
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._guard = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connections(self) -> ThreadedConnectionPool:
+        """
+        Returns:
+            ThreadedConnectionPool: The underlying pool, opening it on first use.
+        """
+        with self._guard:
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(
+                    minconn=1, maxconn=self.size, dsn=self.dsn
+                )
+
+        return self._pool
+
+    @contextmanager
+    def connection(self) -> Iterator[ps.extensions.connection]:
+        """
+        Borrows a connection for the duration of the block. The block manages its own commits; on
+        an exception the connection is rolled back, and it is always returned to the pool.
+
+        Yields:
+            ps.extensions.connection: The borrowed connection.
+        """
+        with self._slots:
+            connections = self._connections()
+            conn = connections.getconn()
+            try:
+                yield conn
+            except BaseException:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                connections.putconn(conn, close=bool(conn.closed))
+
+    @contextmanager
+    def transaction(self) -> Iterator[ps.extensions.cursor]:
+        """
+        Runs the block in one transaction on a borrowed connection: it is committed when the block
+        finishes and rolled back if it raises.
+
+        Yields:
+            ps.extensions.cursor: A cursor on the borrowed connection.
+        """
+        with self.connection() as conn:
+            with conn.cursor() as cur:
+                yield cur
+            conn.commit()
+
+    @contextmanager
+    def autocommit(self) -> Iterator[ps.extensions.cursor]:
+        """
+        Runs the block on a borrowed connection in autocommit mode, for statements that cannot run
+        inside a transaction (e.g. CREATE DATABASE).
+
+        Yields:
+            ps.extensions.cursor: A cursor whose statements are committed as they run.
+        """
+        with self.connection() as conn:
+            conn.autocommit = True
+            try:
+                with conn.cursor() as cur:
+                    yield cur
+            finally:
+                if not conn.closed:
+                    conn.autocommit = False
+
+    def stream(
+        self,
+        query: Any,
+        params: Optional[Sequence[Any]] = None,
+        itersize: int = STREAM_ITERSIZE,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Yields the rows of a large read through a server-side cursor, fetching `itersize` rows per
+        round trip, so memory does not grow with the result. The connection stays borrowed until
+        the rows are exhausted or the iterator is closed.
+
+        Args:
+            query (Any): The SELECT query (a string or psycopg2.sql.Composable).
+            params (Optional[Sequence[Any]]): The query parameters.
+            itersize (int): The number of rows fetched per round trip.
+
+        Yields:
+            Tuple[Any, ...]: One row at a time.
+        """
+        with self.connection() as conn:
+            with conn.cursor(name="stream_" + uuid.uuid4().hex) as cur:
+                cur.itersize = itersize
+                cur.execute(query, params)
+                yield from cur
+            conn.commit()
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection; the pool reopens connections if it is used again.
+        """
+        with self._guard:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+        return None
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Shared connection pool
+###########################################################################################################################################
+
+_pool: Optional[ConnectionPool] = None
+_pool_guard = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the shared nhldb connection pool, creating it on first use from the DB_* environment
+    variables (DB_DSN or DB_HOST/DB_PORT/DB_USER/DB_NAME, DB_PASSWORD and DB_POOL_SIZE).
+
+    Returns:
+        ConnectionPool: The pool every stage connects through by default.
+    """
+    global _pool
+    with _pool_guard:
+        if _pool is None:
+            _pool = ConnectionPool()
+
+    return _pool
+
+
+def set_pool(connection_pool: Optional[ConnectionPool]) -> None:
+    """
+    Replaces the shared connection pool, closing the previous one.
+
+    Args:
+        connection_pool (Optional[ConnectionPool]): The new pool, or None to reset to the default on next use.
+    """
+    global _pool
+    with _pool_guard:
+        if _pool is not None and _pool is not connection_pool:
+            _pool.close()
+        _pool = connection_pool
+
+    return None
+
+
+def close_pool() -> None:
+    """
+    Closes the connections of the shared pool, if it was ever used.
+    """
+    with _pool_guard:
+        if _pool is not None:
+            _pool.close()
+
+    return None
@@ -1,23 +1,62 @@
-import random
-from time import sleep
-from typing import Any, Dict, List, Union
-
+import datetime
+import os
+import warnings
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
 import pandas as pd
+import psycopg2 as ps
 import requests
-from bs4 import BeautifulSoup
 
-pd.set_option("display.max_columns", None)
-pd.set_option("display.max_rows", None)
+from .. import MAIN_SNAPSHOT_DIR, SNAPSHOT_STORE_EXPORT_DIR
+from ..Database.Connection_Pool_NHL import ConnectionPool, get_pool
+from ..Snapshot_Store.Snapshot_Delta_Store_NHL import SnapshotStore
+from ..Snapshot_Store.Snapshot_Format_NHL import (
+    SnapshotWriter,
+    find_snapshot,
+    read_snapshot,
+)
+from ..SQL_Queries.Season_Stats_Columns_NHL import (
+    NST_MERGE_COLUMNS,
+    renamed_columns_api,
+    renamed_columns_nst,
+)
+from ..SQL_Queries.SQL_Queries import latest_loaded_season_select
+from .HTTP_Client_NHL import HTTPClient, get_http_client
+from .Normalize_Data_NHL import normalize_api_data, normalize_nst_data
+from .Run_Journal_NHL import RunJournal
+from .Table_Parser_NHL import find_table, parse_team_table
+from .Team_Alias_Index_NHL import (
+    TEAM_MERGE_KEYS,
+    TeamAliasIndex,
+    report_unmatched_teams,
+    unmatched_teams,
+)
 
-import os
-import sys
-
-# Get the current working directory (the directory of the running script)
-current_dir = os.getcwd()
+warnings.filterwarnings("ignore")
 
-import warnings
+# First season with team stats on naturalstattrick.com
+NST_FIRST_SEASON = 2007
 
-warnings.filterwarnings("ignore")
+# naturalstattrick.com stat columns (after renaming) every merged season carries
+NST_VALUE_COLUMNS = [
+    name
+    for name in renamed_columns_nst().values()
+    if name not in NST_MERGE_COLUMNS.values()
+]
 
 
 ###########################################################################################################################################
@@ -25,48 +64,211 @@ warnings.filterwarnings("ignore")
 ###########################################################################################################################################
 
 
-def nhl_season_data() -> Union[Dict[str, Any], List[Any]]:
+def nhl_season_data(
+    client: Optional[HTTPClient] = None,
+) -> Union[Dict[str, Any], List[Any]]:
     """
     Fetches the NHL season data from the NHL API.
 
+    Args:
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+
     Returns:
         Union[Dict[str, Any], List[Any]]: The JSON response from the API containing the season list.
     """
+    client = client or get_http_client()
     url = "https://api-web.nhle.com/v1/season"
-    response = requests.get(url)
+    response = client.get(url)
     data = response.json()
     seasons_list = data
 
     return seasons_list
 
 
+###########################################################################################################################################
+# NEW CODE BLOCK - Concurrent team stats fetching - NHL API
+###########################################################################################################################################
+
+
+def is_closed_season(season: Any, current_season: Optional[int]) -> bool:
+    """
+    Checks whether a season has finished, meaning its stats can never change again.
+
+    Args:
+        season (Any): The season ID (e.g. 20232024).
+        current_season (Optional[int]): The in-progress season ID, or None if unknown.
+
+    Returns:
+        bool: True if the season is older than the current season.
+    """
+    return current_season is not None and int(season) < int(current_season)
+
+
+def has_api_data(response: requests.Response) -> bool:
+    """
+    Checks that an NHL API response holds a JSON object with a 'data' list, so only real stats
+    are cached as immutable.
+
+    Args:
+        response (requests.Response): The NHL API response.
+
+    Returns:
+        bool: True if the payload has a 'data' list.
+    """
+    try:
+        payload = response.json()
+    except ValueError:
+        return False
+
+    return isinstance(payload, dict) and isinstance(payload.get("data"), list)
+
+
+def has_team_table(response: requests.Response) -> bool:
+    """
+    Checks that a naturalstattrick.com page holds a team table with rows, so a maintenance,
+    rate-limit or partially rendered page is never cached as immutable.
+
+    Args:
+        response (requests.Response): The naturalstattrick.com response.
+
+    Returns:
+        bool: True if the page has a table#teams with body cells.
+    """
+    table = find_table(response.text, table_id="teams")
+
+    return table is not None and bool(table.xpath("./tbody//td"))
+
+
+# Game type IDs used by the NHL API and their labels in the final dataset
+NHL_GAME_TYPES = {2: "Regular Season", 3: "Playoffs"}
+
+# Maximum number of concurrent requests sent to the NHL API
+NHL_API_MAX_WORKERS = 8
+
+
+def nhl_team_summary_data(
+    season: Any,
+    game_type_id: int,
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Fetches the team summary stats for a single season and game type via the NHL API.
+
+    Args:
+        season (Any): The season ID (e.g. 20232024).
+        game_type_id (int): The NHL API game type ID (2 = regular season, 3 = playoffs).
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID. Earlier seasons are closed and
+            served from the response cache without a network request.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing one row per team for the requested season and game type.
+    """
+    client = client or get_http_client()
+    url = f"https://api.nhle.com/stats/rest/en/team/summary?sort=shotsForPerGame&cayenneExp=seasonId={season}%20and%20gameTypeId={game_type_id}"
+    response = client.get(
+        url,
+        immutable=is_closed_season(season, current_season),
+        validate=has_api_data,
+    )
+    data = response.json()
+    data = data["data"]
+    df = pd.DataFrame(data)
+
+    return df
+
+
+def nhl_season_stats_data(
+    seasons_list: Union[Dict[str, Any], List[Any]],
+    game_type_ids: Iterable[int] = tuple(NHL_GAME_TYPES),
+    max_workers: int = NHL_API_MAX_WORKERS,
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+    min_season_ids: Optional[Dict[int, int]] = None,
+) -> Dict[int, pd.DataFrame]:
+    """
+    Fetches team stats for every (season, game type) pair concurrently via the NHL API.
+
+    Requests are issued from a bounded thread pool, and results are merged in the order of
+    `seasons_list`, so the output does not depend on which request finishes first.
+
+    Args:
+        seasons_list (Union[Dict[str, Any], List[Any]]): A list or dictionary of seasons (as returned by nhl_season_data).
+        game_type_ids (Iterable[int]): The NHL API game type IDs to fetch. Defaults to regular season and playoffs.
+        max_workers (int): The maximum number of requests in flight at once.
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID. Defaults to the latest season in `seasons_list`.
+        min_season_ids (Optional[Dict[int, int]]): The earliest season ID to fetch per game type ID,
+            used by incremental extracts. Game types missing from the mapping are fetched in full.
+
+    Returns:
+        Dict[int, pd.DataFrame]: A concatenated DataFrame per game type ID, labelled with its 'gameType'.
+    """
+    client = client or get_http_client()
+    if current_season is None:
+        current_season = max(int(season) for season in seasons_list)
+    game_type_ids = list(game_type_ids)
+    min_season_ids = min_season_ids or {}
+    pairs = [
+        (season, game_type_id)
+        for game_type_id in game_type_ids
+        for season in seasons_list
+        if int(season) >= min_season_ids.get(game_type_id, 0)
+    ]
+
+    # executor.map yields results in submission order, keeping the merge deterministic
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(
+            executor.map(
+                lambda pair: nhl_team_summary_data(
+                    *pair, client=client, current_season=current_season
+                ),
+                pairs,
+            )
+        )
+
+    data_frames = {}
+    for game_type_id in game_type_ids:
+        game_type_frames = [
+            df
+            for (_, pair_game_type_id), df in zip(pairs, frames)
+            if pair_game_type_id == game_type_id
+        ]
+        df = pd.concat(game_type_frames) if game_type_frames else pd.DataFrame()
+        df["gameType"] = NHL_GAME_TYPES[game_type_id]
+        data_frames[game_type_id] = df
+
+    return data_frames
+
+
 ###########################################################################################################################################
 # NEW CODE BLOCK - Get regular season stats per team - NHL API
 ###########################################################################################################################################
 
 
 def nhl_regular_season_data(
-    seasons_list: Union[Dict[str, Any], List[Any]]
+    seasons_list: Union[Dict[str, Any], List[Any]],
+    max_workers: int = NHL_API_MAX_WORKERS,
+    client: Optional[HTTPClient] = None,
 ) -> pd.DataFrame:
     """
     Fetches regular season statistics per team for each season provided via the NHL API.
 
     Args:
         seasons_list (Union[Dict[str, Any], List[Any]]): A list or dictionary of seasons (as returned by nhl_season_data).
+        max_workers (int): The maximum number of requests in flight at once.
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
 
     Returns:
         pd.DataFrame: A concatenated DataFrame containing the regular season stats for all teams.
     """
-    list_of_data_frames = []
-    for season in seasons_list:
-        url = f"https://api.nhle.com/stats/rest/en/team/summary?sort=shotsForPerGame&cayenneExp=seasonId={season}%20and%20gameTypeId=2"
-        response = requests.get(url)
-        data = response.json()
-        data = data["data"]
-        df = pd.DataFrame(data)
-        list_of_data_frames.append(df)
-    df = pd.concat(list_of_data_frames)
-    df["gameType"] = "Regular Season"
+    df = nhl_season_stats_data(
+        seasons_list=seasons_list,
+        game_type_ids=[2],
+        max_workers=max_workers,
+        client=client,
+    )[2]
 
     return df
 
@@ -76,26 +278,80 @@ def nhl_regular_season_data(
 ###########################################################################################################################################
 
 
-def nhl_playoff_data(seasons_list: Union[Dict[str, Any], List[Any]]) -> pd.DataFrame:
+def nhl_playoff_data(
+    seasons_list: Union[Dict[str, Any], List[Any]],
+    max_workers: int = NHL_API_MAX_WORKERS,
+    client: Optional[HTTPClient] = None,
+) -> pd.DataFrame:
     """
     Fetches playoff statistics per team for each season provided via the NHL API.
 
     Args:
         seasons_list (Union[Dict[str, Any], List[Any]]): A list or dictionary of seasons (as returned by nhl_season_data).
+        max_workers (int): The maximum number of requests in flight at once.
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
 
     Returns:
         pd.DataFrame: A concatenated DataFrame containing the playoff stats for all teams.
     """
-    list_of_data_frames = []
-    for season in seasons_list:
-        url = f"https://api.nhle.com/stats/rest/en/team/summary?sort=shotsForPerGame&cayenneExp=seasonId={season}%20and%20gameTypeId=3"
-        response = requests.get(url)
-        data = response.json()
-        data = data["data"]
-        df = pd.DataFrame(data)
-        list_of_data_frames.append(df)
-    df = pd.concat(list_of_data_frames)
-    df["gameType"] = "Playoffs"
+    df = nhl_season_stats_data(
+        seasons_list=seasons_list,
+        game_type_ids=[3],
+        max_workers=max_workers,
+        client=client,
+    )[3]
+
+    return df
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Get team stats for one season - naturalstatrick.com
+###########################################################################################################################################
+
+
+def natural_statrick_season_data(
+    season: int,
+    game_type_id: int,
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Scrapes the 5v5 team table of a single season and game type from naturalstattrick.com.
+
+    Args:
+        season (int): The season start year (e.g. 2023 for 2023-24).
+        game_type_id (int): The game type ID (2 = regular season, 3 = playoffs).
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID. Earlier seasons are closed and
+            served from the response cache without a network request.
+
+    Returns:
+        Optional[pd.DataFrame]: The typed team stats, or None if the page has no team table yet.
+    """
+    client = client or get_http_client()
+    season_id = str(season) + str(season + 1)
+    url = f"https://www.naturalstattrick.com/teamtable.php?fromseason={season_id}&thruseason={season_id}&stype={game_type_id}&sit=5v5&score=all&rate=n&team=all&loc=B&gpf=410&fd=&td="
+
+    # One request per page; the client's rate limiter paces naturalstattrick.com
+    response = client.get(
+        url,
+        immutable=is_closed_season(season_id, current_season),
+        validate=has_team_table,
+    )
+    print("status code: " + str(response.status_code))
+    print("scraping " + NHL_GAME_TYPES[game_type_id].lower() + " season: " + season_id)
+
+    # Stream only table#teams out of the page; columns are derived from its header row
+    df = parse_team_table(response.text, table_id="teams")
+    if df is None:
+        print("no team table for season: " + season_id)
+        return None
+
+    df["Season"] = season_id
+    df["GameType"] = NHL_GAME_TYPES[game_type_id]
+    df = df.drop(
+        ["OTL", "Point %", "Points", "ROW", "Column_0"], axis=1, errors="ignore"
+    )
 
     return df
 
@@ -105,54 +361,42 @@ def nhl_playoff_data(seasons_list: Union[Dict[str, Any], List[Any]]) -> pd.DataF
 ###########################################################################################################################################
 
 
-def natural_statrick_regular_season_data() -> pd.DataFrame:
+def natural_statrick_regular_season_data(
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+    seasons: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
     """
-    Scrapes regular season team statistics from naturalstattrick.com for seasons 2007 to 2023.
-    Saves the resulting DataFrame as "Regular_Season_Data.csv".
+    Scrapes regular season team statistics from naturalstattrick.com, by default for every season
+    from 2007 up to the current season. Nothing is written to disk; the seasons are returned as
+    one frame.
+
+    Args:
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID. Earlier seasons are closed and
+            served from the response cache without a network request.
+        seasons (Optional[Iterable[int]]): The season start years to scrape (e.g. 2023 for 2023-24).
+            Defaults to every naturalstattrick.com season in the NHL API season list.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the scraped regular season stats.
+        pd.DataFrame: The typed team stats of every season with a team table, with their Season
+            and GameType columns; empty if no season has one.
     """
+    client = client or get_http_client()
+    if seasons is None:
+        seasons = nst_season_start_years(nhl_season_data(client=client))
     df_list = []
-    for season in range(2007, 2025):  # Manually set the years
-        game_type = 2
-        url = f"https://www.naturalstattrick.com/teamtable.php?fromseason={str(season)+str(season+1)}&thruseason={str(season)+str(season+1)}&stype={game_type}&sit=5v5&score=all&rate=n&team=all&loc=B&gpf=410&fd=&td="
-
-        req = requests.get(url)
-        print("status code: " + str(req.status_code))
-        print("scraping regular season: " + str(season) + str(season + 1))
-
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        table = soup.find("table", id="teams")
-
-        # Extract headers from table; if header text is empty, a default column name is assigned
-        headers = [
-            th.get_text().strip() if th.get_text().strip() else f"Column_{i}"
-            for i, th in enumerate(table.find("thead").find_all("th"))
-        ]
-
-        # Extract rows from table body.
-        rows = []
-        for row in table.find("tbody").find_all("tr"):
-            cells = [cell.get_text().strip() for cell in row.find_all("td")]
-            rows.append(cells)
-
-        # Flatten the rows list and regroup by the number of columns expected (72)
-        rows = rows[0]
-        table_data = [rows[i : i + 72] for i in range(0, len(rows), 72)]
-
-        df = pd.DataFrame(table_data, columns=headers)
-        df["Season"] = str(season) + str(season + 1)
-        df["GameType"] = "Regular Season"
-        df = df.drop(
-            ["OTL", "Point %", "Points", "ROW", "Column_0"], axis=1, errors="ignore"
+    for season in seasons:
+        df = natural_statrick_season_data(
+            season=season,
+            game_type_id=2,
+            client=client,
+            current_season=current_season,
         )
-        df_list.append(df)
-
-        sleep(random.uniform(30, 60))
+        if df is not None:
+            df_list.append(df)
 
-    df = pd.concat(df_list, axis=0)
+    df = pd.concat(df_list, axis=0) if df_list else pd.DataFrame()
 
     return df
 
@@ -162,238 +406,266 @@ def natural_statrick_regular_season_data() -> pd.DataFrame:
 ###########################################################################################################################################
 
 
-def natural_statrick_playoff_data() -> pd.DataFrame:
+def natural_statrick_playoff_data(
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+    seasons: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
     """
-    Scrapes playoff team statistics from naturalstattrick.com for seasons 2007 to 2023.
-    Saves the resulting DataFrame as "Playoffs_Data.csv".
+    Scrapes playoff team statistics from naturalstattrick.com, by default for every season from
+    2007 up to the current season. Seasons whose playoffs have not started yet are skipped.
+    Nothing is written to disk; the seasons are returned as one frame.
+
+    Args:
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID. Earlier seasons are closed and
+            served from the response cache without a network request.
+        seasons (Optional[Iterable[int]]): The season start years to scrape (e.g. 2023 for 2023-24).
+            Defaults to every naturalstattrick.com season in the NHL API season list.
 
     Returns:
-        pd.DataFrame: A DataFrame containing the scraped playoff stats.
+        pd.DataFrame: The typed team stats of every season with a playoff team table, with their
+            Season and GameType columns; empty if no season has one.
     """
+    client = client or get_http_client()
+    if seasons is None:
+        seasons = nst_season_start_years(nhl_season_data(client=client))
     df_list = []
-    for season in range(2007, 2024):  # Manually set the years
-        game_type = 3
-        url = f"https://www.naturalstattrick.com/teamtable.php?fromseason={str(season)+str(season+1)}&thruseason={str(season)+str(season+1)}&stype={game_type}&sit=5v5&score=all&rate=n&team=all&loc=B&gpf=410&fd=&td="
-
-        req = requests.get(url)
-        print("status code: " + str(req.status_code))
-        print("scraping playoff season: " + str(season) + str(season + 1))
-
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
-        table = soup.find("table", id="teams")
-
-        # Extract headers from table; if header text is empty, a default column name is assigned
-        headers = [
-            th.get_text().strip() if th.get_text().strip() else f"Column_{i}"
-            for i, th in enumerate(table.find("thead").find_all("th"))
-        ]
-
-        # Extract rows from table body.
-        rows = []
-        for row in table.find("tbody").find_all("tr"):
-            cells = [cell.get_text().strip() for cell in row.find_all("td")]
-            rows.append(cells)
-
-        # Flatten the rows list and regroup by the expected number of columns (68)
-        rows = rows[0]
-        table_data = [rows[i : i + 68] for i in range(0, len(rows), 68)]
-
-        df = pd.DataFrame(table_data, columns=headers)
-        df["Season"] = str(season) + str(season + 1)
-        df["GameType"] = "Playoffs"
-        df = df.drop(
-            ["OTL", "Point %", "Points", "ROW", "Column_0"], axis=1, errors="ignore"
+    for season in seasons:
+        df = natural_statrick_season_data(
+            season=season,
+            game_type_id=3,
+            client=client,
+            current_season=current_season,
         )
-        df_list.append(df)
+        if df is not None:
+            df_list.append(df)
 
-        sleep(random.uniform(30, 60))
-
-    df = pd.concat(df_list, axis=0)
+    df = pd.concat(df_list, axis=0) if df_list else pd.DataFrame()
 
     return df
 
 
 ###########################################################################################################################################
-# NEW CODE BLOCK - Run all functions to get season stats from 1983 to 2021 and playoff teams
+# NEW CODE BLOCK - Incremental extract helpers
 ###########################################################################################################################################
 
 
-def extract() -> None:
+def nst_season_start_years(
+    seasons_list: Union[Dict[str, Any], List[Any]], min_season_id: int = 0
+) -> List[int]:
     """
-    Executes the entire data extraction and merging process:
-      - Retrieves season list from NHL API.
-      - Fetches regular season and playoff stats per team via the NHL API.
-      - Scrapes regular season and playoff stats per team from naturalstattrick.com.
-      - Merges both data sources and saves the final dataset as a CSV file.
+    Converts NHL API season IDs into the naturalstattrick.com season start years to scrape.
+
+    Args:
+        seasons_list (Union[Dict[str, Any], List[Any]]): A list of season IDs (as returned by nhl_season_data).
+        min_season_id (int): The earliest season ID to include.
 
     Returns:
-        None
+        List[int]: The start years (e.g. 2023 for 20232024) from 2007 onwards, in ascending order.
     """
-    # Get all season data from NHL API
-    seasons_list = nhl_season_data()
+    return sorted(
+        int(str(season)[:4])
+        for season in seasons_list
+        if int(str(season)[:4]) >= NST_FIRST_SEASON and int(season) >= min_season_id
+    )
 
-    # Retrieve regular season stats per team from NHL API
-    regular_season_data = nhl_regular_season_data(seasons_list=seasons_list)
 
-    # Retrieve playoff stats per team from NHL API.
-    playoff_data = nhl_playoff_data(seasons_list=seasons_list)
+def latest_loaded_seasons(
+    connection_pool: Optional[ConnectionPool] = None,
+) -> Dict[int, int]:
+    """
+    Looks up the latest season already loaded into nhldb for each game type.
 
-    # Combine regular season and playoff stats from NHL API
-    full_data_api = pd.concat([regular_season_data, playoff_data]).reset_index(
-        drop=True
-    )
+    Args:
+        connection_pool (Optional[ConnectionPool]): The nhldb pool. Defaults to the shared pool.
 
-    # Rename columns for consistency in the NHL API dataset
-    renamed_columns_api = {
-        "faceoffWinPct": "faceoff_win_pct",
-        "gamesPlayed": "games_played",
-        "goalsAgainst": "goals_against",
-        "goalsAgainstPerGame": "goals_against_per_game",
-        "goalsFor": "goals_for",
-        "goalsForPerGame": "goals_for_per_game",
-        "losses": "losses",
-        "otLosses": "overtime_losses",
-        "penaltyKillNetPct": "penalty_kill_net_pct",
-        "penaltyKillPct": "penalty_kill_pct",
-        "pointPct": "points_pct",
-        "points": "points",
-        "powerPlayNetPct": "power_play_net_pct",
-        "powerPlayPct": "power_play_pct",
-        "regulationAndOtWins": "regulation_and_overtime_wins",
-        "seasonId": "season_id",
-        "shotsAgainstPerGame": "shots_against_per_game",
-        "shotsForPerGame": "shots_for_per_game",
-        "teamFullName": "team_full_name",
-        "teamId": "team_id",
-        "ties": "ties",
-        "wins": "wins",
-        "winsInRegulation": "wins_in_regulation",
-        "winsInShootout": "wins_in_shootout",
-        "gameType": "game_type",
-    }
-    full_data_api = full_data_api.rename(columns=renamed_columns_api)
-    full_data_api.to_csv("full_data_api.csv", index=False)
-
-    # Retrieve naturalstattrick.com regular season stats per team
-    regular_season_data_nst = natural_statrick_regular_season_data()
-
-    # Retrieve naturalstattrick.com playoff stats per team
-    playoffs_data_nst = natural_statrick_playoff_data()
-
-    # Combine naturalstattrick.com regular season and playoff stats
-    full_data_nst = pd.concat([regular_season_data_nst, playoffs_data_nst], axis=0)
-
-    # Rename columns for consistency in the naturalstattrick dataset
-    renamed_columns_nst = {
-        "Team": "team",
-        "GP": "games_played",
-        "TOI": "time_on_ice",
-        "W": "wins",
-        "L": "losses",
-        "CF": "corsi_for",
-        "CA": "corsi_against",
-        "CF%": "corsi_for_pct",
-        "FF": "fenwick_for",
-        "FA": "fenwick_against",
-        "FF%": "fenwick_for_pct",
-        "SF": "shots_for",
-        "SA": "shots_against",
-        "SF%": "shots_for_pct",
-        "GF": "goals_for",
-        "GA": "goals_against",
-        "GF%": "goals_for_pct",
-        "xGF": "expected_goals_for",
-        "xGA": "expected_goals_against",
-        "xGF%": "expected_goals_for_pct",
-        "SCF": "scoring_chances_for",
-        "SCA": "scoring_chances_against",
-        "SCF%": "scoring_chances_for_pct",
-        "SCSF": "scoring_chances_shots_for",
-        "SCSA": "scoring_chances_shots_against",
-        "SCSF%": "scoring_chances_shots_for_pct",
-        "SCGF": "scoring_chances_goals_for",
-        "SCGA": "scoring_chances_goals_against",
-        "SCGF%": "scoring_chances_goals_for_pct",
-        "SCSH%": "scoring_chances_shooting_pct",
-        "SCSV%": "scoring_chances_save_pct",
-        "HDCF": "high_danger_chances_for",
-        "HDCA": "high_danger_chances_against",
-        "HDCF%": "high_danger_chances_for_pct",
-        "HDSF": "high_danger_shots_for",
-        "HDSA": "high_danger_shots_against",
-        "HDSF%": "high_danger_shots_for_pct",
-        "HDGF": "high_danger_goals_for",
-        "HDGA": "high_danger_goals_against",
-        "HDGF%": "high_danger_goals_for_pct",
-        "HDSH%": "high_danger_shooting_pct",
-        "HDSV%": "high_danger_save_pct",
-        "MDCF": "medium_danger_chances_for",
-        "MDCA": "medium_danger_chances_against",
-        "MDCF%": "medium_danger_chances_for_pct",
-        "MDSF": "medium_danger_shots_for",
-        "MDSA": "medium_danger_shots_against",
-        "MDSF%": "medium_danger_shots_for_pct",
-        "MDGF": "medium_danger_goals_for",
-        "MDGA": "medium_danger_goals_against",
-        "MDGF%": "medium_danger_goals_for_pct",
-        "MDSH%": "medium_danger_shooting_pct",
-        "MDSV%": "medium_danger_save_pct",
-        "LDCF": "low_danger_chances_for",
-        "LDCA": "low_danger_chances_against",
-        "LDCF%": "low_danger_chances_for_pct",
-        "LDSF": "low_danger_shots_for",
-        "LDSA": "low_danger_shots_against",
-        "LDSF%": "low_danger_shots_for_pct",
-        "LDGF": "low_danger_goals_for",
-        "LDGA": "low_danger_goals_against",
-        "LDGF%": "low_danger_goals_for_pct",
-        "LDSH%": "low_danger_shooting_pct",
-        "LDSV%": "low_danger_save_pct",
-        "SH%": "shooting_pct",
-        "SV%": "save_pct",
-        "PDO": "pdo_rating",
-        "Season": "season",
-        "GameType": "game_type",
-    }
-    full_data_nst = full_data_nst.rename(columns=renamed_columns_nst)
-    full_data_nst.to_csv("full_data_nst.csv", index=False)
-
-    # Clean and convert naturalstattrick percentage columns
-    for col in full_data_nst.columns:
-        if col.endswith("_pct"):
-            if full_data_nst[col].dtype not in ["float64", "float32"]:
-                full_data_nst[col] = full_data_nst[col].astype(str)
-                full_data_nst[col] = full_data_nst[col].str.replace(
-                    "-", "0", regex=False
-                )
-                full_data_nst[col] = full_data_nst[col].astype(float)
-                full_data_nst[col] = full_data_nst[col] / 100
+    Returns:
+        Dict[int, int]: The latest loaded season ID per game type ID; empty if nothing is loaded yet.
+    """
+    with (connection_pool or get_pool()).transaction() as cur:
+        cur.execute(latest_loaded_season_select)
+        latest = {game_type_id: season_id for game_type_id, season_id in cur.fetchall()}
+
+    return latest
+
+
+def latest_stored_data(
+    main_file_search_path: str, store_export_path: str
+) -> Optional[pd.DataFrame]:
+    """
+    Reads the most recent full dataset: an extract that has not been loaded yet, otherwise the
+    latest view of the snapshot store, otherwise the newest dated snapshot stored by the ETL process.
+
+    Args:
+        main_file_search_path (str): The directory extract() writes the NHL_Data snapshot to.
+        store_export_path (str): The directory holding the Snapshot_Store directory and dated NHL_Data snapshots.
+
+    Returns:
+        Optional[pd.DataFrame]: The dataset, or None if there is none.
+    """
+    main_file = find_snapshot(main_file_search_path)
+    if main_file is not None:
+        return read_snapshot(main_file)
+    if not os.path.isdir(store_export_path):
+        return None
+    store = SnapshotStore(os.path.join(store_export_path, "Snapshot_Store"))
+    stored_dates = store.dates()
+    for date_dir in sorted(os.listdir(store_export_path), reverse=True):
+        if stored_dates and date_dir <= stored_dates[-1]:
+            break
+        stored_file = find_snapshot(os.path.join(store_export_path, date_dir))
+        if stored_file is not None:
+            return read_snapshot(stored_file)
+    if stored_dates:
+        return store.view()
+
+    return None
+
+
+def stored_batches(
+    base_df: pd.DataFrame, pairs: List[Tuple[Any, int]]
+) -> Dict[int, pd.DataFrame]:
+    """
+    Splits an existing full dataset into the rows an incremental extract keeps, per game type:
+    every (season, game type) that is not being extracted again.
+
+    Args:
+        base_df (pd.DataFrame): The existing full dataset.
+        pairs (List[Tuple[Any, int]]): The (season ID, game type ID) pairs being extracted.
+
+    Returns:
+        Dict[int, pd.DataFrame]: The kept rows per game type ID, ordered by season.
+    """
+    # Snapshots written before the integer-key merge hold season IDs as text
+    base_df = base_df.astype({"season_id": "int64"})
+    extracted = {(int(season), game_type_id) for season, game_type_id in pairs}
+
+    batches = {}
+    for game_type_id, label in NHL_GAME_TYPES.items():
+        extracted_seasons = [
+            season
+            for season, pair_game_type_id in extracted
+            if pair_game_type_id == game_type_id
+        ]
+        df = base_df[
+            (base_df["game_type"] == label)
+            & ~base_df["season_id"].isin(extracted_seasons)
+        ]
+        batches[game_type_id] = df.sort_values("season_id", kind="stable")
+
+    return batches
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Stream one season at a time - NHL API & naturalstatrick.com
+###########################################################################################################################################
+
+
+def fetch_season_sources(
+    season: Any,
+    game_type_id: int,
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+    journal: Optional[RunJournal] = None,
+) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """
+    Fetches one season and game type from both sources: the NHL API team summary and, from 2007
+    on, the naturalstattrick.com team table. With a run journal, each source is checkpointed as
+    soon as it is fetched, and sources the journal already holds are read back instead of fetched.
+
+    Args:
+        season (Any): The season ID (e.g. 20232024).
+        game_type_id (int): The NHL API game type ID (2 = regular season, 3 = playoffs).
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID; earlier seasons are served from the cache.
+        journal (Optional[RunJournal]): The journal of the current run, if it is checkpointed.
+
+    Returns:
+        Tuple[pd.DataFrame, Optional[pd.DataFrame]]: The NHL API rows labelled with their 'gameType',
+            and the naturalstattrick.com rows (None before 2007 or when the page has no table).
+    """
+    api_unit = ("api", int(season), game_type_id)
+    if journal is not None and journal.is_complete(api_unit):
+        api_df = journal.load(api_unit)
+    else:
+        api_df = nhl_team_summary_data(
+            season, game_type_id, client=client, current_season=current_season
+        )
+        if journal is not None:
+            journal.complete(api_unit, api_df)
+    api_df["gameType"] = NHL_GAME_TYPES[game_type_id]
+
+    nst_df = None
+    start_year = int(str(season)[:4])
+    nst_unit = ("nst", int(season), game_type_id)
+    if start_year >= NST_FIRST_SEASON:
+        if journal is not None and journal.is_complete(nst_unit):
+            nst_df = journal.load(nst_unit)
         else:
-            None
+            nst_df = natural_statrick_season_data(
+                season=start_year,
+                game_type_id=game_type_id,
+                client=client,
+                current_season=current_season,
+            )
+            if journal is not None:
+                journal.complete(nst_unit, nst_df)
+
+    return api_df, nst_df
+
+
+def merge_sources(
+    api_df: pd.DataFrame,
+    nst_df: Optional[pd.DataFrame],
+    alias_index: TeamAliasIndex,
+) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Renames, normalizes and merges NHL API and naturalstattrick.com rows (one season or many) on
+    integer team, season and game type keys. naturalstattrick.com team names are resolved to team
+    IDs through the alias index, after it learns the names the NHL API rows use.
 
-    # Clean and align merge keys
-    full_data_api["team_full_name"] = full_data_api["team_full_name"].str.replace(
-        "é", "e"
-    )
-    full_data_api["team_full_name"] = full_data_api["team_full_name"].str.replace(
-        ".", ""
-    )
-    full_data_nst["team"] = full_data_nst["team"].str.replace("é", "e")
-    full_data_nst["team"] = full_data_nst["team"].str.replace(".", "")
-    full_data_api["season_id"] = full_data_api["season_id"].astype(str)
-    full_data_nst["season"] = full_data_nst["season"].astype(str)
-
-    # Merge the NHL API data and naturalstattrick data on matching team, season, and game type
-    full_data = full_data_api.merge(
-        full_data_nst,
-        how="left",
-        left_on=["team_full_name", "season_id", "game_type"],
-        right_on=["team", "season", "game_type"],
-    )
+    Args:
+        api_df (pd.DataFrame): The NHL API rows labelled with their 'gameType'.
+        nst_df (Optional[pd.DataFrame]): The naturalstattrick.com rows, if any.
+        alias_index (TeamAliasIndex): The team alias index.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]: The merged rows, with every naturalstattrick.com
+            column present (missing when there was no table), and the unmatched rows from unmatched_teams.
+    """
+    game_type_ids = {
+        label: game_type_id for game_type_id, label in NHL_GAME_TYPES.items()
+    }
+
+    # Rename columns for consistency in the NHL API dataset, using the column registry
+    api_df = normalize_api_data(api_df.rename(columns=renamed_columns_api()))
+    alias_index.learn(api_df)
+    api_df["game_type_id"] = api_df["game_type"].map(game_type_ids)
+
+    if nst_df is None or nst_df.empty:
+        unmatched = {"nst": pd.DataFrame(), "api": pd.DataFrame()}
+        full_data = api_df
+    else:
+        # Parse naturalstattrick stats, convert percentages to fractions and clean the merge keys
+        # in one vectorized stage driven by the column registry
+        nst_df = normalize_nst_data(nst_df.rename(columns=renamed_columns_nst()))
+        nst_df = nst_df.rename(columns={"season": "season_id"})
+        nst_df["game_type_id"] = nst_df["game_type"].map(game_type_ids)
+        nst_df["team_id"] = alias_index.team_ids(nst_df["team"], nst_df["season_id"])
+        unmatched = unmatched_teams(api_df, nst_df)
+
+        # Merge the NHL API data and naturalstattrick data on team ID, season ID and game type ID
+        full_data = api_df.merge(
+            nst_df.dropna(subset=["team_id"])
+            .astype({"team_id": "int64"})
+            .drop(["team", "game_type"], axis=1),
+            how="left",
+            on=TEAM_MERGE_KEYS,
+        )
 
     # Drop unnecessary columns.
-    full_data = full_data.drop(["team", "season"], axis=1, errors="ignore")
+    full_data = full_data.drop(["game_type_id"], axis=1)
     # Drop duplicate columns ending with '_y' and remove the '_x' suffix from the remaining columns
     full_data = full_data.drop(
         columns=[col for col in full_data.columns if col.endswith("_y")]
@@ -402,16 +674,339 @@ def extract() -> None:
         col[:-2] if col.endswith("_x") else col for col in full_data.columns
     ]
 
-    # Save the final merged data as a CSV file
-    full_data.to_csv(
-        os.path.abspath(
-            os.path.join(current_dir, "..", "..", r"NHL_ML_Analysis/NHL_Data.csv")
-        ),
-        index=False,
+    # Seasons without naturalstattrick data still carry its columns, so every batch has the same layout
+    for column in NST_VALUE_COLUMNS:
+        if column not in full_data.columns:
+            full_data[column] = np.nan
+
+    return full_data, unmatched
+
+
+def season_batches(
+    pairs: List[Tuple[Any, int]],
+    alias_index: TeamAliasIndex,
+    client: Optional[HTTPClient] = None,
+    current_season: Optional[int] = None,
+    prefetch: int = NHL_API_MAX_WORKERS,
+    journal: Optional[RunJournal] = None,
+) -> Iterator[Tuple[int, pd.DataFrame, Dict[str, pd.DataFrame]]]:
+    """
+    Streams merged seasons in the order of `pairs`. Up to `prefetch` seasons are fetched ahead
+    on a thread pool while the caller handles the current one, so memory stays proportional to
+    the prefetch window rather than the whole history, and the caller can load early seasons
+    before the last one has been fetched. Merging happens on the calling thread.
+
+    Args:
+        pairs (List[Tuple[Any, int]]): The (season ID, game type ID) pairs to extract, in output order.
+        alias_index (TeamAliasIndex): The team alias index used to merge the sources.
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        current_season (Optional[int]): The in-progress season ID; earlier seasons are served from the cache.
+        prefetch (int): The maximum number of seasons fetched ahead.
+        journal (Optional[RunJournal]): The journal each fetched source is checkpointed to.
+
+    Yields:
+        Tuple[int, pd.DataFrame, Dict[str, pd.DataFrame]]: The game type ID, the merged rows and the
+            unmatched rows of each season that has NHL API data.
+    """
+    client = client or get_http_client()
+    pending: Deque[Future] = deque()
+    remaining = iter(pairs)
+
+    with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as executor:
+
+        def submit_next() -> None:
+            pair = next(remaining, None)
+            if pair is not None:
+                pending.append(
+                    executor.submit(
+                        lambda: (
+                            pair[1],
+                            *fetch_season_sources(
+                                *pair,
+                                client=client,
+                                current_season=current_season,
+                                journal=journal,
+                            ),
+                        )
+                    )
+                )
+
+            return None
+
+        for _ in range(max(prefetch, 1)):
+            submit_next()
+        while pending:
+            game_type_id, api_df, nst_df = pending.popleft().result()
+            submit_next()
+            if api_df.empty:
+                # No NHL API rows (e.g. playoffs that have not started yet)
+                continue
+            full_data, unmatched = merge_sources(api_df, nst_df, alias_index)
+            yield game_type_id, full_data, unmatched
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Run all functions to get season stats from 1983 to 2021 and playoff teams
+###########################################################################################################################################
+
+
+def print_extract_plan(
+    plan: Optional[Dict[str, Any]],
+    incremental: bool,
+    seasons: Optional[Set[int]],
+    game_type_ids: List[int],
+) -> None:
+    """
+    Prints the seasons extract() would fetch per game type, without any network request or
+    database query. The full season list and the latest loaded seasons are only known once the
+    NHL API and nhldb are queried, so they are described instead of listed.
+
+    Args:
+        plan (Optional[Dict[str, Any]]): The plan of the run being resumed, or None for a new run.
+        incremental (bool): Whether only seasons that are new or still in progress would be extracted.
+        seasons (Optional[Set[int]]): The season IDs requested, or None for every season.
+        game_type_ids (List[int]): The game type IDs requested.
+    """
+    if plan is not None:
+        print("Would resume the run started " + plan["started"])
+        game_type_ids = plan.get("game_type_ids", list(NHL_GAME_TYPES))
+
+    for game_type_id in game_type_ids:
+        if plan is not None:
+            planned = [
+                season for season, pair_id in plan["pairs"] if pair_id == game_type_id
+            ]
+            description = (
+                str(len(planned))
+                + " seasons"
+                + (
+                    ", " + str(planned[0]) + " to " + str(planned[-1])
+                    if planned
+                    else ""
+                )
+            )
+        elif seasons is not None:
+            description = "seasons " + ", ".join(
+                str(season) for season in sorted(seasons)
+            )
+        else:
+            description = "every season from the API"
+        if plan is None and incremental:
+            description += ", from the latest season loaded into nhldb"
+        print(
+            "Would extract " + NHL_GAME_TYPES[game_type_id].lower() + ": " + description
+        )
+
+    return None
+
+
+def extract(
+    client: Optional[HTTPClient] = None,
+    incremental: bool = False,
+    connection_pool: Optional[ConnectionPool] = None,
+    sinks: Optional[List[Any]] = None,
+    prefetch: int = NHL_API_MAX_WORKERS,
+    resume: bool = False,
+    journal: Optional[RunJournal] = None,
+    seasons: Optional[Iterable[int]] = None,
+    game_type_ids: Optional[Iterable[int]] = None,
+    dry_run: bool = False,
+) -> None:
+    """
+    Executes the entire data extraction and merging process as a stream of seasons:
+      - Retrieves season list from NHL API.
+      - Fetches each season's NHL API and naturalstattrick.com team stats, a few seasons ahead.
+      - Normalizes and merges each season on integer team, season and game type keys.
+      - Writes each merged season to the NHL_Data snapshot and any other sinks as soon as it is ready.
+
+    Only one prefetch window of seasons is held in memory, so peak memory does not grow with the
+    number of seasons, and a sink such as Transform_Load's BatchLoader loads early seasons into
+    nhldb while later ones are still being fetched. The snapshot only replaces the previous one
+    once every season has been written.
+
+    Every request is routed through one pooled HTTP client, so connections are reused
+    and transient failures are retried instead of aborting the run. Closed seasons are
+    served from the client's response cache, so after the first run only the current
+    season is fetched.
+
+    In incremental mode only seasons at or after the latest season already loaded into nhldb
+    (per game type) are extracted, so the in-progress season is refreshed and newer seasons
+    are added. The other seasons are copied from the most recent full dataset.
+
+    Every fetched (source, season, game type) unit is checkpointed to a run journal. If the run
+    fails (e.g. naturalstattrick.com stops responding part way through), rerunning with
+    resume=True repeats the same plan, reads the completed units back from the journal and
+    resumes fetching at the first incomplete one. The journal is removed once a run succeeds.
+
+    Extracting only some seasons or game types keeps the rest of the most recent full dataset,
+    like an incremental extract, so the snapshot always holds every season.
+
+    Team rows either source could not match are printed and written next to the snapshot, to
+    unmatched_nst_teams.csv and unmatched_api_teams.csv.
+
+    Args:
+        client (Optional[HTTPClient]): The HTTP client to use. Defaults to the shared client.
+        incremental (bool): Whether to extract only seasons that are new or still in progress.
+        connection_pool (Optional[ConnectionPool]): The nhldb pool used to find the loaded seasons in
+            incremental mode. Defaults to the shared pool.
+        sinks (Optional[List[Any]]): Additional sinks with write(df) and close(success) methods
+            (e.g. a BatchLoader) that each batch is written to after the snapshot.
+        prefetch (int): The maximum number of seasons fetched ahead of the one being written.
+        resume (bool): Whether to resume the previous failed run from its journal instead of starting over.
+        journal (Optional[RunJournal]): The run journal. Defaults to the journal in ETL/Run_Journal.
+        seasons (Optional[Iterable[int]]): The season IDs to extract (e.g. 20232024). Defaults to every season.
+        game_type_ids (Optional[Iterable[int]]): The game type IDs to extract. Defaults to both.
+        dry_run (bool): Whether to only print the seasons that would be extracted, without
+            fetching the season list from the NHL API or querying nhldb.
+
+    Returns:
+        None
+    """
+    main_file_search_path = MAIN_SNAPSHOT_DIR
+    store_export_path = SNAPSHOT_STORE_EXPORT_DIR
+
+    # A resumed run repeats the plan of the failed run, since a streamed load may already have
+    # moved the latest loaded seasons
+    journal = journal or RunJournal()
+    plan = journal.resume() if resume else None
+    seasons = {int(season) for season in seasons} if seasons is not None else None
+    game_type_ids = (
+        list(game_type_ids) if game_type_ids is not None else list(NHL_GAME_TYPES)
     )
+    if resume and plan is None:
+        print("No interrupted run to resume; starting a new run")
+
+    # Print the plan before any request or query; the season list is only known from the API
+    if dry_run:
+        print_extract_plan(plan, incremental, seasons, game_type_ids)
+        return None
+
+    # Get all season data from NHL API
+    client = client or get_http_client()
+    seasons_list = nhl_season_data(client=client)
+    current_season = max(int(season) for season in seasons_list)
+
+    if plan is not None:
+        incremental = plan["incremental"]
+        pairs = [(season, game_type_id) for season, game_type_id in plan["pairs"]]
+        seasons = plan.get("seasons")
+        game_type_ids = plan.get("game_type_ids", list(NHL_GAME_TYPES))
+        print(
+            "Resuming the run started "
+            + plan["started"]
+            + ": "
+            + str(len(journal.completed()))
+            + " units already fetched"
+        )
+    else:
+        # Find the latest loaded season per game type so only newer seasons are extracted
+        min_season_ids: Dict[int, int] = {}
+        if incremental:
+            try:
+                min_season_ids = latest_loaded_seasons(connection_pool=connection_pool)
+            except ps.Error as e:
+                print("\n Database Error:")
+                print(e)
+                print("Falling back to a full extract")
+            print("Latest loaded seasons per game type: " + str(min_season_ids))
+
+        # Every (season, game type) pair to extract, regular season first, in season order
+        pairs = [
+            (int(season), game_type_id)
+            for game_type_id in NHL_GAME_TYPES
+            if game_type_id in game_type_ids
+            for season in seasons_list
+            if int(season) >= min_season_ids.get(game_type_id, 0)
+            and (seasons is None or int(season) in seasons)
+        ]
+
+    if plan is None:
+        journal.start(
+            {
+                "started": datetime.datetime.now().isoformat(timespec="seconds"),
+                "incremental": incremental,
+                "seasons": sorted(seasons) if seasons is not None else None,
+                "game_type_ids": game_type_ids,
+                "pairs": pairs,
+            }
+        )
+
+    # Seasons and game types that are not extracted are kept from the most recent full dataset
+    base_df = None
+    if incremental or seasons is not None or len(game_type_ids) < len(NHL_GAME_TYPES):
+        base_df = latest_stored_data(main_file_search_path, store_export_path)
+        if base_df is None:
+            print(
+                "No stored dataset found; the extract will only contain the seasons being extracted"
+            )
+    kept = stored_batches(base_df, pairs) if base_df is not None else {}
+
+    # Write the merged data as a typed snapshot (Parquet by default, CSV optional), then to any other sinks
+    sinks = [SnapshotWriter(main_file_search_path)] + list(sinks or [])
+    alias_index = TeamAliasIndex()
+    unmatched: Dict[str, List[pd.DataFrame]] = {"nst": [], "api": []}
+    kept_written: Dict[int, int] = {}
+
+    def write(df: pd.DataFrame) -> None:
+        for sink in sinks:
+            sink.write(df)
+
+        return None
+
+    def write_kept(game_type_id: int, before: Optional[int] = None) -> None:
+        # Writes the kept rows of a game type up to (not including) a season, so kept and
+        # extracted seasons interleave in season order
+        rows = kept.get(game_type_id)
+        if rows is None:
+            return None
+        start = kept_written.get(game_type_id, 0)
+        end = rows.shape[0]
+        if before is not None:
+            end = int(np.searchsorted(rows["season_id"].to_numpy(), before))
+        if end > start:
+            write(rows.iloc[start:end])
+            kept_written[game_type_id] = end
+
+        return None
+
+    success = False
+    try:
+        for game_type_id, full_data, season_unmatched in season_batches(
+            pairs,
+            alias_index=alias_index,
+            client=client,
+            current_season=current_season,
+            prefetch=prefetch,
+            journal=journal,
+        ):
+            # Game types come in NHL_GAME_TYPES order, including those that are only kept
+            for earlier_game_type_id in NHL_GAME_TYPES:
+                if earlier_game_type_id == game_type_id:
+                    break
+                write_kept(earlier_game_type_id)
+            write_kept(game_type_id, before=int(full_data["season_id"].iloc[0]))
+            write(full_data)
+            for source, rows in season_unmatched.items():
+                if not rows.empty:
+                    unmatched[source].append(rows)
+        for game_type_id in NHL_GAME_TYPES:
+            write_kept(game_type_id)
+        success = True
+    finally:
+        for sink in sinks:
+            sink.close(success=success)
+        alias_index.save()
+        if not success:
+            print(
+                str(len(journal.completed()))
+                + " units checkpointed; rerun with --resume to continue from the first incomplete one"
+            )
+    journal.finish()
+
+    report_unmatched_teams(unmatched, output_dir=main_file_search_path)
+    print("Snapshot stored: " + str(sinks[0].rows) + " rows")
 
     return None
 
 
-if __name__ == "__main__":
-    extract()
+# Run the extract with `python -m ETL extract`; this module uses package-relative imports
@@ -0,0 +1,265 @@
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .Rate_Limiter_NHL import RateLimiter, parse_retry_after
+from .Response_Cache_NHL import ResponseCache, cached_response
+
+###########################################################################################################################################
+# NEW CODE BLOCK - HTTP client defaults
+###########################################################################################################################################
+
+# Status codes that are considered transient and are retried
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Pooled HTTP client
+###########################################################################################################################################
+
+
+class HTTPClient:
+    """
+    A shared, connection-pooled HTTP client used by every extractor.
+
+    A single requests.Session keeps connections alive between calls, so each host only pays
+    the TCP and TLS handshake once per pool slot. Transient failures (connection errors,
+    timeouts and the status codes in RETRY_STATUS_CODES) are retried with exponential backoff
+    and full jitter. Requests are paced per host by a token-bucket RateLimiter; a 429 or a
+    Retry-After header slows that host down and pauses it for as long as the server asked.
+    With a ResponseCache attached, immutable URLs are answered from disk and everything else is
+    revalidated with a conditional request.
+
+    Args:
+        max_retries (int): The number of retries after the first attempt.
+        backoff_factor (float): The base delay in seconds; attempt n waits up to backoff_factor * 2**n.
+        max_backoff (float): The upper bound in seconds for a single backoff delay.
+        timeout (float): The connect/read timeout in seconds passed to every request.
+        pool_maxsize (int): The number of keep-alive connections kept per host.
+        rate_limiter (Optional[RateLimiter]): The per-host rate limiter. Defaults to DEFAULT_HOST_RATE_LIMITS.
+        host_overrides (Optional[Dict[str, str]]): Maps a host to a replacement base URL
+            (e.g. {"api.nhle.com": "http://127.0.0.1:8000"}) so tests can route to a local stand-in server.
+        cache (Optional[ResponseCache]): The on-disk response cache, or None to always hit the network.
+        session (Optional[requests.Session]): An existing session to use instead of creating one.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 60.0,
+        timeout: float = 30.0,
+        pool_maxsize: int = 16,
+        rate_limiter: Optional[RateLimiter] = None,
+        host_overrides: Optional[Dict[str, str]] = None,
+        cache: Optional[ResponseCache] = None,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.host_overrides = dict(host_overrides or {})
+        self.cache = cache
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def _resolve_url(self, url: str) -> str:
+        """
+        Rewrites the scheme and host of a URL if the host has an override configured.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            str: The URL that will actually be requested.
+        """
+        parts = urlsplit(url)
+        override = self.host_overrides.get(parts.netloc)
+        if override is None:
+            return url
+        base = urlsplit(override)
+
+        return urlunsplit(
+            (
+                base.scheme,
+                base.netloc,
+                base.path.rstrip("/") + parts.path,
+                parts.query,
+                "",
+            )
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        """
+        Returns the jittered delay before the given retry attempt.
+
+        Args:
+            attempt (int): The zero-based retry attempt.
+
+        Returns:
+            float: The number of seconds to sleep.
+        """
+        cap = min(self.max_backoff, self.backoff_factor * (2**attempt))
+
+        return random.uniform(0, cap)
+
+    def _send(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Sends a GET request, retrying transient failures with exponential backoff.
+
+        Args:
+            url (str): The URL to request.
+            **kwargs (Any): Extra keyword arguments passed to requests.Session.get.
+
+        Returns:
+            requests.Response: The final response.
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries.
+        """
+        url = self._resolve_url(url)
+        host = urlsplit(url).netloc
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(host)
+            retry_after = None
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    self.rate_limiter.recover(host)
+                    return response
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                    return response
+                # Only slow the host down when the server explicitly asks us to
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429 or retry_after is not None:
+                    self.rate_limiter.throttle(host, retry_after)
+            # The limiter already waits out an explicit Retry-After on the next acquire
+            if retry_after is None:
+                time.sleep(self._backoff(attempt))
+
+        return response
+
+    def get(
+        self,
+        url: str,
+        immutable: bool = False,
+        validate: Optional[Callable[[requests.Response], bool]] = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """
+        Returns the response for a URL, using the response cache when one is attached.
+
+        A response is only cached as immutable once `validate` accepts its payload; anything else
+        (e.g. a maintenance or rate-limit page served with status 200) is cached as mutable and
+        revalidated on the next request. A cached immutable entry that `validate` rejects is
+        fetched again from scratch, so a cache that stored such a page recovers on its own.
+
+        Args:
+            url (str): The URL to request.
+            immutable (bool): Whether the content can never change (e.g. a closed season). Cached
+                immutable entries are served without any network request.
+            validate (Optional[Callable[[requests.Response], bool]]): Checks that a response holds
+                the expected payload. Defaults to accepting every response.
+            **kwargs (Any): Extra keyword arguments passed to requests.Session.get.
+
+        Returns:
+            requests.Response: The response; cache hits have `from_cache` set to True.
+
+        Raises:
+            requests.RequestException: If the request still fails after all retries.
+        """
+        if self.cache is None:
+            return self._send(url, **kwargs)
+
+        def is_valid(response: requests.Response) -> bool:
+            return validate is None or validate(response)
+
+        entry = self.cache.get(url)
+        if entry is not None and entry["immutable"]:
+            cached = cached_response(entry)
+            if is_valid(cached):
+                return cached
+            # Never revalidate a rejected payload; a 304 would only serve it again
+            entry = None
+
+        if entry is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+            kwargs["headers"] = headers
+
+        response = self._send(url, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cached = cached_response(entry)
+            self.cache.touch(url, response, immutable=immutable and is_valid(cached))
+            return cached
+        if response.status_code == 200:
+            self.cache.put(url, response, immutable=immutable and is_valid(response))
+
+        return response
+
+    def close(self) -> None:
+        """
+        Closes the underlying session and its pooled connections.
+        """
+        self.session.close()
+
+        return None
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Shared client
+###########################################################################################################################################
+
+_http_client: Optional[HTTPClient] = None
+_http_client_guard = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Returns the shared HTTP client, creating it on first use.
+
+    Returns:
+        HTTPClient: The client every extractor routes through by default.
+    """
+    global _http_client
+    with _http_client_guard:
+        if _http_client is None:
+            _http_client = HTTPClient(cache=ResponseCache())
+
+    return _http_client
+
+
+def set_http_client(client: Optional[HTTPClient]) -> None:
+    """
+    Replaces the shared HTTP client, e.g. with one pointed at a local stand-in server.
+
+    Args:
+        client (Optional[HTTPClient]): The new shared client, or None to reset to the default on next use.
+    """
+    global _http_client
+    with _http_client_guard:
+        _http_client = client
+
+    return None
@@ -0,0 +1,140 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..SQL_Queries.Season_Stats_Columns_NHL import (
+    nst_numeric_columns,
+    nst_percentage_columns,
+)
+from .Table_Parser_NHL import MISSING_VALUES
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Normalization defaults
+###########################################################################################################################################
+
+# Characters rewritten in team names so both sources agree (e.g. 'Montréal Canadiens', 'St. Louis Blues')
+TEAM_NAME_TRANSLATION = str.maketrans({"é": "e", ".": ""})
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Normalize merge keys
+###########################################################################################################################################
+
+
+def normalize_team_names(names: pd.Series) -> pd.Series:
+    """
+    Normalizes team names in one pass. A frame repeats the same few dozen names for every
+    season, so only the distinct names are rewritten and then mapped back to the rows.
+
+    Args:
+        names (pd.Series): The team names.
+
+    Returns:
+        pd.Series: The names with accents and periods normalized, on the same index.
+    """
+    codes, uniques = pd.factorize(names)
+    normalized = np.array(
+        [str(name).translate(TEAM_NAME_TRANSLATION) for name in uniques] + [None],
+        dtype=object,
+    )
+
+    # Missing names have code -1, which takes the trailing None
+    values = normalized[codes]
+
+    return pd.Series(values, index=names.index, name=names.name, dtype=object)
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Normalize source frames
+###########################################################################################################################################
+
+
+def parse_numeric_columns(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    Parses columns into one float block. When the table parser already typed every column the
+    block is copied out as is; otherwise missing cells ('-' or empty) are replaced and the whole
+    block is cast in one call. Blocks with other text fall back to pd.to_numeric, which turns
+    unparseable cells into NaN.
+
+    The block is always a writable copy: pandas may otherwise return a read-only view of the
+    frame's data, which the caller updates in place.
+
+    Args:
+        df (pd.DataFrame): The frame holding the columns.
+        columns (List[str]): The columns to parse.
+
+    Returns:
+        np.ndarray: A float64 array of shape (rows, columns).
+    """
+    block = df[columns]
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+        return block.to_numpy(dtype="float64", na_value=np.nan, copy=True)
+
+    block = block.replace(list(MISSING_VALUES), np.nan)
+    try:
+        block = block.astype("float64")
+    except (TypeError, ValueError):
+        block = block.apply(pd.to_numeric, errors="coerce")
+
+    return block.to_numpy(dtype="float64", na_value=np.nan, copy=True)
+
+
+def normalize_nst_data(
+    df: pd.DataFrame, numeric_columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Normalizes the renamed naturalstattrick.com frame in a single stage driven by the column registry:
+      - Parses every numeric stat into one float block.
+      - Converts every percentage stat to a fraction in one NumPy operation (missing values become 0).
+      - Normalizes the team names once and types the season IDs as integers.
+
+    Args:
+        df (pd.DataFrame): The naturalstattrick.com frame with registry column names.
+        numeric_columns (Optional[List[str]]): The stats to parse. Defaults to nst_numeric_columns().
+
+    Returns:
+        pd.DataFrame: The normalized frame.
+    """
+    numeric_columns = [
+        column
+        for column in (numeric_columns or nst_numeric_columns())
+        if column in df.columns
+    ]
+    percentage_columns = set(nst_percentage_columns())
+    is_percentage = np.array(
+        [column in percentage_columns for column in numeric_columns]
+    )
+
+    values = parse_numeric_columns(df, numeric_columns)
+    percentages = values[:, is_percentage]
+    percentages[np.isnan(percentages)] = 0
+    values[:, is_percentage] = percentages / 100
+
+    df = df.reset_index(drop=True)
+    numeric = pd.DataFrame(values, columns=numeric_columns)
+    df = pd.concat([df.drop(columns=numeric_columns), numeric], axis=1)[
+        list(df.columns)
+    ]
+    df["team"] = normalize_team_names(df["team"])
+    df["season"] = df["season"].astype("int64")
+
+    return df
+
+
+def normalize_api_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalizes the renamed NHL API frame's team names and types its season IDs as integers, like
+    normalize_nst_data.
+
+    Args:
+        df (pd.DataFrame): The NHL API frame with registry column names.
+
+    Returns:
+        pd.DataFrame: The normalized frame.
+    """
+    df = df.copy()
+    df["team_full_name"] = normalize_team_names(df["team_full_name"])
+    df["season_id"] = df["season_id"].astype("int64")
+
+    return df
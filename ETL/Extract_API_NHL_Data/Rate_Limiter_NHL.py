@@ -0,0 +1,229 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Rate limiter defaults
+###########################################################################################################################################
+
+# Requests per second and burst capacity per host
+DEFAULT_HOST_RATE_LIMITS = {
+    "api-web.nhle.com": (10.0, 10.0),
+    "api.nhle.com": (10.0, 10.0),
+    "www.naturalstattrick.com": (0.5, 1.0),
+}
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Retry-After parsing
+###########################################################################################################################################
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header given either as delta-seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): The raw header value.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Token bucket
+###########################################################################################################################################
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket whose refill rate adapts to server feedback.
+
+    Each request takes one token. Tokens refill at `rate` per second up to `capacity`, so short
+    bursts are allowed while the long-run request rate stays bounded. When the server throttles
+    (429 or Retry-After) the rate is halved and the bucket is paused until the requested time;
+    every successful request then recovers a little of the lost rate, up to the configured rate.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): The maximum number of tokens the bucket can hold.
+        min_rate (Optional[float]): The lowest rate the bucket slows down to. Defaults to rate / 16.
+    """
+
+    def __init__(
+        self, rate: float, capacity: float, min_rate: Optional[float] = None
+    ) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """
+        Adds the tokens accrued since the last update.
+
+        Args:
+            now (float): The current monotonic time.
+        """
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+        return None
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available and takes it.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Slows the bucket down after the server signalled it is overloaded.
+
+        Args:
+            retry_after (Optional[float]): Seconds the server asked us to wait, if it said so.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            if retry_after is not None:
+                self._paused_until = max(
+                    self._paused_until, self._updated + retry_after
+                )
+
+        return None
+
+    def recover(self) -> None:
+        """
+        Restores part of the rate lost to throttling after a successful request.
+        """
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 8)
+
+        return None
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Per-host rate limiter
+###########################################################################################################################################
+
+
+class RateLimiter:
+    """
+    Keeps one adaptive token bucket per host.
+
+    Hosts without a configured limit are not rate limited until the server throttles them, at
+    which point they get a bucket of `default_limit` that honours the server's Retry-After.
+
+    Args:
+        host_limits (Optional[Dict[str, Tuple[float, float]]]): (rate, capacity) per host.
+        default_limit (Tuple[float, float]): (rate, capacity) for hosts that throttle without a configured limit.
+    """
+
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+        default_limit: Tuple[float, float] = (1.0, 1.0),
+    ) -> None:
+        host_limits = DEFAULT_HOST_RATE_LIMITS if host_limits is None else host_limits
+        self.default_limit = default_limit
+        self._buckets: Dict[str, TokenBucket] = {
+            host: TokenBucket(rate, capacity)
+            for host, (rate, capacity) in host_limits.items()
+        }
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str, create: bool = False) -> Optional[TokenBucket]:
+        """
+        Returns the bucket for a host, optionally creating it from the default limit.
+
+        Args:
+            host (str): The host name.
+            create (bool): Whether to create a bucket if none exists.
+
+        Returns:
+            Optional[TokenBucket]: The host's bucket, or None if it has none.
+        """
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None and create:
+                bucket = TokenBucket(*self.default_limit)
+                self._buckets[host] = bucket
+
+        return bucket
+
+    def acquire(self, host: str) -> float:
+        """
+        Waits for permission to send one request to the host.
+
+        Args:
+            host (str): The host about to be requested.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        bucket = self._bucket(host)
+
+        return bucket.acquire() if bucket is not None else 0.0
+
+    def throttle(self, host: str, retry_after: Optional[float] = None) -> None:
+        """
+        Records that the host throttled a request.
+
+        Args:
+            host (str): The host that responded with 429 or Retry-After.
+            retry_after (Optional[float]): Seconds the server asked us to wait.
+        """
+        self._bucket(host, create=True).throttle(retry_after)
+
+        return None
+
+    def recover(self, host: str) -> None:
+        """
+        Records a successful request to the host.
+
+        Args:
+            host (str): The host that answered successfully.
+        """
+        bucket = self._bucket(host)
+        if bucket is not None:
+            bucket.recover()
+
+        return None
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .. import ETL_DIR
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Response cache defaults
+###########################################################################################################################################
+
+# Directory holding the cached response bodies and their metadata
+DEFAULT_CACHE_DIR = os.path.join(ETL_DIR, "HTTP_Cache")
+
+# Total size of cached bodies before least recently used entries are evicted
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - On-disk response cache
+###########################################################################################################################################
+
+
+class ResponseCache:
+    """
+    A content-addressed, on-disk cache of raw HTTP response bodies keyed by URL.
+
+    Each entry is stored as `<sha256(url)>.body` plus a `<sha256(url)>.json` metadata file holding
+    the URL, ETag, Last-Modified, content type, the body's digest and whether the entry is
+    immutable. Immutable entries (closed seasons) are served without touching the network; all
+    other entries are revalidated with If-None-Match / If-Modified-Since. When the bodies exceed
+    `max_bytes`, the least recently used entries are evicted.
+
+    The metadata is written after the body, and an entry whose body does not match the digest in
+    its metadata (e.g. after a crash between the two writes) is a miss.
+
+    Args:
+        cache_dir (str): The directory to store entries in.
+        max_bytes (int): The size budget for all cached bodies.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Running size of the cached bodies; None until the directory is first scanned
+        self._size: Optional[int] = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> Dict[str, str]:
+        """
+        Returns the body and metadata paths for a URL.
+
+        Args:
+            url (str): The cached URL.
+
+        Returns:
+            Dict[str, str]: The 'body' and 'meta' file paths.
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+
+        return {"body": base + ".body", "meta": base + ".json"}
+
+    @staticmethod
+    def _write(path: str, mode: str, data: Any) -> None:
+        """
+        Replaces a file atomically, so concurrent readers never see a partial write.
+
+        Args:
+            path (str): The file path.
+            mode (str): The open mode ('w' or 'wb').
+            data (Any): The text or bytes to write.
+        """
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        return None
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up the cache entry for a URL and marks it as recently used.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry metadata with its 'body' bytes, or None on a miss.
+        """
+        paths = self._paths(url)
+        try:
+            with open(paths["meta"], "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            with open(paths["body"], "rb") as f:
+                entry["body"] = f.read()
+        except (OSError, ValueError):
+            return None
+        if entry.get("sha256") != hashlib.sha256(entry["body"]).hexdigest():
+            # The body and metadata are from different writes
+            return None
+        os.utime(paths["meta"])
+
+        return entry
+
+    def put(self, url: str, response: requests.Response, immutable: bool) -> None:
+        """
+        Stores a successful response body and its validators.
+
+        Args:
+            url (str): The requested URL (before any host override).
+            response (requests.Response): The response to cache.
+            immutable (bool): Whether the content can never change (e.g. a closed season).
+        """
+        paths = self._paths(url)
+        os.makedirs(os.path.dirname(paths["body"]), exist_ok=True)
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+            "immutable": immutable,
+            "stored_at": time.time(),
+            "size": len(response.content),
+            "sha256": hashlib.sha256(response.content).hexdigest(),
+        }
+        try:
+            replaced = os.path.getsize(paths["body"])
+        except OSError:
+            replaced = 0
+
+        # The metadata is written last; until it is, get() sees a digest mismatch and misses
+        self._write(paths["body"], "wb", response.content)
+        self._write(paths["meta"], "w", json.dumps(entry))
+
+        with self._lock:
+            if self._size is not None:
+                self._size += entry["size"] - replaced
+            over_budget = self._size is None or self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+        return None
+
+    def touch(self, url: str, response: requests.Response, immutable: bool) -> None:
+        """
+        Refreshes an entry's validators after a 304 Not Modified response.
+
+        Args:
+            url (str): The requested URL.
+            response (requests.Response): The 304 response.
+            immutable (bool): Whether the content can never change from now on.
+        """
+        paths = self._paths(url)
+        try:
+            with open(paths["meta"], "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        entry["etag"] = response.headers.get("ETag", entry["etag"])
+        entry["last_modified"] = response.headers.get(
+            "Last-Modified", entry["last_modified"]
+        )
+        entry["immutable"] = immutable
+        entry["stored_at"] = time.time()
+        self._write(paths["meta"], "w", json.dumps(entry))
+
+        return None
+
+    def evict(self) -> None:
+        """
+        Removes least recently used entries until the cache fits in `max_bytes`. This scans the
+        whole directory, so put() only calls it when the running size is over budget (or unknown).
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if not name.endswith(".body"):
+                        continue
+                    body_path = os.path.join(root, name)
+                    meta_path = body_path[: -len(".body")] + ".json"
+                    try:
+                        size = os.path.getsize(body_path)
+                        last_used = os.path.getmtime(meta_path)
+                    except OSError:
+                        continue
+                    entries.append((last_used, size, body_path, meta_path))
+                    total += size
+
+            for _, size, body_path, meta_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in (meta_path, body_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+            self._size = total
+
+        return None
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Cached responses
+###########################################################################################################################################
+
+
+def cached_response(entry: Dict[str, Any]) -> requests.Response:
+    """
+    Builds a requests.Response from a cache entry so callers can use .json() and .text as usual.
+
+    Args:
+        entry (Dict[str, Any]): A cache entry as returned by ResponseCache.get.
+
+    Returns:
+        requests.Response: A 200 response whose `from_cache` attribute is True.
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.url = entry["url"]
+    response._content = entry["body"]
+    response.encoding = entry["encoding"]
+    response.headers = CaseInsensitiveDict(
+        {
+            key: value
+            for key, value in (
+                ("Content-Type", entry["content_type"]),
+                ("ETag", entry["etag"]),
+                ("Last-Modified", entry["last_modified"]),
+            )
+            if value is not None
+        }
+    )
+    response.from_cache = True
+
+    return response
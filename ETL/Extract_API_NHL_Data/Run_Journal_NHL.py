@@ -0,0 +1,196 @@
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from .. import ETL_DIR
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Run journal defaults
+###########################################################################################################################################
+
+# Directory holding the plan, the journal and the checkpointed frames of the current extract run
+DEFAULT_JOURNAL_DIR = os.path.join(ETL_DIR, "Run_Journal")
+
+# Sources checkpointed per season and game type
+JOURNAL_SOURCES = ("api", "nst")
+
+# One unit of work: (source, season ID, game type ID)
+Unit = Tuple[str, int, int]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Extract run journal
+###########################################################################################################################################
+
+
+class RunJournal:
+    """
+    Checkpoints an extract run one unit at a time, so a failed run can be resumed without fetching
+    (and sleeping through) the units it already completed.
+
+    A unit is one source ('api' or 'nst') for one season and game type. The directory holds:
+      - `run.json`: the run plan (the (season, game type) pairs and whether the run is incremental).
+      - `journal.jsonl`: one line per completed unit, appended after its frame is on disk.
+      - `<source>_<season_id>_<game_type_id>.parquet`: the fetched frame of each completed unit.
+
+    A unit with no data (e.g. no naturalstattrick.com table yet) is journaled without a frame. The
+    directory is removed once the run succeeds.
+
+    Args:
+        journal_dir (str): The directory holding the plan, journal and checkpointed frames.
+    """
+
+    def __init__(self, journal_dir: str = DEFAULT_JOURNAL_DIR) -> None:
+        self.journal_dir = journal_dir
+        self.plan_path = os.path.join(journal_dir, "run.json")
+        self.journal_path = os.path.join(journal_dir, "journal.jsonl")
+        self._lock = threading.Lock()
+        self._completed: Dict[Unit, Optional[str]] = {}
+
+    def _frame_path(self, unit: Unit) -> str:
+        """
+        Returns the checkpoint file path of a unit.
+
+        Args:
+            unit (Unit): The (source, season ID, game type ID) unit.
+
+        Returns:
+            str: The Parquet file path.
+        """
+        source, season_id, game_type_id = unit
+
+        return os.path.join(
+            self.journal_dir, f"{source}_{season_id}_{game_type_id}.parquet"
+        )
+
+    def start(self, plan: Dict[str, Any]) -> None:
+        """
+        Starts a new run, discarding the checkpoints of any previous one.
+
+        Args:
+            plan (Dict[str, Any]): The run plan, stored so a resumed run extracts the same units.
+        """
+        self.finish()
+        os.makedirs(self.journal_dir, exist_ok=True)
+        tmp_path = self.plan_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(plan, f, indent=2)
+        os.replace(tmp_path, self.plan_path)
+        self._completed = {}
+
+        return None
+
+    def resume(self) -> Optional[Dict[str, Any]]:
+        """
+        Reopens the previous run and reads its completed units. A journal line cut short by a crash,
+        or one whose frame is missing, is treated as incomplete.
+
+        Returns:
+            Optional[Dict[str, Any]]: The previous run's plan, or None if there is no run to resume.
+        """
+        if not os.path.isfile(self.plan_path):
+            return None
+        with open(self.plan_path, "r", encoding="utf-8") as f:
+            plan = json.load(f)
+
+        self._completed = {}
+        if os.path.isfile(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    unit = (
+                        entry["source"],
+                        int(entry["season_id"]),
+                        int(entry["game_type_id"]),
+                    )
+                    if entry["file"] is None or os.path.isfile(
+                        os.path.join(self.journal_dir, entry["file"])
+                    ):
+                        self._completed[unit] = entry["file"]
+
+        return plan
+
+    def completed(self) -> Set[Unit]:
+        """
+        Returns:
+            Set[Unit]: The units completed so far.
+        """
+        return set(self._completed)
+
+    def is_complete(self, unit: Unit) -> bool:
+        """
+        Args:
+            unit (Unit): The (source, season ID, game type ID) unit.
+
+        Returns:
+            bool: True if the unit was completed.
+        """
+        return unit in self._completed
+
+    def load(self, unit: Unit) -> Optional[pd.DataFrame]:
+        """
+        Reads the checkpointed frame of a completed unit.
+
+        Args:
+            unit (Unit): The (source, season ID, game type ID) unit.
+
+        Returns:
+            Optional[pd.DataFrame]: The frame, or None if the unit had no data.
+        """
+        file = self._completed[unit]
+        if file is None:
+            return None
+
+        return pd.read_parquet(os.path.join(self.journal_dir, file))
+
+    def complete(self, unit: Unit, df: Optional[pd.DataFrame]) -> None:
+        """
+        Checkpoints a unit: writes its frame, then appends it to the journal. Safe to call from the
+        fetch threads.
+
+        Args:
+            unit (Unit): The (source, season ID, game type ID) unit.
+            df (Optional[pd.DataFrame]): The fetched frame, or None if the unit had no data.
+        """
+        file = None
+        if df is not None:
+            path = self._frame_path(unit)
+            df.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+            file = os.path.basename(path)
+
+        source, season_id, game_type_id = unit
+        line = json.dumps(
+            {
+                "source": source,
+                "season_id": season_id,
+                "game_type_id": game_type_id,
+                "rows": None if df is None else int(df.shape[0]),
+                "file": file,
+            }
+        )
+        with self._lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._completed[unit] = file
+
+        return None
+
+    def finish(self) -> None:
+        """
+        Removes the plan, journal and checkpointed frames once a run no longer needs them.
+        """
+        if os.path.isdir(self.journal_dir):
+            shutil.rmtree(self.journal_dir)
+        self._completed = {}
+
+        return None
@@ -0,0 +1,140 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Table parser defaults
+###########################################################################################################################################
+
+# Number of characters fed to the HTML parser at a time
+PARSER_CHUNK_SIZE = 64 * 1024
+
+# Cell values naturalstattrick.com uses for a missing number
+MISSING_VALUES = {"", "-"}
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Stream the team table out of a page
+###########################################################################################################################################
+
+
+def find_table(html: str, table_id: str = "teams") -> Optional[etree._Element]:
+    """
+    Streams an HTML page through lxml and stops as soon as the table with the given ID is closed,
+    so the rest of the page is never parsed.
+
+    Args:
+        html (str): The page source.
+        table_id (str): The ID of the table to extract.
+
+    Returns:
+        Optional[etree._Element]: The table element, or None if the page has no such table.
+    """
+    parser = etree.HTMLPullParser(events=("end",), tag="table")
+    for start in range(0, len(html), PARSER_CHUNK_SIZE):
+        parser.feed(html[start : start + PARSER_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if element.get("id") == table_id:
+                return element
+
+    return None
+
+
+def cell_text(cell: etree._Element) -> str:
+    """
+    Returns the stripped text of a cell, including the text of nested tags such as links.
+
+    Args:
+        cell (etree._Element): The th or td element.
+
+    Returns:
+        str: The cell text.
+    """
+    return "".join(cell.itertext()).strip()
+
+
+def table_headers(table: etree._Element) -> List[str]:
+    """
+    Reads the column names from the table's header row. Empty header cells are named
+    `Column_<position>`.
+
+    Args:
+        table (etree._Element): The table element.
+
+    Returns:
+        List[str]: The column names in order.
+    """
+    header_cells = table.xpath("./thead//th")
+
+    return [cell_text(cell) or f"Column_{i}" for i, cell in enumerate(header_cells)]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Typed columnar frame
+###########################################################################################################################################
+
+
+def typed_column(values: List[str]) -> pd.Series:
+    """
+    Converts a column of cell strings to float when every non-missing cell is numeric.
+    Missing cells ('-' or empty) become NaN; any other column is kept as text.
+
+    Args:
+        values (List[str]): The cell strings of one column.
+
+    Returns:
+        pd.Series: The typed column.
+    """
+    text = pd.Series(values, dtype=object)
+    missing = text.isin(MISSING_VALUES)
+    numbers = pd.to_numeric(text.where(~missing, np.nan), errors="coerce")
+    if numbers.notna().sum() == (~missing).sum():
+        return numbers.astype("float64")
+
+    return text
+
+
+def parse_team_table(html: str, table_id: str = "teams") -> Optional[pd.DataFrame]:
+    """
+    Extracts a naturalstattrick.com team table into a typed DataFrame.
+
+    The column count comes from the header row, and body cells are regrouped into rows of that
+    width, which also covers pages whose unclosed <tr> tags nest every row inside the first one.
+    If the cell count is not a multiple of the header width the layout has changed, and a
+    ValueError is raised instead of returning misaligned columns.
+
+    Args:
+        html (str): The page source.
+        table_id (str): The ID of the table to extract.
+
+    Returns:
+        Optional[pd.DataFrame]: One row per team with numeric columns as float, or None if the
+            page has no such table or the table has no rows.
+
+    Raises:
+        ValueError: If the body cells do not line up with the header columns.
+    """
+    table = find_table(html, table_id=table_id)
+    if table is None:
+        return None
+
+    headers = table_headers(table)
+    cells = [cell_text(cell) for cell in table.xpath("./tbody//td")]
+    if not headers or not cells:
+        return None
+    if len(cells) % len(headers) != 0:
+        raise ValueError(
+            f"Table '{table_id}' has {len(cells)} cells, which does not split into rows of "
+            f"{len(headers)} header columns; the page layout has changed"
+        )
+
+    # Every n-th cell belongs to the same column, so slice columns straight out of the cell list
+    columns: Dict[int, pd.Series] = {
+        i: typed_column(cells[i :: len(headers)]) for i in range(len(headers))
+    }
+    df = pd.DataFrame(columns)
+    df.columns = headers
+
+    return df
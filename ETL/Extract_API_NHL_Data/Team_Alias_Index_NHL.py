@@ -0,0 +1,259 @@
+import os
+from typing import Dict, List
+
+import pandas as pd
+
+from .. import ETL_DIR
+from .Normalize_Data_NHL import normalize_team_names
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Team alias index defaults
+###########################################################################################################################################
+
+# CSV file holding the team aliases. It is local state, not committed: extract() rebuilds the
+# learned aliases from the NHL API, and manual aliases added to the file survive later runs
+DEFAULT_ALIAS_INDEX_PATH = os.path.join(
+    ETL_DIR, "Extract_API_NHL_Data", "Team_Aliases_NHL.csv"
+)
+
+# Season ID of aliases that apply to every season (e.g. a manual alias for an abbreviation)
+ANY_SEASON = 0
+
+ALIAS_INDEX_COLUMNS = ["team_name", "season_id", "team_id", "source"]
+
+# Integer keys the NHL API and naturalstattrick.com frames are merged on
+TEAM_MERGE_KEYS = ["team_id", "season_id", "game_type_id"]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Team alias index
+###########################################################################################################################################
+
+
+class TeamAliasIndex:
+    """
+    A persistent index mapping naturalstattrick.com team names to NHL API team IDs, so the two
+    sources are merged on integer keys instead of team name strings.
+
+    Each alias maps a normalized team name in one season to a team_id. Names are scoped by season
+    because the same name has belonged to different franchises (e.g. the Winnipeg Jets before and
+    after 1996). Aliases learned from the NHL API frame have source 'api'; aliases added by hand
+    (source 'manual', season_id 0 for every season) cover names naturalstattrick.com spells
+    differently and are never overwritten by learned ones.
+
+    Args:
+        path (str): The CSV file the index is loaded from and saved to.
+    """
+
+    def __init__(self, path: str = DEFAULT_ALIAS_INDEX_PATH) -> None:
+        self.path = path
+        if os.path.isfile(path):
+            self.aliases = pd.read_csv(path, dtype={"team_name": str, "source": str})
+            self.aliases = self.aliases.astype(
+                {"season_id": "int64", "team_id": "int64"}
+            )
+        else:
+            self.aliases = pd.DataFrame(
+                {
+                    "team_name": pd.Series(dtype=str),
+                    "season_id": pd.Series(dtype="int64"),
+                    "team_id": pd.Series(dtype="int64"),
+                    "source": pd.Series(dtype=str),
+                }
+            )
+
+    def learn(self, api_df: pd.DataFrame) -> int:
+        """
+        Adds the team name of every team and season in an NHL API frame. Manual aliases for the
+        same name and season are kept.
+
+        Args:
+            api_df (pd.DataFrame): The renamed NHL API frame with team_full_name, season_id and team_id.
+
+        Returns:
+            int: The number of aliases added or changed.
+        """
+        learned = pd.DataFrame(
+            {
+                "team_name": normalize_team_names(api_df["team_full_name"]),
+                "season_id": api_df["season_id"].astype("int64"),
+                "team_id": api_df["team_id"].astype("int64"),
+                "source": "api",
+            }
+        ).drop_duplicates(["team_name", "season_id"])
+
+        merged = learned.merge(
+            self.aliases,
+            how="left",
+            on=["team_name", "season_id"],
+            suffixes=("", "_stored"),
+        )
+        new = merged[
+            (merged["source_stored"] != "manual")
+            & (merged["team_id"] != merged["team_id_stored"])
+        ][ALIAS_INDEX_COLUMNS]
+
+        if not new.empty:
+            kept = self.aliases.merge(
+                new[["team_name", "season_id"]],
+                how="left",
+                on=["team_name", "season_id"],
+                indicator=True,
+            )
+            self.aliases = pd.concat(
+                [
+                    kept[kept["_merge"] == "left_only"][ALIAS_INDEX_COLUMNS],
+                    new,
+                ],
+                ignore_index=True,
+            )
+
+        return int(new.shape[0])
+
+    def save(self) -> None:
+        """
+        Writes the index to its CSV file atomically, ordered by name and season.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        self.aliases.sort_values(["team_name", "season_id"]).to_csv(
+            tmp_path, index=False
+        )
+        os.replace(tmp_path, self.path)
+
+        return None
+
+    def team_ids(self, team_names: pd.Series, season_ids: pd.Series) -> pd.Series:
+        """
+        Looks up the team_id of each team name and season. A season-specific alias wins over an
+        alias for every season.
+
+        Args:
+            team_names (pd.Series): The team names (normalized or not).
+            season_ids (pd.Series): The season IDs, on the same index.
+
+        Returns:
+            pd.Series: The team IDs as nullable integers on the same index; unmatched rows are <NA>.
+        """
+        keys = pd.DataFrame(
+            {
+                "team_name": normalize_team_names(team_names).to_numpy(),
+                "season_id": season_ids.astype("int64").to_numpy(),
+            }
+        )
+        by_season = keys.merge(
+            self.aliases[["team_name", "season_id", "team_id"]],
+            how="left",
+            on=["team_name", "season_id"],
+        )["team_id"]
+        any_season = keys[["team_name"]].merge(
+            self.aliases[self.aliases["season_id"] == ANY_SEASON][
+                ["team_name", "team_id"]
+            ],
+            how="left",
+            on="team_name",
+        )["team_id"]
+
+        return pd.Series(
+            by_season.fillna(any_season).to_numpy(),
+            index=team_names.index,
+            name="team_id",
+        ).astype("Int64")
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Unmatched team report
+###########################################################################################################################################
+
+
+def unmatched_teams(
+    api_df: pd.DataFrame, nst_df: pd.DataFrame, keys: List[str] = TEAM_MERGE_KEYS
+) -> Dict[str, pd.DataFrame]:
+    """
+    Finds the rows of either source that have no counterpart in the other after team IDs are
+    resolved, so they are reported instead of leaving silent gaps in the merged stats. API rows
+    are only checked for seasons and game types naturalstattrick.com covers.
+
+    Args:
+        api_df (pd.DataFrame): The NHL API frame.
+        nst_df (pd.DataFrame): The naturalstattrick.com frame with resolved team_id (<NA> if unresolved).
+        keys (List[str]): The integer merge keys present in both frames, ending with season_id and game_type_id.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'nst' rows whose team name did not resolve or has no API row, and
+            'api' rows in covered seasons without a naturalstattrick.com row.
+    """
+    nst_keys = nst_df[keys].dropna().astype("int64").drop_duplicates()
+    api_keys = api_df[keys].astype("int64").drop_duplicates()
+
+    nst_unmatched = nst_df[
+        nst_df["team_id"].isna()
+        | ~pd.MultiIndex.from_frame(nst_df[keys].fillna(-1).astype("int64")).isin(
+            pd.MultiIndex.from_frame(api_keys)
+        )
+    ]
+
+    covered = nst_keys[["season_id", "game_type_id"]].drop_duplicates()
+    api_covered = api_df.merge(covered, on=["season_id", "game_type_id"])
+    api_unmatched = api_covered[
+        ~pd.MultiIndex.from_frame(api_covered[keys].astype("int64")).isin(
+            pd.MultiIndex.from_frame(nst_keys)
+        )
+    ]
+
+    return {
+        "nst": nst_unmatched.reset_index(drop=True),
+        "api": api_unmatched.reset_index(drop=True),
+    }
+
+
+def print_unmatched_teams(unmatched: Dict[str, pd.DataFrame], limit: int = 10) -> None:
+    """
+    Prints how many rows of each source went unmatched and the first distinct team names and
+    seasons, so a rename can be added to the alias index.
+
+    Args:
+        unmatched (Dict[str, pd.DataFrame]): The unmatched rows from unmatched_teams.
+        limit (int): The maximum number of distinct names printed per source.
+    """
+    for source, name_column in (("nst", "team"), ("api", "team_full_name")):
+        rows = unmatched[source]
+        if rows.empty:
+            continue
+        names = rows[[name_column, "season_id"]].drop_duplicates()
+        print(
+            f"{rows.shape[0]} unmatched {source} rows, e.g.: "
+            + ", ".join(
+                f"{name} ({season_id})"
+                for name, season_id in names.head(limit).itertuples(index=False)
+            )
+        )
+
+    return None
+
+
+def report_unmatched_teams(
+    unmatched: Dict[str, List[pd.DataFrame]], output_dir: str
+) -> Dict[str, pd.DataFrame]:
+    """
+    Combines the unmatched rows of every merged season, prints them with print_unmatched_teams and
+    writes them to unmatched_nst_teams.csv and unmatched_api_teams.csv in a directory.
+
+    Args:
+        unmatched (Dict[str, List[pd.DataFrame]]): The 'nst' and 'api' unmatched rows of each season.
+        output_dir (str): The directory the CSV files are written to.
+
+    Returns:
+        Dict[str, pd.DataFrame]: The combined 'nst' and 'api' unmatched rows.
+    """
+    frames = {
+        source: pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
+        for source, rows in unmatched.items()
+    }
+    print_unmatched_teams(frames)
+    for source, rows in frames.items():
+        rows.to_csv(
+            os.path.join(output_dir, f"unmatched_{source}_teams.csv"), index=False
+        )
+
+    return frames
@@ -0,0 +1,258 @@
+import datetime
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+# Optional files that receive every progress event in addition to the console
+PROGRESS_LOG_FILE = os.getenv("ETL_PROGRESS_LOG_FILE")
+PROGRESS_JSON_FILE = os.getenv("ETL_PROGRESS_JSON_FILE")
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Progress sinks
+###########################################################################################################################################
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """
+    Formats a progress event as a single human-readable line.
+
+    Args:
+        event (Dict[str, Any]): The progress event.
+
+    Returns:
+        str: The formatted line, e.g. "[12:00:01] END   insert season_stats (2768 rows, 0.41s)".
+    """
+    time_of_day = event["timestamp"][11:19]
+    label = {
+        "stage_start": "START",
+        "stage_end": "END  ",
+        "stage_error": "ERROR",
+        "progress": "  ...",
+    }[event["event"]]
+    details = []
+    if event.get("rows") is not None:
+        details.append(f"{event['rows']} rows")
+    if event.get("duration_s") is not None:
+        details.append(f"{event['duration_s']:.2f}s")
+    if event.get("message"):
+        details.append(str(event["message"]))
+    suffix = f" ({', '.join(details)})" if details else ""
+
+    return f"[{time_of_day}] {label} {event['stage']}{suffix}"
+
+
+class ConsoleSink:
+    """
+    Prints every progress event to the console.
+    """
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """
+        Prints one event to the console.
+
+        Args:
+            event (Dict[str, Any]): The progress event.
+        """
+        print(format_event(event))
+
+        return None
+
+
+class LogFileSink:
+    """
+    Appends every progress event as a formatted line to a log file.
+
+    Args:
+        path (str): The log file path; parent directories are created if needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """
+        Appends one event to the log file.
+
+        Args:
+            event (Dict[str, Any]): The progress event.
+        """
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(format_event(event) + "\n")
+
+        return None
+
+
+class JSONSink:
+    """
+    Appends every progress event as one JSON object per line, for dashboards and orchestrators.
+
+    Args:
+        path (str): The JSON lines file path; parent directories are created if needed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """
+        Appends one event to the JSON lines file.
+
+        Args:
+            event (Dict[str, Any]): The progress event.
+        """
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event, default=str) + "\n")
+
+        return None
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Progress reporter
+###########################################################################################################################################
+
+
+class StageProgress:
+    """
+    Collects the outcome of a running stage; set `rows` (and optionally `message`) before the
+    stage ends and they are included in its end event.
+    """
+
+    def __init__(self) -> None:
+        self.rows: Optional[int] = None
+        self.message: Optional[str] = None
+
+
+class ProgressReporter:
+    """
+    Sends structured progress events to pluggable sinks.
+
+    Each event is a dict with 'event' (stage_start, stage_end, stage_error or progress),
+    'stage', an ISO 'timestamp' and, where known, 'rows', 'duration_s' and 'message'.
+
+    Args:
+        sinks (Optional[List[Any]]): Objects with an `emit(event)` method. Defaults to a ConsoleSink.
+    """
+
+    def __init__(self, sinks: Optional[List[Any]] = None) -> None:
+        self.sinks = list(sinks) if sinks is not None else [ConsoleSink()]
+
+    def emit(self, event: str, stage: str, **fields: Any) -> None:
+        """
+        Sends one event to every sink.
+
+        Args:
+            event (str): The event type.
+            stage (str): The pipeline stage the event belongs to.
+            **fields (Any): Extra fields such as rows, duration_s or message.
+        """
+        payload = {
+            "event": event,
+            "stage": stage,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        payload.update(
+            {key: value for key, value in fields.items() if value is not None}
+        )
+        for sink in self.sinks:
+            sink.emit(payload)
+
+        return None
+
+    def progress(self, stage: str, message: str, **fields: Any) -> None:
+        """
+        Reports intermediate progress within a stage.
+
+        Args:
+            stage (str): The running stage.
+            message (str): What just happened.
+            **fields (Any): Extra fields such as rows.
+        """
+        self.emit("progress", stage, message=message, **fields)
+
+        return None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageProgress]:
+        """
+        Reports the start and end of a stage with its duration; failures are reported as a
+        stage_error event and re-raised.
+
+        Args:
+            name (str): The stage name.
+
+        Yields:
+            StageProgress: Holder for the stage's row count and closing message.
+        """
+        progress = StageProgress()
+        self.emit("stage_start", name)
+        started = time.perf_counter()
+        try:
+            yield progress
+        except Exception as e:
+            self.emit(
+                "stage_error",
+                name,
+                duration_s=round(time.perf_counter() - started, 3),
+                message=repr(e),
+            )
+            raise
+        self.emit(
+            "stage_end",
+            name,
+            rows=progress.rows,
+            duration_s=round(time.perf_counter() - started, 3),
+            message=progress.message,
+        )
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Shared reporter
+###########################################################################################################################################
+
+_reporter: Optional[ProgressReporter] = None
+_reporter_guard = threading.Lock()
+
+
+def get_reporter() -> ProgressReporter:
+    """
+    Returns the shared progress reporter, creating it on first use. It writes to the console
+    and, when ETL_PROGRESS_LOG_FILE / ETL_PROGRESS_JSON_FILE are set, to those files as well.
+
+    Returns:
+        ProgressReporter: The reporter every stage reports to by default.
+    """
+    global _reporter
+    with _reporter_guard:
+        if _reporter is None:
+            sinks: List[Any] = [ConsoleSink()]
+            if PROGRESS_LOG_FILE:
+                sinks.append(LogFileSink(PROGRESS_LOG_FILE))
+            if PROGRESS_JSON_FILE:
+                sinks.append(JSONSink(PROGRESS_JSON_FILE))
+            _reporter = ProgressReporter(sinks)
+
+    return _reporter
+
+
+def set_reporter(reporter: Optional[ProgressReporter]) -> None:
+    """
+    Replaces the shared progress reporter.
+
+    Args:
+        reporter (Optional[ProgressReporter]): The new reporter, or None to reset to the default on next use.
+    """
+    global _reporter
+    with _reporter_guard:
+        _reporter = reporter
+
+    return None
@@ -0,0 +1,555 @@
+from typing import Dict, List, Optional
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Frozen migration schemas
+###########################################################################################################################################
+
+# The DDL each versioned migration in Create_Tables/Migrations_NHL.py applies, frozen when the
+# migration was added. An applied migration must keep building the same schema, so nothing here
+# is generated from the column registry in Season_Stats_Columns_NHL.py and nothing here is edited
+# afterwards; a registry change ships as a new migration with its own frozen DDL.
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Version 1: original schema
+###########################################################################################################################################
+
+# DIMENSION TABLES
+v1_teams_table_create = """
+
+    CREATE TABLE IF NOT EXISTS raw.teams (
+        team_id int NOT NULL PRIMARY KEY,
+        team_full_name varchar NOT NULL
+    );
+    
+"""
+
+
+v1_season_table_create = """
+
+    CREATE TABLE IF NOT EXISTS raw.season (
+        season_id int NOT NULL PRIMARY KEY,
+        season varchar NOT NULL
+    );
+    
+"""
+
+v1_game_type_table_create = """
+
+    CREATE TABLE IF NOT EXISTS raw.game_type (
+        game_type_id int NOT NULL PRIMARY KEY,
+        game_type varchar NOT NULL
+    );
+    
+"""
+
+# FACT TABLE
+v1_season_stats_table_create = """
+
+CREATE TABLE IF NOT EXISTS raw.season_stats (
+        PRIMARY KEY (team_id, season_id, game_type_id),
+        season_id int NOT NULL,
+        game_type_id int NOT NULL,
+        team_id int NOT NULL,
+        faceoff_win_pct float NOT NULL,
+        games_played int NOT NULL,
+        goals_against int NOT NULL,
+        goals_against_per_game float NOT NULL,
+        goals_for int NOT NULL,
+        goals_for_per_game float NOT NULL,
+        losses int NOT NULL,
+        overtime_losses float NOT NULL,
+        penalty_kill_net_pct float NOT NULL,
+        penalty_kill_pct float NOT NULL,
+        points_pct float NOT NULL,
+        points int NOT NULL,
+        power_play_net_pct float NOT NULL,
+        power_play_pct float NOT NULL,
+        regulation_and_overtime_wins int NOT NULL,
+        shots_against_per_game float NOT NULL,
+        shots_for_per_game float NOT NULL,
+        ties float NOT NULL,
+        wins int NOT NULL,
+        wins_in_regulation int NOT NULL,
+        wins_in_shootout int NOT NULL,
+        time_on_ice varchar NOT NULL,
+        corsi_for float NOT NULL,
+        corsi_against float NOT NULL,
+        corsi_for_pct float NOT NULL,
+        fenwick_for float NOT NULL,
+        fenwick_against float NOT NULL,
+        fenwick_for_pct float NOT NULL,
+        shots_for float NOT NULL,
+        shots_against float NOT NULL,
+        shots_for_pct float NOT NULL,
+        goals_for_pct float NOT NULL,
+        expected_goals_for float NOT NULL,
+        expected_goals_against float NOT NULL,
+        expected_goals_for_pct float NOT NULL,
+        scoring_chances_for float NOT NULL,
+        scoring_chances_against float NOT NULL,
+        scoring_chances_for_pct float NOT NULL,
+        scoring_chances_shots_for float NOT NULL,
+        scoring_chances_shots_against float NOT NULL,
+        scoring_chances_shots_for_pct float NOT NULL,
+        scoring_chances_goals_for float NOT NULL,
+        scoring_chances_goals_against float NOT NULL,
+        scoring_chances_goals_for_pct float NOT NULL,
+        scoring_chances_shooting_pct float NOT NULL,
+        scoring_chances_save_pct float NOT NULL,
+        high_danger_chances_for float NOT NULL,
+        high_danger_chances_against float NOT NULL,
+        high_danger_chances_for_pct float NOT NULL,
+        high_danger_shots_for float NOT NULL,
+        high_danger_shots_against float NOT NULL,
+        high_danger_shots_for_pct float NOT NULL,
+        high_danger_goals_for float NOT NULL,
+        high_danger_goals_against float NOT NULL,
+        high_danger_goals_for_pct float NOT NULL,
+        high_danger_shooting_pct float NOT NULL,
+        high_danger_save_pct float NOT NULL,
+        medium_danger_chances_for float NOT NULL,
+        medium_danger_chances_against float NOT NULL,
+        medium_danger_chances_for_pct float NOT NULL,
+        medium_danger_shots_for float NOT NULL,
+        medium_danger_shots_against float NOT NULL,
+        medium_danger_shots_for_pct float NOT NULL,
+        medium_danger_goals_for float NOT NULL,
+        medium_danger_goals_against float NOT NULL,
+        medium_danger_goals_for_pct float NOT NULL,
+        medium_danger_shooting_pct float NOT NULL,
+        medium_danger_save_pct float NOT NULL,
+        low_danger_chances_for float NOT NULL,
+        low_danger_chances_against float NOT NULL,
+        low_danger_chances_for_pct float NOT NULL,
+        low_danger_shots_for float NOT NULL,
+        low_danger_shots_against float NOT NULL,
+        low_danger_shots_for_pct float NOT NULL,
+        low_danger_goals_for float NOT NULL,
+        low_danger_goals_against float NOT NULL,
+        low_danger_goals_for_pct float NOT NULL,
+        low_danger_shooting_pct float NOT NULL,
+        low_danger_save_pct float NOT NULL,
+        shooting_pct float NOT NULL,
+        save_pct float NOT NULL,
+        pdo_rating float NOT NULL
+    );
+        
+"""
+
+# MODEL TABLES
+v1_create_season_stats_type_raw = """
+                            
+CREATE TYPE raw.season_stats_type AS (
+        start_year int, 
+        faceoff_win_pct float,
+        games_played int,
+        goals_against int,
+        goals_against_per_game float,
+        goals_for int,
+        goals_for_per_game float,
+        losses int,
+        overtime_losses float,
+        penalty_kill_net_pct float,
+        penalty_kill_pct float,
+        points_pct float,
+        points int,
+        power_play_net_pct float,
+        power_play_pct float,
+        regulation_and_overtime_wins int,
+        shots_against_per_game float,
+        shots_for_per_game float,
+        ties float,
+        wins int,
+        wins_in_regulation int,
+        wins_in_shootout int,
+        time_on_ice varchar,
+        corsi_for float,
+        corsi_against float,
+        corsi_for_pct float,
+        fenwick_for float,
+        fenwick_against float,
+        fenwick_for_pct float,
+        shots_for float,
+        shots_against float,
+        shots_for_pct float,
+        goals_for_pct float,
+        expected_goals_for float,
+        expected_goals_against float,
+        expected_goals_for_pct float,
+        scoring_chances_for float,
+        scoring_chances_against float,
+        scoring_chances_for_pct float,
+        scoring_chances_shots_for float,
+        scoring_chances_shots_against float,
+        scoring_chances_shots_for_pct float,
+        scoring_chances_goals_for float,
+        scoring_chances_goals_against float,
+        scoring_chances_goals_for_pct float,
+        scoring_chances_shooting_pct float,
+        scoring_chances_save_pct float,
+        high_danger_chances_for float,
+        high_danger_chances_against float,
+        high_danger_chances_for_pct float,
+        high_danger_shots_for float,
+        high_danger_shots_against float,
+        high_danger_shots_for_pct float,
+        high_danger_goals_for float,
+        high_danger_goals_against float,
+        high_danger_goals_for_pct float,
+        high_danger_shooting_pct float,
+        high_danger_save_pct float,
+        medium_danger_chances_for float,
+        medium_danger_chances_against float,
+        medium_danger_chances_for_pct float,
+        medium_danger_shots_for float,
+        medium_danger_shots_against float,
+        medium_danger_shots_for_pct float,
+        medium_danger_goals_for float,
+        medium_danger_goals_against float,
+        medium_danger_goals_for_pct float,
+        medium_danger_shooting_pct float,
+        medium_danger_save_pct float,
+        low_danger_chances_for float,
+        low_danger_chances_against float,
+        low_danger_chances_for_pct float,
+        low_danger_shots_for float,
+        low_danger_shots_against float,
+        low_danger_shots_for_pct float,
+        low_danger_goals_for float,
+        low_danger_goals_against float,
+        low_danger_goals_for_pct float,
+        low_danger_shooting_pct float,
+        low_danger_save_pct float,
+        shooting_pct float,
+        save_pct float,
+        pdo_rating float
+    );
+                            
+"""
+
+v1_create_season_stats_type_analytics = """
+                            
+CREATE TYPE analytics.season_stats_type AS (
+        start_year int, 
+        faceoff_win_pct float,
+        games_played int,
+        goals_against int,
+        goals_against_per_game float,
+        goals_for int,
+        goals_for_per_game float,
+        losses int,
+        overtime_losses float,
+        penalty_kill_net_pct float,
+        penalty_kill_pct float,
+        points_pct float,
+        points int,
+        power_play_net_pct float,
+        power_play_pct float,
+        regulation_and_overtime_wins int,
+        shots_against_per_game float,
+        shots_for_per_game float,
+        ties float,
+        wins int,
+        wins_in_regulation int,
+        wins_in_shootout int,
+        time_on_ice varchar,
+        corsi_for float,
+        corsi_against float,
+        corsi_for_pct float,
+        fenwick_for float,
+        fenwick_against float,
+        fenwick_for_pct float,
+        shots_for float,
+        shots_against float,
+        shots_for_pct float,
+        goals_for_pct float,
+        expected_goals_for float,
+        expected_goals_against float,
+        expected_goals_for_pct float,
+        scoring_chances_for float,
+        scoring_chances_against float,
+        scoring_chances_for_pct float,
+        scoring_chances_shots_for float,
+        scoring_chances_shots_against float,
+        scoring_chances_shots_for_pct float,
+        scoring_chances_goals_for float,
+        scoring_chances_goals_against float,
+        scoring_chances_goals_for_pct float,
+        scoring_chances_shooting_pct float,
+        scoring_chances_save_pct float,
+        high_danger_chances_for float,
+        high_danger_chances_against float,
+        high_danger_chances_for_pct float,
+        high_danger_shots_for float,
+        high_danger_shots_against float,
+        high_danger_shots_for_pct float,
+        high_danger_goals_for float,
+        high_danger_goals_against float,
+        high_danger_goals_for_pct float,
+        high_danger_shooting_pct float,
+        high_danger_save_pct float,
+        medium_danger_chances_for float,
+        medium_danger_chances_against float,
+        medium_danger_chances_for_pct float,
+        medium_danger_shots_for float,
+        medium_danger_shots_against float,
+        medium_danger_shots_for_pct float,
+        medium_danger_goals_for float,
+        medium_danger_goals_against float,
+        medium_danger_goals_for_pct float,
+        medium_danger_shooting_pct float,
+        medium_danger_save_pct float,
+        low_danger_chances_for float,
+        low_danger_chances_against float,
+        low_danger_chances_for_pct float,
+        low_danger_shots_for float,
+        low_danger_shots_against float,
+        low_danger_shots_for_pct float,
+        low_danger_goals_for float,
+        low_danger_goals_against float,
+        low_danger_goals_for_pct float,
+        low_danger_shooting_pct float,
+        low_danger_save_pct float,
+        shooting_pct float,
+        save_pct float,
+        pdo_rating float
+    );
+                            
+"""
+
+v1_playoffs_cumulative_data_model_create = """
+
+    CREATE TABLE IF NOT EXISTS raw.team_stats_playoffs (
+        season_id int,
+        team_id int,
+        game_type_id int,
+        seasons raw.season_stats_type[],
+        current_season int,
+        is_active boolean,
+        years_since_last_active int,
+        PRIMARY KEY (team_id, current_season)
+    );
+    
+"""
+
+v1_regular_season_cumulative_data_model_create = """
+
+    CREATE TABLE IF NOT EXISTS raw.team_stats_regular_season (
+        season_id int,
+        team_id int,
+        game_type_id int,
+        seasons raw.season_stats_type[],
+        current_season int,
+        is_active boolean,
+        years_since_last_active int,
+        PRIMARY KEY (team_id, current_season)
+    );
+    
+"""
+
+
+v1_create_table_queries = [
+    v1_teams_table_create,
+    v1_season_table_create,
+    v1_game_type_table_create,
+    v1_season_stats_table_create,
+    v1_playoffs_cumulative_data_model_create,
+    v1_regular_season_cumulative_data_model_create,
+]
+
+# The composite types by name; CREATE TYPE has no IF NOT EXISTS
+v1_create_type_queries = {
+    "raw.season_stats_type": v1_create_season_stats_type_raw,
+    "analytics.season_stats_type": v1_create_season_stats_type_analytics,
+}
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Version 2: compact season stats types
+###########################################################################################################################################
+
+# The raw.season_stats stats and their compact types: smallint for counts, real for rates and int
+# for time on ice in seconds. The composite types hold the season's start year followed by these
+V2_SEASON_STATS_TYPES = [
+    ("faceoff_win_pct", "real"),
+    ("games_played", "smallint"),
+    ("goals_against", "smallint"),
+    ("goals_against_per_game", "real"),
+    ("goals_for", "smallint"),
+    ("goals_for_per_game", "real"),
+    ("losses", "smallint"),
+    ("overtime_losses", "smallint"),
+    ("penalty_kill_net_pct", "real"),
+    ("penalty_kill_pct", "real"),
+    ("points_pct", "real"),
+    ("points", "smallint"),
+    ("power_play_net_pct", "real"),
+    ("power_play_pct", "real"),
+    ("regulation_and_overtime_wins", "smallint"),
+    ("shots_against_per_game", "real"),
+    ("shots_for_per_game", "real"),
+    ("ties", "smallint"),
+    ("wins", "smallint"),
+    ("wins_in_regulation", "smallint"),
+    ("wins_in_shootout", "smallint"),
+    ("time_on_ice", "int"),
+    ("corsi_for", "smallint"),
+    ("corsi_against", "smallint"),
+    ("corsi_for_pct", "real"),
+    ("fenwick_for", "smallint"),
+    ("fenwick_against", "smallint"),
+    ("fenwick_for_pct", "real"),
+    ("shots_for", "smallint"),
+    ("shots_against", "smallint"),
+    ("shots_for_pct", "real"),
+    ("goals_for_pct", "real"),
+    ("expected_goals_for", "real"),
+    ("expected_goals_against", "real"),
+    ("expected_goals_for_pct", "real"),
+    ("scoring_chances_for", "smallint"),
+    ("scoring_chances_against", "smallint"),
+    ("scoring_chances_for_pct", "real"),
+    ("scoring_chances_shots_for", "smallint"),
+    ("scoring_chances_shots_against", "smallint"),
+    ("scoring_chances_shots_for_pct", "real"),
+    ("scoring_chances_goals_for", "smallint"),
+    ("scoring_chances_goals_against", "smallint"),
+    ("scoring_chances_goals_for_pct", "real"),
+    ("scoring_chances_shooting_pct", "real"),
+    ("scoring_chances_save_pct", "real"),
+    ("high_danger_chances_for", "smallint"),
+    ("high_danger_chances_against", "smallint"),
+    ("high_danger_chances_for_pct", "real"),
+    ("high_danger_shots_for", "smallint"),
+    ("high_danger_shots_against", "smallint"),
+    ("high_danger_shots_for_pct", "real"),
+    ("high_danger_goals_for", "smallint"),
+    ("high_danger_goals_against", "smallint"),
+    ("high_danger_goals_for_pct", "real"),
+    ("high_danger_shooting_pct", "real"),
+    ("high_danger_save_pct", "real"),
+    ("medium_danger_chances_for", "smallint"),
+    ("medium_danger_chances_against", "smallint"),
+    ("medium_danger_chances_for_pct", "real"),
+    ("medium_danger_shots_for", "smallint"),
+    ("medium_danger_shots_against", "smallint"),
+    ("medium_danger_shots_for_pct", "real"),
+    ("medium_danger_goals_for", "smallint"),
+    ("medium_danger_goals_against", "smallint"),
+    ("medium_danger_goals_for_pct", "real"),
+    ("medium_danger_shooting_pct", "real"),
+    ("medium_danger_save_pct", "real"),
+    ("low_danger_chances_for", "smallint"),
+    ("low_danger_chances_against", "smallint"),
+    ("low_danger_chances_for_pct", "real"),
+    ("low_danger_shots_for", "smallint"),
+    ("low_danger_shots_against", "smallint"),
+    ("low_danger_shots_for_pct", "real"),
+    ("low_danger_goals_for", "smallint"),
+    ("low_danger_goals_against", "smallint"),
+    ("low_danger_goals_for_pct", "real"),
+    ("low_danger_shooting_pct", "real"),
+    ("low_danger_save_pct", "real"),
+    ("shooting_pct", "real"),
+    ("save_pct", "real"),
+    ("pdo_rating", "real"),
+]
+
+# information_schema.columns data_type of each compact type
+V2_INFORMATION_SCHEMA_TYPES = {"smallint": "smallint", "real": "real", "int": "integer"}
+
+# Conversions from the original float/int/varchar layout; time on ice is converted from 'MM:SS'
+# text to integer seconds
+V2_TYPE_CONVERSIONS = {
+    "smallint": "ROUND({column})::smallint",
+    "real": "{column}::real",
+    "int": "ROUND({column})::int",
+}
+V2_TIME_ON_ICE_SECONDS_CONVERSION = """CASE
+            WHEN time_on_ice LIKE '%:%'
+            THEN SPLIT_PART(time_on_ice, ':', 1)::int * 60 + SPLIT_PART(time_on_ice, ':', 2)::int
+            ELSE ROUND(COALESCE(NULLIF(time_on_ice, ''), '0')::numeric)::int
+        END"""
+
+# The cumulative tables keep their version 1 layout; they are recreated around the new type
+v2_cumulative_data_model_drop_queries = [
+    "DROP TABLE IF EXISTS raw.team_stats_playoffs;",
+    "DROP TABLE IF EXISTS raw.team_stats_regular_season;",
+]
+v2_cumulative_data_model_create_queries = [
+    v1_playoffs_cumulative_data_model_create,
+    v1_regular_season_cumulative_data_model_create,
+]
+
+v2_season_stats_type_drop_queries = [
+    "DROP TYPE IF EXISTS raw.season_stats_type;",
+    "DROP TYPE IF EXISTS analytics.season_stats_type;",
+]
+
+
+def v2_compact_types_alter(column_types: Dict[str, str]) -> Optional[str]:
+    """
+    Args:
+        column_types (Dict[str, str]): The information_schema data_type of every raw.season_stats column.
+
+    Returns:
+        Optional[str]: The ALTER TABLE statement converting every stat whose type is not yet the
+            compact one, rewriting the table once; None if every stat already has it.
+    """
+    alterations = []
+    for name, sql_type in V2_SEASON_STATS_TYPES:
+        data_type = column_types[name]
+        if data_type == V2_INFORMATION_SCHEMA_TYPES[sql_type]:
+            continue
+        if data_type == "character varying":
+            conversion = V2_TIME_ON_ICE_SECONDS_CONVERSION
+        else:
+            conversion = V2_TYPE_CONVERSIONS[sql_type].format(column=name)
+        alterations.append(f"ALTER COLUMN {name} TYPE {sql_type} USING {conversion}")
+    if not alterations:
+        return None
+    alter_columns = ",\n        ".join(alterations)
+
+    return f"""
+
+    ALTER TABLE raw.season_stats
+        {alter_columns};
+        
+"""
+
+
+def v2_season_stats_type_create_queries() -> List[str]:
+    """
+    Returns:
+        List[str]: The CREATE TYPE statements for raw and analytics.season_stats_type with the
+            compact types.
+    """
+    attribute_definitions = ",\n        ".join(
+        ["start_year smallint"]
+        + [f"{name} {sql_type}" for name, sql_type in V2_SEASON_STATS_TYPES]
+    )
+
+    return [
+        f"""
+                            
+CREATE TYPE {schema}.season_stats_type AS (
+        {attribute_definitions}
+    );
+                            
+"""
+        for schema in ("raw", "analytics")
+    ]
+
+
+# The cumulative tables are recreated empty, so migration 2 asks the next model run to rebuild
+# them in full; a row is removed once its table has been rebuilt
+v2_model_rebuilds_table_create = """
+
+    CREATE TABLE IF NOT EXISTS public.model_rebuilds (
+        model_table varchar NOT NULL PRIMARY KEY,
+        requested_by int NOT NULL,
+        requested_at timestamptz NOT NULL DEFAULT now()
+    );
+    
+"""
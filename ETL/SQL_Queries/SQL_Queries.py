@@ -1,3 +1,13 @@
+# The season stats columns are generated from the column registry next to this module
+from .Season_Stats_Columns_NHL import (
+    SEASON_STATS_KEY_COLUMNS,
+    season_stats_column_names,
+    season_stats_table_ddl,
+    season_stats_type_ddl,
+    season_stats_value_columns,
+)
+
+
 ###########################################################################################################################################
 # NEW CODE BLOCK - Drop all tables
 ###########################################################################################################################################
@@ -48,279 +58,12 @@ game_type_table_create = """
 """
 
 # FACT TABLE
-season_stats_table_create = """
-
-CREATE TABLE IF NOT EXISTS raw.season_stats (
-        PRIMARY KEY (team_id, season_id, game_type_id),
-        season_id int NOT NULL,
-        game_type_id int NOT NULL,
-        team_id int NOT NULL,
-        faceoff_win_pct float NOT NULL,
-        games_played int NOT NULL,
-        goals_against int NOT NULL,
-        goals_against_per_game float NOT NULL,
-        goals_for int NOT NULL,
-        goals_for_per_game float NOT NULL,
-        losses int NOT NULL,
-        overtime_losses float NOT NULL,
-        penalty_kill_net_pct float NOT NULL,
-        penalty_kill_pct float NOT NULL,
-        points_pct float NOT NULL,
-        points int NOT NULL,
-        power_play_net_pct float NOT NULL,
-        power_play_pct float NOT NULL,
-        regulation_and_overtime_wins int NOT NULL,
-        shots_against_per_game float NOT NULL,
-        shots_for_per_game float NOT NULL,
-        ties float NOT NULL,
-        wins int NOT NULL,
-        wins_in_regulation int NOT NULL,
-        wins_in_shootout int NOT NULL,
-        time_on_ice varchar NOT NULL,
-        corsi_for float NOT NULL,
-        corsi_against float NOT NULL,
-        corsi_for_pct float NOT NULL,
-        fenwick_for float NOT NULL,
-        fenwick_against float NOT NULL,
-        fenwick_for_pct float NOT NULL,
-        shots_for float NOT NULL,
-        shots_against float NOT NULL,
-        shots_for_pct float NOT NULL,
-        goals_for_pct float NOT NULL,
-        expected_goals_for float NOT NULL,
-        expected_goals_against float NOT NULL,
-        expected_goals_for_pct float NOT NULL,
-        scoring_chances_for float NOT NULL,
-        scoring_chances_against float NOT NULL,
-        scoring_chances_for_pct float NOT NULL,
-        scoring_chances_shots_for float NOT NULL,
-        scoring_chances_shots_against float NOT NULL,
-        scoring_chances_shots_for_pct float NOT NULL,
-        scoring_chances_goals_for float NOT NULL,
-        scoring_chances_goals_against float NOT NULL,
-        scoring_chances_goals_for_pct float NOT NULL,
-        scoring_chances_shooting_pct float NOT NULL,
-        scoring_chances_save_pct float NOT NULL,
-        high_danger_chances_for float NOT NULL,
-        high_danger_chances_against float NOT NULL,
-        high_danger_chances_for_pct float NOT NULL,
-        high_danger_shots_for float NOT NULL,
-        high_danger_shots_against float NOT NULL,
-        high_danger_shots_for_pct float NOT NULL,
-        high_danger_goals_for float NOT NULL,
-        high_danger_goals_against float NOT NULL,
-        high_danger_goals_for_pct float NOT NULL,
-        high_danger_shooting_pct float NOT NULL,
-        high_danger_save_pct float NOT NULL,
-        medium_danger_chances_for float NOT NULL,
-        medium_danger_chances_against float NOT NULL,
-        medium_danger_chances_for_pct float NOT NULL,
-        medium_danger_shots_for float NOT NULL,
-        medium_danger_shots_against float NOT NULL,
-        medium_danger_shots_for_pct float NOT NULL,
-        medium_danger_goals_for float NOT NULL,
-        medium_danger_goals_against float NOT NULL,
-        medium_danger_goals_for_pct float NOT NULL,
-        medium_danger_shooting_pct float NOT NULL,
-        medium_danger_save_pct float NOT NULL,
-        low_danger_chances_for float NOT NULL,
-        low_danger_chances_against float NOT NULL,
-        low_danger_chances_for_pct float NOT NULL,
-        low_danger_shots_for float NOT NULL,
-        low_danger_shots_against float NOT NULL,
-        low_danger_shots_for_pct float NOT NULL,
-        low_danger_goals_for float NOT NULL,
-        low_danger_goals_against float NOT NULL,
-        low_danger_goals_for_pct float NOT NULL,
-        low_danger_shooting_pct float NOT NULL,
-        low_danger_save_pct float NOT NULL,
-        shooting_pct float NOT NULL,
-        save_pct float NOT NULL,
-        pdo_rating float NOT NULL
-    );
-        
-"""
+season_stats_table_create = season_stats_table_ddl()
 
 # MODEL TABLES
-create_season_stats_type_raw = """
-                            
-CREATE TYPE raw.season_stats_type AS (
-        start_year int, 
-        faceoff_win_pct float,
-        games_played int,
-        goals_against int,
-        goals_against_per_game float,
-        goals_for int,
-        goals_for_per_game float,
-        losses int,
-        overtime_losses float,
-        penalty_kill_net_pct float,
-        penalty_kill_pct float,
-        points_pct float,
-        points int,
-        power_play_net_pct float,
-        power_play_pct float,
-        regulation_and_overtime_wins int,
-        shots_against_per_game float,
-        shots_for_per_game float,
-        ties float,
-        wins int,
-        wins_in_regulation int,
-        wins_in_shootout int,
-        time_on_ice varchar,
-        corsi_for float,
-        corsi_against float,
-        corsi_for_pct float,
-        fenwick_for float,
-        fenwick_against float,
-        fenwick_for_pct float,
-        shots_for float,
-        shots_against float,
-        shots_for_pct float,
-        goals_for_pct float,
-        expected_goals_for float,
-        expected_goals_against float,
-        expected_goals_for_pct float,
-        scoring_chances_for float,
-        scoring_chances_against float,
-        scoring_chances_for_pct float,
-        scoring_chances_shots_for float,
-        scoring_chances_shots_against float,
-        scoring_chances_shots_for_pct float,
-        scoring_chances_goals_for float,
-        scoring_chances_goals_against float,
-        scoring_chances_goals_for_pct float,
-        scoring_chances_shooting_pct float,
-        scoring_chances_save_pct float,
-        high_danger_chances_for float,
-        high_danger_chances_against float,
-        high_danger_chances_for_pct float,
-        high_danger_shots_for float,
-        high_danger_shots_against float,
-        high_danger_shots_for_pct float,
-        high_danger_goals_for float,
-        high_danger_goals_against float,
-        high_danger_goals_for_pct float,
-        high_danger_shooting_pct float,
-        high_danger_save_pct float,
-        medium_danger_chances_for float,
-        medium_danger_chances_against float,
-        medium_danger_chances_for_pct float,
-        medium_danger_shots_for float,
-        medium_danger_shots_against float,
-        medium_danger_shots_for_pct float,
-        medium_danger_goals_for float,
-        medium_danger_goals_against float,
-        medium_danger_goals_for_pct float,
-        medium_danger_shooting_pct float,
-        medium_danger_save_pct float,
-        low_danger_chances_for float,
-        low_danger_chances_against float,
-        low_danger_chances_for_pct float,
-        low_danger_shots_for float,
-        low_danger_shots_against float,
-        low_danger_shots_for_pct float,
-        low_danger_goals_for float,
-        low_danger_goals_against float,
-        low_danger_goals_for_pct float,
-        low_danger_shooting_pct float,
-        low_danger_save_pct float,
-        shooting_pct float,
-        save_pct float,
-        pdo_rating float
-    );
-                            
-"""
+create_season_stats_type_raw = season_stats_type_ddl(schema="raw")
 
-create_season_stats_type_analytics = """
-                            
-CREATE TYPE analytics.season_stats_type AS (
-        start_year int, 
-        faceoff_win_pct float,
-        games_played int,
-        goals_against int,
-        goals_against_per_game float,
-        goals_for int,
-        goals_for_per_game float,
-        losses int,
-        overtime_losses float,
-        penalty_kill_net_pct float,
-        penalty_kill_pct float,
-        points_pct float,
-        points int,
-        power_play_net_pct float,
-        power_play_pct float,
-        regulation_and_overtime_wins int,
-        shots_against_per_game float,
-        shots_for_per_game float,
-        ties float,
-        wins int,
-        wins_in_regulation int,
-        wins_in_shootout int,
-        time_on_ice varchar,
-        corsi_for float,
-        corsi_against float,
-        corsi_for_pct float,
-        fenwick_for float,
-        fenwick_against float,
-        fenwick_for_pct float,
-        shots_for float,
-        shots_against float,
-        shots_for_pct float,
-        goals_for_pct float,
-        expected_goals_for float,
-        expected_goals_against float,
-        expected_goals_for_pct float,
-        scoring_chances_for float,
-        scoring_chances_against float,
-        scoring_chances_for_pct float,
-        scoring_chances_shots_for float,
-        scoring_chances_shots_against float,
-        scoring_chances_shots_for_pct float,
-        scoring_chances_goals_for float,
-        scoring_chances_goals_against float,
-        scoring_chances_goals_for_pct float,
-        scoring_chances_shooting_pct float,
-        scoring_chances_save_pct float,
-        high_danger_chances_for float,
-        high_danger_chances_against float,
-        high_danger_chances_for_pct float,
-        high_danger_shots_for float,
-        high_danger_shots_against float,
-        high_danger_shots_for_pct float,
-        high_danger_goals_for float,
-        high_danger_goals_against float,
-        high_danger_goals_for_pct float,
-        high_danger_shooting_pct float,
-        high_danger_save_pct float,
-        medium_danger_chances_for float,
-        medium_danger_chances_against float,
-        medium_danger_chances_for_pct float,
-        medium_danger_shots_for float,
-        medium_danger_shots_against float,
-        medium_danger_shots_for_pct float,
-        medium_danger_goals_for float,
-        medium_danger_goals_against float,
-        medium_danger_goals_for_pct float,
-        medium_danger_shooting_pct float,
-        medium_danger_save_pct float,
-        low_danger_chances_for float,
-        low_danger_chances_against float,
-        low_danger_chances_for_pct float,
-        low_danger_shots_for float,
-        low_danger_shots_against float,
-        low_danger_shots_for_pct float,
-        low_danger_goals_for float,
-        low_danger_goals_against float,
-        low_danger_goals_for_pct float,
-        low_danger_shooting_pct float,
-        low_danger_save_pct float,
-        shooting_pct float,
-        save_pct float,
-        pdo_rating float
-    );
-                            
-"""
+create_season_stats_type_analytics = season_stats_type_ddl(schema="analytics")
 
 playoffs_cumulative_data_model_create = """
 
@@ -412,106 +155,279 @@ game_type_table_insert = (
 """
 )
 
-season_stats_table_col_num = 85
+season_stats_table_columns = season_stats_column_names()
+season_stats_table_key_columns = SEASON_STATS_KEY_COLUMNS
+season_stats_table_value_columns = [
+    column.name for column in season_stats_value_columns()
+]
+season_stats_table_col_num = len(season_stats_table_columns)
 season_stats_table_variables = "%s" + (",%s" * (season_stats_table_col_num - 1))
 season_stats_table_insert = (
     """
 
-    INSERT INTO raw.season_stats(
-        season_id,
-        game_type_id,
-        team_id,
-        faceoff_win_pct,
-        games_played,
-        goals_against,
-        goals_against_per_game,
-        goals_for,
-        goals_for_per_game,
-        losses,
-        overtime_losses,
-        penalty_kill_net_pct,
-        penalty_kill_pct,
-        points_pct,
-        points,
-        power_play_net_pct,
-        power_play_pct,
-        regulation_and_overtime_wins,
-        shots_against_per_game,
-        shots_for_per_game,
-        ties,
-        wins,
-        wins_in_regulation,
-        wins_in_shootout,
-        time_on_ice,
-        corsi_for,
-        corsi_against,
-        corsi_for_pct,
-        fenwick_for,
-        fenwick_against,
-        fenwick_for_pct,
-        shots_for,
-        shots_against,
-        shots_for_pct,
-        goals_for_pct,
-        expected_goals_for,
-        expected_goals_against,
-        expected_goals_for_pct,
-        scoring_chances_for,
-        scoring_chances_against,
-        scoring_chances_for_pct,
-        scoring_chances_shots_for,
-        scoring_chances_shots_against,
-        scoring_chances_shots_for_pct,
-        scoring_chances_goals_for,
-        scoring_chances_goals_against,
-        scoring_chances_goals_for_pct,
-        scoring_chances_shooting_pct,
-        scoring_chances_save_pct,
-        high_danger_chances_for,
-        high_danger_chances_against,
-        high_danger_chances_for_pct,
-        high_danger_shots_for,
-        high_danger_shots_against,
-        high_danger_shots_for_pct,
-        high_danger_goals_for,
-        high_danger_goals_against,
-        high_danger_goals_for_pct,
-        high_danger_shooting_pct,
-        high_danger_save_pct,
-        medium_danger_chances_for,
-        medium_danger_chances_against,
-        medium_danger_chances_for_pct,
-        medium_danger_shots_for,
-        medium_danger_shots_against,
-        medium_danger_shots_for_pct,
-        medium_danger_goals_for,
-        medium_danger_goals_against,
-        medium_danger_goals_for_pct,
-        medium_danger_shooting_pct,
-        medium_danger_save_pct,
-        low_danger_chances_for,
-        low_danger_chances_against,
-        low_danger_chances_for_pct,
-        low_danger_shots_for,
-        low_danger_shots_against,
-        low_danger_shots_for_pct,
-        low_danger_goals_for,
-        low_danger_goals_against,
-        low_danger_goals_for_pct,
-        low_danger_shooting_pct,
-        low_danger_save_pct,
-        shooting_pct,
-        save_pct,
-        pdo_rating
+    INSERT INTO raw.season_stats AS st(
+        """
+    + ",\n        ".join(season_stats_table_columns)
+    + """
     )
     VALUES ("""
     + season_stats_table_variables
     + """)
+    ON CONFLICT (team_id, season_id, game_type_id)
+        DO UPDATE SET """
+    + ", ".join(f"{col} = EXCLUDED.{col}" for col in season_stats_table_value_columns)
+    + """
+        WHERE ("""
+    + ", ".join(f"st.{col}" for col in season_stats_table_value_columns)
+    + """) IS DISTINCT FROM ("""
+    + ", ".join(f"EXCLUDED.{col}" for col in season_stats_table_value_columns)
+    + """);
          
 """
 )
 
 
+###########################################################################################################################################
+# NEW CODE BLOCK - Bulk load records
+###########################################################################################################################################
+
+# BULK LOAD RECORDS
+# Templates are composed with psycopg2.sql so table and column names are quoted safely
+staging_table_create = """
+
+    CREATE TEMP TABLE {staging_table} (LIKE {table} INCLUDING DEFAULTS)
+    ON COMMIT DROP;
+    
+"""
+
+staging_table_copy = """
+
+    COPY {staging_table} ({columns})
+    FROM STDIN WITH (FORMAT csv);
+    
+"""
+
+# Only rows whose values changed are rewritten; each written row is reported as inserted when
+# its key was not in the table before the statement (the outer SELECT does not see the CTE's
+# writes), so unchanged rows are the staged rows not returned. Unlike RETURNING xmax, this also
+# works on a partitioned table
+staging_table_upsert = """
+
+    WITH written AS (
+        INSERT INTO {table} AS target ({columns})
+        SELECT {columns}
+        FROM {staging_table}
+        ON CONFLICT ({conflict_columns})
+            DO UPDATE SET {update_columns}
+            WHERE ({target_columns}) IS DISTINCT FROM ({excluded_columns})
+        RETURNING {conflict_columns}
+    )
+    SELECT NOT EXISTS (
+        SELECT
+        FROM {table} AS existing
+        WHERE ({existing_keys}) = ({written_keys})
+    ) AS inserted
+    FROM written;
+        
+"""
+
+staging_table_insert = """
+
+    INSERT INTO {table} AS target ({columns})
+    SELECT {columns}
+    FROM {staging_table}
+    ON CONFLICT ({conflict_columns})
+        DO NOTHING
+    RETURNING TRUE AS inserted;
+        
+"""
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Select records
+###########################################################################################################################################
+
+# SELECT RECORDS
+latest_loaded_season_select = """
+
+    SELECT
+        game_type_id,
+        MAX(season_id) AS season_id
+    FROM raw.season_stats
+    GROUP BY game_type_id;
+    
+"""
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Migrate tables
+###########################################################################################################################################
+
+# MIGRATE TABLES
+# Views (e.g. dbt models) reading a table block changes to its column types, so they are found and
+# dropped first; dbt recreates them on the next run
+dependent_views_select = """
+
+    SELECT DISTINCT
+        view_namespace.nspname AS view_schema,
+        dependent_view.relname AS view_name
+    FROM pg_depend AS d
+    JOIN pg_rewrite AS r
+    ON d.objid = r.oid
+    JOIN pg_class AS dependent_view
+    ON r.ev_class = dependent_view.oid
+    JOIN pg_namespace AS view_namespace
+    ON dependent_view.relnamespace = view_namespace.oid
+    WHERE d.refobjid = %s::regclass
+    AND dependent_view.oid <> d.refobjid;
+    
+"""
+
+# Catalog lookups that let a migration skip work an older database already has
+type_exists_select = "SELECT to_regtype(%s);"
+
+table_exists_select = "SELECT to_regclass(%s);"
+
+column_types_select = """
+
+    SELECT column_name, data_type
+    FROM information_schema.columns
+    WHERE table_schema = %s
+    AND table_name = %s;
+    
+"""
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Schema migrations
+###########################################################################################################################################
+
+# SCHEMA MIGRATIONS
+# One row per applied migration version; created before the first migration runs
+schema_migrations_table_create = """
+
+    CREATE TABLE IF NOT EXISTS public.schema_migrations (
+        version int NOT NULL PRIMARY KEY,
+        name varchar NOT NULL,
+        applied_at timestamptz NOT NULL DEFAULT now()
+    );
+    
+"""
+
+schema_migrations_select = (
+    "SELECT version FROM public.schema_migrations ORDER BY version;"
+)
+
+schema_migration_insert = (
+    "INSERT INTO public.schema_migrations (version, name) VALUES (%s, %s);"
+)
+
+# Session-level advisory lock, so two runs never apply the same migration
+schema_migrations_lock = "SELECT pg_advisory_lock(%s);"
+schema_migrations_unlock = "SELECT pg_advisory_unlock(%s);"
+
+# The same lock, released when the transaction ends
+schema_migrations_xact_lock = "SELECT pg_advisory_xact_lock(%s);"
+
+# Full model rebuilds a migration asked for (see public.model_rebuilds, created by migration 2)
+model_rebuild_insert = """
+
+    INSERT INTO public.model_rebuilds (model_table, requested_by)
+    VALUES (%s, %s)
+    ON CONFLICT (model_table)
+        DO NOTHING;
+        
+"""
+
+model_rebuild_select = (
+    "SELECT requested_by FROM public.model_rebuilds WHERE model_table = %s;"
+)
+
+model_rebuild_delete = "DELETE FROM public.model_rebuilds WHERE model_table = %s;"
+
+# DATABASE
+database_exists_select = "SELECT 1 FROM pg_database WHERE datname = %s;"
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Indexes and partitions
+###########################################################################################################################################
+
+# INDEXES
+# The season's start year (2023 for 20232024), stored so the cumulative models read it instead of
+# joining raw.season and parsing its season string
+season_stats_start_year_column = (
+    "start_year smallint GENERATED ALWAYS AS ((season_id / 10000)::smallint) STORED"
+)
+
+season_stats_start_year_add = f"""
+
+    ALTER TABLE raw.season_stats
+    ADD COLUMN IF NOT EXISTS {season_stats_start_year_column};
+    
+"""
+
+# The cumulative models read one game type from their start season on
+season_stats_game_type_season_index_create = """
+
+    CREATE INDEX IF NOT EXISTS season_stats_game_type_season_idx
+    ON raw.season_stats (game_type_id, season_id);
+    
+"""
+
+# The dbt staging views, the marts and incremental model builds read one current_season
+playoffs_current_season_index_create = """
+
+    CREATE INDEX IF NOT EXISTS team_stats_playoffs_current_season_idx
+    ON raw.team_stats_playoffs (current_season);
+    
+"""
+
+regular_season_current_season_index_create = """
+
+    CREATE INDEX IF NOT EXISTS team_stats_regular_season_current_season_idx
+    ON raw.team_stats_regular_season (current_season);
+    
+"""
+
+# PARTITIONS
+partitioned_table_select = (
+    "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s);"
+)
+
+# raw.season_stats is rebuilt as a table partitioned by game type and its rows copied over; the
+# old table and its indexes are renamed out of the way first
+season_stats_partitioned_table_create = season_stats_table_ddl(
+    extra_columns=[season_stats_start_year_column], partition_by="LIST (game_type_id)"
+)
+
+season_stats_partition_queries = [
+    "ALTER TABLE raw.season_stats RENAME TO season_stats_unpartitioned;",
+    """
+    ALTER TABLE raw.season_stats_unpartitioned
+    RENAME CONSTRAINT season_stats_pkey TO season_stats_unpartitioned_pkey;
+    """,
+    "DROP INDEX IF EXISTS raw.season_stats_game_type_season_idx;",
+    season_stats_partitioned_table_create,
+    """
+    CREATE TABLE raw.season_stats_regular_season
+    PARTITION OF raw.season_stats FOR VALUES IN (2);
+    """,
+    """
+    CREATE TABLE raw.season_stats_playoffs
+    PARTITION OF raw.season_stats FOR VALUES IN (3);
+    """,
+    "CREATE TABLE raw.season_stats_other PARTITION OF raw.season_stats DEFAULT;",
+    f"""
+    INSERT INTO raw.season_stats ({", ".join(season_stats_table_columns)})
+    SELECT {", ".join(season_stats_table_columns)}
+    FROM raw.season_stats_unpartitioned;
+    """,
+    "DROP TABLE raw.season_stats_unpartitioned;",
+    season_stats_game_type_season_index_create,
+]
+
+
 ###########################################################################################################################################
 # NEW CODE BLOCK - Query lists
 ###########################################################################################################################################
@@ -526,6 +442,13 @@ create_table_queries = [
     regular_season_cumulative_data_model_create,
 ]
 
+create_index_queries = [
+    season_stats_start_year_add,
+    season_stats_game_type_season_index_create,
+    playoffs_current_season_index_create,
+    regular_season_current_season_index_create,
+]
+
 drop_table_queries = [
     teams_table_drop,
     season_table_drop,
@@ -0,0 +1,365 @@
+from typing import Dict, List, Optional, Sequence
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Season stats column registry
+###########################################################################################################################################
+
+
+class SeasonStatsColumn:
+    """
+    One column of raw.season_stats and where it comes from.
+
+    Args:
+        name (str): The column name in nhldb and in the merged dataset.
+        sql_type (str): The column's SQL type in raw.season_stats and raw.season_stats_type:
+            smallint for counts, real for rates and int for keys and time on ice (in seconds).
+        dtype (str): The pandas dtype the column is converted to before loading.
+        api_name (Optional[str]): The field name in the NHL API team summary, if it comes from there.
+        nst_name (Optional[str]): The column header on naturalstattrick.com, if it comes from there.
+            Columns found in both sources keep the NHL API value.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sql_type: str,
+        dtype: str,
+        api_name: Optional[str] = None,
+        nst_name: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.sql_type = sql_type
+        self.dtype = dtype
+        self.api_name = api_name
+        self.nst_name = nst_name
+
+
+# Every raw.season_stats column in table order; adding a stat needs a new entry here and a new
+# migration adding its column to nhldb (see Create_Tables/Migrations_NHL.py)
+SEASON_STATS_COLUMNS: List[SeasonStatsColumn] = [
+    SeasonStatsColumn("season_id", "int", "int32", api_name="seasonId"),
+    SeasonStatsColumn("game_type_id", "int", "int32"),
+    SeasonStatsColumn("team_id", "int", "int32", api_name="teamId"),
+    SeasonStatsColumn("faceoff_win_pct", "real", "float32", api_name="faceoffWinPct"),
+    SeasonStatsColumn(
+        "games_played", "smallint", "int16", api_name="gamesPlayed", nst_name="GP"
+    ),
+    SeasonStatsColumn(
+        "goals_against", "smallint", "int16", api_name="goalsAgainst", nst_name="GA"
+    ),
+    SeasonStatsColumn(
+        "goals_against_per_game", "real", "float32", api_name="goalsAgainstPerGame"
+    ),
+    SeasonStatsColumn(
+        "goals_for", "smallint", "int16", api_name="goalsFor", nst_name="GF"
+    ),
+    SeasonStatsColumn(
+        "goals_for_per_game", "real", "float32", api_name="goalsForPerGame"
+    ),
+    SeasonStatsColumn("losses", "smallint", "int16", api_name="losses", nst_name="L"),
+    SeasonStatsColumn("overtime_losses", "smallint", "int16", api_name="otLosses"),
+    SeasonStatsColumn(
+        "penalty_kill_net_pct", "real", "float32", api_name="penaltyKillNetPct"
+    ),
+    SeasonStatsColumn("penalty_kill_pct", "real", "float32", api_name="penaltyKillPct"),
+    SeasonStatsColumn("points_pct", "real", "float32", api_name="pointPct"),
+    SeasonStatsColumn("points", "smallint", "int16", api_name="points"),
+    SeasonStatsColumn(
+        "power_play_net_pct", "real", "float32", api_name="powerPlayNetPct"
+    ),
+    SeasonStatsColumn("power_play_pct", "real", "float32", api_name="powerPlayPct"),
+    SeasonStatsColumn(
+        "regulation_and_overtime_wins",
+        "smallint",
+        "int16",
+        api_name="regulationAndOtWins",
+    ),
+    SeasonStatsColumn(
+        "shots_against_per_game", "real", "float32", api_name="shotsAgainstPerGame"
+    ),
+    SeasonStatsColumn(
+        "shots_for_per_game", "real", "float32", api_name="shotsForPerGame"
+    ),
+    SeasonStatsColumn("ties", "smallint", "int16", api_name="ties"),
+    SeasonStatsColumn("wins", "smallint", "int16", api_name="wins", nst_name="W"),
+    SeasonStatsColumn(
+        "wins_in_regulation", "smallint", "int16", api_name="winsInRegulation"
+    ),
+    SeasonStatsColumn(
+        "wins_in_shootout", "smallint", "int16", api_name="winsInShootout"
+    ),
+    SeasonStatsColumn("time_on_ice", "int", "int32", nst_name="TOI"),
+    SeasonStatsColumn("corsi_for", "smallint", "int16", nst_name="CF"),
+    SeasonStatsColumn("corsi_against", "smallint", "int16", nst_name="CA"),
+    SeasonStatsColumn("corsi_for_pct", "real", "float32", nst_name="CF%"),
+    SeasonStatsColumn("fenwick_for", "smallint", "int16", nst_name="FF"),
+    SeasonStatsColumn("fenwick_against", "smallint", "int16", nst_name="FA"),
+    SeasonStatsColumn("fenwick_for_pct", "real", "float32", nst_name="FF%"),
+    SeasonStatsColumn("shots_for", "smallint", "int16", nst_name="SF"),
+    SeasonStatsColumn("shots_against", "smallint", "int16", nst_name="SA"),
+    SeasonStatsColumn("shots_for_pct", "real", "float32", nst_name="SF%"),
+    SeasonStatsColumn("goals_for_pct", "real", "float32", nst_name="GF%"),
+    SeasonStatsColumn("expected_goals_for", "real", "float32", nst_name="xGF"),
+    SeasonStatsColumn("expected_goals_against", "real", "float32", nst_name="xGA"),
+    SeasonStatsColumn("expected_goals_for_pct", "real", "float32", nst_name="xGF%"),
+    SeasonStatsColumn("scoring_chances_for", "smallint", "int16", nst_name="SCF"),
+    SeasonStatsColumn("scoring_chances_against", "smallint", "int16", nst_name="SCA"),
+    SeasonStatsColumn("scoring_chances_for_pct", "real", "float32", nst_name="SCF%"),
+    SeasonStatsColumn(
+        "scoring_chances_shots_for", "smallint", "int16", nst_name="SCSF"
+    ),
+    SeasonStatsColumn(
+        "scoring_chances_shots_against", "smallint", "int16", nst_name="SCSA"
+    ),
+    SeasonStatsColumn(
+        "scoring_chances_shots_for_pct", "real", "float32", nst_name="SCSF%"
+    ),
+    SeasonStatsColumn(
+        "scoring_chances_goals_for", "smallint", "int16", nst_name="SCGF"
+    ),
+    SeasonStatsColumn(
+        "scoring_chances_goals_against", "smallint", "int16", nst_name="SCGA"
+    ),
+    SeasonStatsColumn(
+        "scoring_chances_goals_for_pct", "real", "float32", nst_name="SCGF%"
+    ),
+    SeasonStatsColumn(
+        "scoring_chances_shooting_pct", "real", "float32", nst_name="SCSH%"
+    ),
+    SeasonStatsColumn("scoring_chances_save_pct", "real", "float32", nst_name="SCSV%"),
+    SeasonStatsColumn("high_danger_chances_for", "smallint", "int16", nst_name="HDCF"),
+    SeasonStatsColumn(
+        "high_danger_chances_against", "smallint", "int16", nst_name="HDCA"
+    ),
+    SeasonStatsColumn(
+        "high_danger_chances_for_pct", "real", "float32", nst_name="HDCF%"
+    ),
+    SeasonStatsColumn("high_danger_shots_for", "smallint", "int16", nst_name="HDSF"),
+    SeasonStatsColumn(
+        "high_danger_shots_against", "smallint", "int16", nst_name="HDSA"
+    ),
+    SeasonStatsColumn("high_danger_shots_for_pct", "real", "float32", nst_name="HDSF%"),
+    SeasonStatsColumn("high_danger_goals_for", "smallint", "int16", nst_name="HDGF"),
+    SeasonStatsColumn(
+        "high_danger_goals_against", "smallint", "int16", nst_name="HDGA"
+    ),
+    SeasonStatsColumn("high_danger_goals_for_pct", "real", "float32", nst_name="HDGF%"),
+    SeasonStatsColumn("high_danger_shooting_pct", "real", "float32", nst_name="HDSH%"),
+    SeasonStatsColumn("high_danger_save_pct", "real", "float32", nst_name="HDSV%"),
+    SeasonStatsColumn(
+        "medium_danger_chances_for", "smallint", "int16", nst_name="MDCF"
+    ),
+    SeasonStatsColumn(
+        "medium_danger_chances_against", "smallint", "int16", nst_name="MDCA"
+    ),
+    SeasonStatsColumn(
+        "medium_danger_chances_for_pct", "real", "float32", nst_name="MDCF%"
+    ),
+    SeasonStatsColumn("medium_danger_shots_for", "smallint", "int16", nst_name="MDSF"),
+    SeasonStatsColumn(
+        "medium_danger_shots_against", "smallint", "int16", nst_name="MDSA"
+    ),
+    SeasonStatsColumn(
+        "medium_danger_shots_for_pct", "real", "float32", nst_name="MDSF%"
+    ),
+    SeasonStatsColumn("medium_danger_goals_for", "smallint", "int16", nst_name="MDGF"),
+    SeasonStatsColumn(
+        "medium_danger_goals_against", "smallint", "int16", nst_name="MDGA"
+    ),
+    SeasonStatsColumn(
+        "medium_danger_goals_for_pct", "real", "float32", nst_name="MDGF%"
+    ),
+    SeasonStatsColumn(
+        "medium_danger_shooting_pct", "real", "float32", nst_name="MDSH%"
+    ),
+    SeasonStatsColumn("medium_danger_save_pct", "real", "float32", nst_name="MDSV%"),
+    SeasonStatsColumn("low_danger_chances_for", "smallint", "int16", nst_name="LDCF"),
+    SeasonStatsColumn(
+        "low_danger_chances_against", "smallint", "int16", nst_name="LDCA"
+    ),
+    SeasonStatsColumn(
+        "low_danger_chances_for_pct", "real", "float32", nst_name="LDCF%"
+    ),
+    SeasonStatsColumn("low_danger_shots_for", "smallint", "int16", nst_name="LDSF"),
+    SeasonStatsColumn("low_danger_shots_against", "smallint", "int16", nst_name="LDSA"),
+    SeasonStatsColumn("low_danger_shots_for_pct", "real", "float32", nst_name="LDSF%"),
+    SeasonStatsColumn("low_danger_goals_for", "smallint", "int16", nst_name="LDGF"),
+    SeasonStatsColumn("low_danger_goals_against", "smallint", "int16", nst_name="LDGA"),
+    SeasonStatsColumn("low_danger_goals_for_pct", "real", "float32", nst_name="LDGF%"),
+    SeasonStatsColumn("low_danger_shooting_pct", "real", "float32", nst_name="LDSH%"),
+    SeasonStatsColumn("low_danger_save_pct", "real", "float32", nst_name="LDSV%"),
+    SeasonStatsColumn("shooting_pct", "real", "float32", nst_name="SH%"),
+    SeasonStatsColumn("save_pct", "real", "float32", nst_name="SV%"),
+    SeasonStatsColumn("pdo_rating", "real", "float32", nst_name="PDO"),
+]
+
+# Primary key of raw.season_stats
+SEASON_STATS_KEY_COLUMNS = ["team_id", "season_id", "game_type_id"]
+
+# Source fields that are only used to merge the two sources and to build the dimension tables
+API_MERGE_COLUMNS = {"teamFullName": "team_full_name", "gameType": "game_type"}
+NST_MERGE_COLUMNS = {"Team": "team", "Season": "season", "GameType": "game_type"}
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Generated column lists and maps
+###########################################################################################################################################
+
+
+def season_stats_column_names() -> List[str]:
+    """
+    Returns:
+        List[str]: Every raw.season_stats column name in table order.
+    """
+    return [column.name for column in SEASON_STATS_COLUMNS]
+
+
+def season_stats_value_columns() -> List[SeasonStatsColumn]:
+    """
+    Returns:
+        List[SeasonStatsColumn]: The non-key columns in table order; these are the stats packed
+            into raw.season_stats_type.
+    """
+    return [
+        column
+        for column in SEASON_STATS_COLUMNS
+        if column.name not in SEASON_STATS_KEY_COLUMNS
+    ]
+
+
+def season_stats_dtypes() -> Dict[str, str]:
+    """
+    Returns:
+        Dict[str, str]: The pandas dtype of every raw.season_stats column, for a single DataFrame.astype call.
+    """
+    return {column.name: column.dtype for column in SEASON_STATS_COLUMNS}
+
+
+def renamed_columns_api() -> Dict[str, str]:
+    """
+    Returns:
+        Dict[str, str]: NHL API field names mapped to nhldb column names.
+    """
+    renamed_columns = {
+        column.api_name: column.name
+        for column in SEASON_STATS_COLUMNS
+        if column.api_name is not None
+    }
+    renamed_columns.update(API_MERGE_COLUMNS)
+
+    return renamed_columns
+
+
+def renamed_columns_nst() -> Dict[str, str]:
+    """
+    Returns:
+        Dict[str, str]: naturalstattrick.com column headers mapped to nhldb column names.
+    """
+    renamed_columns = {
+        column.nst_name: column.name
+        for column in SEASON_STATS_COLUMNS
+        if column.nst_name is not None
+    }
+    renamed_columns.update(NST_MERGE_COLUMNS)
+
+    return renamed_columns
+
+
+def nst_numeric_columns() -> List[str]:
+    """
+    Returns:
+        List[str]: The naturalstattrick.com stats (after renaming) parsed as numbers; time on ice
+            stays 'MM:SS' text until it is converted to seconds on load.
+    """
+    return [
+        column.name
+        for column in SEASON_STATS_COLUMNS
+        if column.nst_name is not None and column.name != "time_on_ice"
+    ]
+
+
+def nst_percentage_columns() -> List[str]:
+    """
+    Returns:
+        List[str]: The naturalstattrick.com percentage stats (after renaming), which the site
+            reports out of 100 and nhldb stores as fractions.
+    """
+    return [name for name in nst_numeric_columns() if name.endswith("_pct")]
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Generated SQL
+###########################################################################################################################################
+
+
+def season_stats_table_ddl(
+    extra_columns: Sequence[str] = (), partition_by: Optional[str] = None
+) -> str:
+    """
+    Args:
+        extra_columns (Sequence[str]): Column definitions added after the registry columns, e.g.
+            a generated column.
+        partition_by (Optional[str]): A PARTITION BY clause, e.g. 'LIST (game_type_id)'.
+
+    Returns:
+        str: The CREATE TABLE statement for raw.season_stats.
+    """
+    column_definitions = ",\n        ".join(
+        [f"{column.name} {column.sql_type} NOT NULL" for column in SEASON_STATS_COLUMNS]
+        + list(extra_columns)
+    )
+    partition_clause = f" PARTITION BY {partition_by}" if partition_by else ""
+
+    return f"""
+
+CREATE TABLE IF NOT EXISTS raw.season_stats (
+        PRIMARY KEY ({", ".join(SEASON_STATS_KEY_COLUMNS)}),
+        {column_definitions}
+    ){partition_clause};
+        
+"""
+
+
+def season_stats_type_ddl(schema: str) -> str:
+    """
+    Args:
+        schema (str): The schema the composite type is created in (raw or analytics).
+
+    Returns:
+        str: The CREATE TYPE statement for <schema>.season_stats_type: the season's start year
+            followed by every stat column.
+    """
+    attribute_definitions = ",\n        ".join(
+        ["start_year smallint"]
+        + [
+            f"{column.name} {column.sql_type}"
+            for column in season_stats_value_columns()
+        ]
+    )
+
+    return f"""
+                            
+CREATE TYPE {schema}.season_stats_type AS (
+        {attribute_definitions}
+    );
+                            
+"""
+
+
+def season_stats_row_constructor(alias: str) -> str:
+    """
+    Args:
+        alias (str): The alias of the relation holding the season's start_year and stat columns.
+
+    Returns:
+        str: A ROW(...) expression for raw.season_stats_type built from that relation.
+    """
+    fields = ",\n    ".join(
+        [f"{alias}.start_year::smallint"]
+        + [
+            f"{alias}.{column.name}::{column.sql_type}"
+            for column in season_stats_value_columns()
+        ]
+    )
+
+    return f"ROW(\n    {fields}\n)::raw.season_stats_type"
@@ -0,0 +1,312 @@
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .Snapshot_Format_NHL import find_snapshot, read_snapshot
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Snapshot store defaults
+###########################################################################################################################################
+
+# Columns identifying one team's stats for one season and game type
+SNAPSHOT_KEY_COLUMNS = ["team_id", "season_id", "game_type"]
+
+# Marks delta rows that remove a key from the snapshot
+DELETED_COLUMN = "_deleted"
+
+# Bases are zstd-compressed Parquet; deltas are gzipped CSV because a few changed rows would
+# otherwise be dwarfed by Parquet's per-column metadata (~14 KB for an empty 88-column file)
+BASE_COMPRESSION = "zstd"
+DELTA_EXTENSION = "csv.gz"
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Row-level snapshot diffs
+###########################################################################################################################################
+
+
+def diff_frames(
+    old_df: pd.DataFrame,
+    new_df: pd.DataFrame,
+    key_columns: List[str] = SNAPSHOT_KEY_COLUMNS,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Compares two snapshots with the same columns row by row on their key columns. Missing values
+    on both sides count as equal; a value missing on one side only is a change, including in
+    nullable columns (e.g. pandas 'string') whose comparisons return <NA>.
+
+    Args:
+        old_df (pd.DataFrame): The earlier snapshot.
+        new_df (pd.DataFrame): The later snapshot.
+        key_columns (List[str]): The columns identifying a row.
+
+    Returns:
+        Dict[str, pd.DataFrame]: 'added' and 'changed' rows (with their new values) and 'removed' rows
+            (with their old values).
+    """
+    old_indexed = old_df.set_index(key_columns)
+    new_indexed = new_df.set_index(key_columns)
+    common = new_indexed.index.intersection(old_indexed.index)
+
+    old_common = old_indexed.loc[common, new_indexed.columns]
+    new_common = new_indexed.loc[common]
+    equal = old_common.eq(new_common).fillna(False).astype(bool) | (
+        old_common.isna() & new_common.isna()
+    )
+    changed = ~equal.all(axis=1)
+
+    return {
+        "added": new_indexed[~new_indexed.index.isin(old_indexed.index)].reset_index(),
+        "removed": old_indexed[
+            ~old_indexed.index.isin(new_indexed.index)
+        ].reset_index(),
+        "changed": new_common[changed.to_numpy()].reset_index(),
+    }
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Deduplicated snapshot store
+###########################################################################################################################################
+
+
+class SnapshotStore:
+    """
+    Keeps a dated history of NHL_Data snapshots as one full base plus per-date row-level deltas.
+
+    Each date's delta holds only the rows whose values changed, were added or (flagged with
+    `_deleted`) were removed since the previous date, keyed on (team_id, season_id, game_type).
+    A day in which only the current season moved therefore costs a few kilobytes instead of a
+    full copy. A new base is written whenever the snapshot columns change. `manifest.json` lists
+    every stored date and whether it is a base or a delta.
+
+    Args:
+        store_dir (str): The directory holding the manifest, bases and deltas.
+        key_columns (List[str]): The columns identifying a row.
+    """
+
+    def __init__(
+        self, store_dir: str, key_columns: List[str] = SNAPSHOT_KEY_COLUMNS
+    ) -> None:
+        self.store_dir = store_dir
+        self.key_columns = list(key_columns)
+        self.manifest_path = os.path.join(store_dir, "manifest.json")
+        os.makedirs(store_dir, exist_ok=True)
+
+    def _manifest(self) -> Dict[str, Any]:
+        """
+        Reads the manifest.
+
+        Returns:
+            Dict[str, Any]: The manifest with its 'entries' ({date, kind, rows}) in date order.
+        """
+        if not os.path.isfile(self.manifest_path):
+            return {"key_columns": self.key_columns, "entries": []}
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """
+        Replaces the manifest atomically.
+
+        Args:
+            manifest (Dict[str, Any]): The manifest to write.
+        """
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+        return None
+
+    def _path(self, date: str, kind: str) -> str:
+        """
+        Returns the file path of a stored base or delta.
+
+        Args:
+            date (str): The snapshot date (YYYY-MM-DD).
+            kind (str): 'base' or 'delta'.
+
+        Returns:
+            str: The base Parquet or delta CSV file path.
+        """
+        extension = "parquet" if kind == "base" else DELTA_EXTENSION
+
+        return os.path.join(self.store_dir, f"{date}.{kind}.{extension}")
+
+    def dates(self) -> List[str]:
+        """
+        Returns:
+            List[str]: Every stored snapshot date, oldest first.
+        """
+        return [entry["date"] for entry in self._manifest()["entries"]]
+
+    def add(self, date: str, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Stores a snapshot for a date. Only the rows that differ from the latest stored snapshot are
+        written; the first snapshot, or one whose columns changed, is stored as a new base. Adding
+        the latest stored date again (e.g. a second run on the same day) replaces it.
+
+        Args:
+            date (str): The snapshot date (YYYY-MM-DD); must not be before the latest stored date.
+            df (pd.DataFrame): The full snapshot.
+
+        Returns:
+            Dict[str, int]: The number of 'added', 'changed' and 'removed' rows stored for the date.
+
+        Raises:
+            ValueError: If the date is before the latest stored date, or keys are duplicated.
+        """
+        manifest = self._manifest()
+        entries = manifest["entries"]
+        if entries and date < entries[-1]["date"]:
+            raise ValueError(
+                f"Snapshot date {date} is before the latest stored date {entries[-1]['date']}"
+            )
+        if df.duplicated(self.key_columns).any():
+            raise ValueError(f"Snapshot has duplicate {self.key_columns} keys")
+        if entries and date == entries[-1]["date"]:
+            replaced = entries.pop()
+            os.remove(self._path(replaced["date"], replaced["kind"]))
+
+        previous = self.view(entries[-1]["date"]) if entries else None
+        if previous is None or list(previous.columns) != list(df.columns):
+            df.to_parquet(
+                self._path(date, "base"), compression=BASE_COMPRESSION, index=False
+            )
+            entries.append({"date": date, "kind": "base", "rows": int(df.shape[0])})
+            counts = {"added": int(df.shape[0]), "changed": 0, "removed": 0}
+        else:
+            diff = diff_frames(previous, df, key_columns=self.key_columns)
+            removed = diff["removed"][self.key_columns].assign(**{DELETED_COLUMN: True})
+            delta = pd.concat(
+                [
+                    pd.concat([diff["added"], diff["changed"]]).assign(
+                        **{DELETED_COLUMN: False}
+                    ),
+                    removed,
+                ],
+                ignore_index=True,
+            )
+            delta.to_csv(self._path(date, "delta"), compression="gzip", index=False)
+            entries.append({"date": date, "kind": "delta", "rows": int(delta.shape[0])})
+            counts = {name: int(rows.shape[0]) for name, rows in diff.items()}
+        self._write_manifest(manifest)
+
+        return counts
+
+    def view(self, date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Reconstructs the snapshot as of a date from its base and the deltas after it. Rows keep
+        the order in which their key first appeared.
+
+        Args:
+            date (Optional[str]): The date to reconstruct; the latest stored date on or before it is
+                used. Defaults to the latest stored date.
+
+        Returns:
+            pd.DataFrame: The full snapshot.
+
+        Raises:
+            KeyError: If no snapshot is stored on or before the date.
+        """
+        entries = [
+            entry
+            for entry in self._manifest()["entries"]
+            if date is None or entry["date"] <= date
+        ]
+        base_positions = [
+            i for i, entry in enumerate(entries) if entry["kind"] == "base"
+        ]
+        if not base_positions:
+            raise KeyError(f"No snapshot stored on or before {date}")
+
+        base_entry = entries[base_positions[-1]]
+        df = pd.read_parquet(self._path(base_entry["date"], "base"))
+        columns = list(df.columns)
+        df = df.set_index(self.key_columns)
+        # CSV deltas lose the base dtypes (e.g. ints become floats next to removed rows), so their
+        # rows are parsed with exact floats and cast back before being applied
+        dtypes = df.dtypes.to_dict()
+        for entry in entries[base_positions[-1] + 1 :]:
+            delta = pd.read_csv(
+                self._path(entry["date"], "delta"), float_precision="round_trip"
+            ).set_index(self.key_columns)
+            deleted = delta[DELETED_COLUMN].astype(bool).to_numpy()
+            upserts = delta.loc[~deleted, df.columns].astype(dtypes)
+            df = df.drop(delta.index[deleted], errors="ignore")
+            existing = upserts.index.isin(df.index)
+            df.loc[upserts.index[existing]] = upserts[existing]
+            df = pd.concat([df, upserts[~existing]])
+
+        return df.reset_index()[columns]
+
+    def diff(self, old_date: str, new_date: str) -> Dict[str, pd.DataFrame]:
+        """
+        Compares the snapshots of two dates. When both share a base, only the keys touched by the
+        deltas between them are compared.
+
+        Args:
+            old_date (str): The earlier date.
+            new_date (str): The later date.
+
+        Returns:
+            Dict[str, pd.DataFrame]: 'added', 'changed' and 'removed' rows as in diff_frames.
+        """
+        old_df = self.view(old_date)
+        new_df = self.view(new_date)
+        entries = [
+            entry
+            for entry in self._manifest()["entries"]
+            if old_date < entry["date"] <= new_date
+        ]
+        if entries and all(entry["kind"] == "delta" for entry in entries):
+            touched = pd.concat(
+                [
+                    pd.read_csv(
+                        self._path(entry["date"], "delta"), usecols=self.key_columns
+                    )
+                    for entry in entries
+                ]
+            ).drop_duplicates()
+            old_df = old_df.merge(touched, on=self.key_columns)
+            new_df = new_df.merge(touched, on=self.key_columns)
+        elif not entries:
+            old_df = old_df.iloc[0:0]
+            new_df = new_df.iloc[0:0]
+
+        return diff_frames(old_df, new_df, key_columns=self.key_columns)
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Import dated snapshot folders
+###########################################################################################################################################
+
+
+def import_dated_snapshots(store: SnapshotStore, store_export_path: str) -> List[str]:
+    """
+    Adds the full snapshots in dated folders (e.g. ETL/NHL_Data/2024-12-30/NHL_Data.csv) that are
+    newer than the store's latest date, oldest first. The folders are left in place.
+
+    Args:
+        store (SnapshotStore): The store to add them to.
+        store_export_path (str): The directory holding the dated folders.
+
+    Returns:
+        List[str]: The dates imported.
+    """
+    stored_dates = store.dates()
+    latest = stored_dates[-1] if stored_dates else ""
+    imported = []
+    for date_dir in sorted(os.listdir(store_export_path)):
+        if not re.fullmatch(r"\d{4}-\d{2}-\d{2}", date_dir) or date_dir <= latest:
+            continue
+        path = find_snapshot(os.path.join(store_export_path, date_dir))
+        if path is None:
+            continue
+        store.add(date_dir, read_snapshot(path))
+        imported.append(date_dir)
+
+    return imported
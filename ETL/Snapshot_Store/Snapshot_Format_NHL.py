@@ -0,0 +1,324 @@
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+
+# pyarrow is optional; without it snapshots fall back to CSV
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Snapshot format defaults
+###########################################################################################################################################
+
+load_dotenv()
+
+# File name (without extension) of every NHL_Data snapshot
+SNAPSHOT_NAME = "NHL_Data"
+
+# Supported formats, in the order a reader prefers them when a directory holds several
+SNAPSHOT_EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv"}
+
+# Primary snapshot format; a CSV copy is also written when ETL_SNAPSHOT_CSV is set (e.g. '1')
+SNAPSHOT_FORMAT = os.getenv("ETL_SNAPSHOT_FORMAT", "parquet")
+SNAPSHOT_CSV = os.getenv("ETL_SNAPSHOT_CSV", "").lower() in ("1", "true", "yes", "y")
+
+# Parquet snapshots are zstd-compressed in small row groups; extracts are ordered by game type and
+# season, so each row group spans a few seasons and season filters skip the rest. Arrow IPC
+# snapshots are left uncompressed so they can be memory-mapped
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_SIZE = 512
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Write snapshots
+###########################################################################################################################################
+
+
+def snapshot_formats(formats: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Resolves which formats a snapshot is written in. Columnar formats need pyarrow; without it
+    the snapshot is written as CSV only.
+
+    Args:
+        formats (Optional[Iterable[str]]): The requested formats. Defaults to SNAPSHOT_FORMAT, plus CSV if SNAPSHOT_CSV is set.
+
+    Returns:
+        List[str]: The formats to write.
+
+    Raises:
+        ValueError: If a format is not supported.
+    """
+    if formats is None:
+        formats = [SNAPSHOT_FORMAT] + (["csv"] if SNAPSHOT_CSV else [])
+    formats = list(dict.fromkeys(formats))
+    unknown = set(formats) - set(SNAPSHOT_EXTENSIONS)
+    if unknown:
+        raise ValueError(
+            f"Unsupported snapshot formats {sorted(unknown)}; use {list(SNAPSHOT_EXTENSIONS)}"
+        )
+    if pa is None and formats != ["csv"]:
+        print("pyarrow is not installed; writing the snapshot as CSV")
+        formats = ["csv"]
+
+    return formats
+
+
+def write_snapshot(
+    df: pd.DataFrame, directory: str, formats: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    Writes an NHL_Data snapshot to a directory in each requested format.
+
+    Parquet and Arrow snapshots keep the column dtypes, so readers skip text parsing and can read
+    only the columns and seasons they need.
+
+    Args:
+        df (pd.DataFrame): The snapshot rows.
+        directory (str): The directory to write NHL_Data.<extension> to.
+        formats (Optional[Iterable[str]]): The formats to write. Defaults to snapshot_formats().
+
+    Returns:
+        List[str]: The paths written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for snapshot_format in snapshot_formats(formats):
+        path = os.path.join(
+            directory, SNAPSHOT_NAME + SNAPSHOT_EXTENSIONS[snapshot_format]
+        )
+        if snapshot_format == "csv":
+            df.to_csv(path, index=False)
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if snapshot_format == "parquet":
+                pq.write_table(
+                    table,
+                    path,
+                    compression=PARQUET_COMPRESSION,
+                    row_group_size=PARQUET_ROW_GROUP_SIZE,
+                )
+            else:
+                feather.write_feather(table, path, compression="uncompressed")
+        paths.append(path)
+
+    return paths
+
+
+class SnapshotWriter:
+    """
+    Writes an NHL_Data snapshot one batch (e.g. one season) at a time, so a streamed extract never
+    holds more than a batch in memory. Parquet batches become row groups, Arrow batches record
+    batches and CSV batches are appended.
+
+    The column types are fixed by the first batch: key columns are int64, text columns string and
+    everything else float64, and later batches are aligned to those columns (missing columns are
+    null). Files are written under a temporary name and only replace the previous snapshot when
+    the writer is closed successfully.
+
+    Args:
+        directory (str): The directory to write NHL_Data.<extension> to.
+        formats (Optional[Iterable[str]]): The formats to write. Defaults to snapshot_formats().
+    """
+
+    # Columns whose type cannot be inferred from an all-missing first batch
+    INTEGER_COLUMNS = ("team_id", "season_id")
+    STRING_COLUMNS = ("team_full_name", "game_type", "time_on_ice")
+
+    def __init__(self, directory: str, formats: Optional[Iterable[str]] = None) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.paths = {
+            snapshot_format: os.path.join(
+                directory, SNAPSHOT_NAME + SNAPSHOT_EXTENSIONS[snapshot_format]
+            )
+            for snapshot_format in snapshot_formats(formats)
+        }
+        self.columns: Optional[List[str]] = None
+        self.dtypes: Dict[str, str] = {}
+        self.writers: Dict[str, Any] = {}
+        self.rows = 0
+
+    def _dtypes(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        Fixes each column's type from the first batch.
+
+        Args:
+            df (pd.DataFrame): The first batch.
+
+        Returns:
+            Dict[str, str]: The pandas dtype of every column.
+        """
+        dtypes = {}
+        for column in df.columns:
+            values = df[column].dropna()
+            if column in self.INTEGER_COLUMNS:
+                dtypes[column] = "int64"
+            elif column in self.STRING_COLUMNS or (
+                not values.empty
+                and not pd.api.types.is_numeric_dtype(values)
+                and isinstance(values.iloc[0], str)
+            ):
+                dtypes[column] = "string"
+            else:
+                dtypes[column] = "float64"
+
+        return dtypes
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Appends a batch to the snapshot.
+
+        Args:
+            df (pd.DataFrame): The batch rows.
+        """
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self.dtypes = self._dtypes(df)
+        extra = [column for column in df.columns if column not in self.dtypes]
+        if extra:
+            print("Dropping columns missing from the first batch: " + str(extra))
+        df = df.reindex(columns=self.columns).astype(self.dtypes)
+
+        for snapshot_format, path in self.paths.items():
+            tmp_path = path + ".tmp"
+            if snapshot_format == "csv":
+                df.to_csv(tmp_path, mode="a", header=self.rows == 0, index=False)
+                continue
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if snapshot_format not in self.writers:
+                if snapshot_format == "parquet":
+                    self.writers[snapshot_format] = pq.ParquetWriter(
+                        tmp_path, table.schema, compression=PARQUET_COMPRESSION
+                    )
+                else:
+                    self.writers[snapshot_format] = pa.ipc.new_file(
+                        tmp_path, table.schema
+                    )
+            if snapshot_format == "parquet":
+                self.writers[snapshot_format].write_table(
+                    table, row_group_size=PARQUET_ROW_GROUP_SIZE
+                )
+            else:
+                self.writers[snapshot_format].write_table(table)
+        self.rows += df.shape[0]
+
+        return None
+
+    def close(self, success: bool = True) -> List[str]:
+        """
+        Finishes the snapshot files and moves them into place, or removes them if the extract failed.
+
+        Args:
+            success (bool): Whether every batch was written.
+
+        Returns:
+            List[str]: The paths written; empty if nothing was written or the extract failed.
+        """
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+        written = []
+        for path in self.paths.values():
+            tmp_path = path + ".tmp"
+            if not os.path.isfile(tmp_path):
+                continue
+            if success:
+                os.replace(tmp_path, path)
+                written.append(path)
+            else:
+                os.remove(tmp_path)
+
+        return written
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Read snapshots
+###########################################################################################################################################
+
+
+def find_snapshot(directory: str) -> Optional[str]:
+    """
+    Finds the NHL_Data snapshot in a directory, preferring columnar formats over CSV.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        Optional[str]: The snapshot path, or None if the directory has no snapshot.
+    """
+    for snapshot_format, extension in SNAPSHOT_EXTENSIONS.items():
+        if snapshot_format != "csv" and pa is None:
+            continue
+        path = os.path.join(directory, SNAPSHOT_NAME + extension)
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def read_snapshot(
+    path: str,
+    columns: Optional[List[str]] = None,
+    season_ids: Optional[Iterable[int]] = None,
+    game_types: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    Reads an NHL_Data snapshot, optionally only some of its columns and seasons.
+
+    Parquet snapshots push the column selection and season/game type filters down to the file,
+    so skipped columns are never decoded and row groups without matching seasons are skipped.
+    Arrow snapshots are memory-mapped and filtered before conversion to pandas.
+
+    Args:
+        path (str): The snapshot path (.parquet, .arrow or .csv).
+        columns (Optional[List[str]]): The columns to read. Defaults to every column.
+        season_ids (Optional[Iterable[int]]): The season IDs to keep (e.g. 20242025). Defaults to every season.
+        game_types (Optional[Iterable[str]]): The game types to keep (e.g. 'Playoffs'). Defaults to every game type.
+
+    Returns:
+        pd.DataFrame: The selected rows and columns.
+    """
+    filters = []
+    if season_ids is not None:
+        filters.append(("season_id", [int(season_id) for season_id in season_ids]))
+    if game_types is not None:
+        filters.append(("game_type", list(game_types)))
+
+    # Filter columns must be read even when they are not selected
+    read_columns = columns
+    if columns is not None:
+        read_columns = list(
+            dict.fromkeys(list(columns) + [name for name, _ in filters])
+        )
+
+    if path.endswith(SNAPSHOT_EXTENSIONS["parquet"]):
+        table = pq.read_table(
+            path,
+            columns=read_columns,
+            filters=[(name, "in", values) for name, values in filters] or None,
+        )
+        df = table.to_pandas()
+    elif path.endswith(SNAPSHOT_EXTENSIONS["arrow"]):
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        if read_columns is not None:
+            table = table.select(read_columns)
+        for name, values in filters:
+            table = table.filter(pc.is_in(table[name], value_set=pa.array(values)))
+        df = table.to_pandas()
+    else:
+        df = pd.read_csv(path, usecols=read_columns)
+        for name, values in filters:
+            df = df[df[name].isin(values)]
+
+    if columns is not None:
+        df = df[columns]
+
+    return df.reset_index(drop=True)
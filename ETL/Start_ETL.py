@@ -1,30 +1,51 @@
+import argparse
 import os
 import sys
+from typing import List, Optional
 
-# Get the current working directory (the directory of the running script)
-current_dir = os.getcwd()
-# Add the target directory to the system path for API extraction
-sys.path.append(os.path.abspath(os.path.join(current_dir, "Extract_API_NHL_Data")))
-from API_Web_Scraper_NHL import extract
+# Run as a script (python ETL/Start_ETL.py, from any directory): make the ETL package importable
+# from the directory above it and resolve this module's relative imports inside it (PEP 366)
+if __name__ == "__main__" and not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
 
-# Add the target directory to the system path for ETL process
-sys.path.append(os.path.abspath(os.path.join(current_dir, "Transform_Load")))
-from Transform_Load_NHL import transform_load
+# Stage modules (and pandas, requests, lxml and psycopg2 with them) are imported by the stages that
+# use them, so --help and single stages start without loading the others
 
+# Exit codes of the command line interface; invalid arguments exit with argparse's 2
+EXIT_SUCCESS = 0
+EXIT_FAILURE = 1
+EXIT_INTERRUPTED = 130
 
-def main() -> None:
+# Game type names accepted by --game-types and their NHL API game type IDs
+GAME_TYPE_IDS = {"regular": 2, "playoffs": 3}
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Interactive pipeline
+###########################################################################################################################################
+
+
+def interactive(resume: bool = False) -> None:
     """
     Runs the interactive pipeline to:
       - Extract NHL season and playoff data from the API.
       - Run the ETL process to transform and load the data into the database.
 
     The user is prompted whether to run each step.
+
+    Args:
+        resume (bool): Whether the extract resumes the previous failed run from its checkpoints.
     """
+    from .Extract_API_NHL_Data.API_Web_Scraper_NHL import extract
+    from .Transform_Load.Transform_Load_NHL import BatchLoader, transform_load
+
     ###########################################################################################################################################
     # NEW BLOCK - API & Web Scraper for Season and Playoff Data
     ###########################################################################################################################################
     yesChoice = ["yes", "y"]
     noChoice = ["no", "n"]
+    streamed = False
 
     input_1: str = input(
         "Would you like to extract season data from the NHL API & naturalstattrick.com? ['yes','y'] or ['no','n'] "
@@ -32,13 +53,27 @@ def main() -> None:
     input_1 = input_1.lower()
 
     if input_1 in yesChoice:
+        input_incremental: str = input(
+            "Would you like to only extract seasons newer than those already in nhldb? ['yes','y'] or ['no','n'] "
+        )
+        incremental = input_incremental.lower() in yesChoice
+        input_stream: str = input(
+            "Would you like to load each season into nhldb as soon as it is extracted? ['yes','y'] or ['no','n'] "
+        )
+        stream = input_stream.lower() in yesChoice
         try:
-            # Warn and store NHL season and playoff data to data storage directories via CSV
+            # Warn and store NHL season and playoff data to data storage directories as a snapshot,
+            # optionally loading each season into nhldb while the next ones are fetched
             print(
                 "Please wait while we get the data from the NHL API & naturalstattrick.com"
             )
-            extract()
-            print("Data stored as a CSV")
+            extract(
+                incremental=incremental,
+                sinks=[BatchLoader()] if stream else None,
+                resume=resume,
+            )
+            streamed = stream
+            print("Data stored as a snapshot")
             input(
                 "Press enter to continue to the ETL process or Ctrl+C to end the program"
             )
@@ -64,10 +99,14 @@ def main() -> None:
     input_2 = input_2.lower()
 
     if input_2 in yesChoice:
+        input_incremental_models: str = input(
+            "Would you like to only rebuild the newest season of the cumulative models? ['yes','y'] or ['no','n'] "
+        )
+        incremental_models = input_incremental_models.lower() in yesChoice
         try:
             # Run the ETL pipeline to transform and load data into nhldb
             print("Transforming and loading the data")
-            transform_load()
+            transform_load(incremental=incremental_models, load=not streamed)
             input(
                 "ETL process complete. Please press enter or Ctrl+C to end the program"
             )
@@ -84,5 +123,295 @@ def main() -> None:
         sys.exit()
 
 
+###########################################################################################################################################
+# NEW CODE BLOCK - Command line arguments
+###########################################################################################################################################
+
+
+def parse_seasons(value: str) -> List[int]:
+    """
+    Parses a comma-separated list of seasons and season ranges, given as start years (2023) or
+    season IDs (20232024), e.g. '2019-2023,2024'.
+
+    Args:
+        value (str): The --seasons argument.
+
+    Returns:
+        List[int]: The season IDs, in order.
+
+    Raises:
+        argparse.ArgumentTypeError: If a season is not a start year or season ID.
+    """
+
+    def start_year(text: str) -> int:
+        text = text.strip()
+        if len(text) == 4 and text.isdigit():
+            return int(text)
+        if len(text) == 8 and text.isdigit() and int(text[4:]) == int(text[:4]) + 1:
+            return int(text[:4])
+        raise argparse.ArgumentTypeError(
+            f"invalid season '{text}': use a start year (2023) or season ID (20232024)"
+        )
+
+    seasons: List[int] = []
+    for part in value.split(","):
+        first, _, last = part.partition("-")
+        years = range(start_year(first), start_year(last or first) + 1)
+        if not years:
+            raise argparse.ArgumentTypeError(f"empty season range '{part}'")
+        seasons.extend(int(f"{year}{year + 1}") for year in years)
+
+    return sorted(set(seasons))
+
+
+def parse_game_types(value: str) -> List[int]:
+    """
+    Parses a comma-separated list of game types ('regular', 'playoffs', 2 or 3).
+
+    Args:
+        value (str): The --game-types argument.
+
+    Returns:
+        List[int]: The NHL API game type IDs, in order.
+
+    Raises:
+        argparse.ArgumentTypeError: If a game type is unknown.
+    """
+    game_type_ids = set()
+    for part in value.split(","):
+        part = part.strip().lower()
+        if part in GAME_TYPE_IDS:
+            game_type_ids.add(GAME_TYPE_IDS[part])
+        elif part.isdigit() and int(part) in GAME_TYPE_IDS.values():
+            game_type_ids.add(int(part))
+        else:
+            raise argparse.ArgumentTypeError(
+                f"invalid game type '{part}': use {', '.join(GAME_TYPE_IDS)}"
+            )
+
+    return sorted(game_type_ids)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the command line parser. Each subcommand runs one stage, or every stage with 'all';
+    without a subcommand the interactive pipeline runs.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run the NHL ETL pipeline. Without a command, the pipeline prompts for each step.",
+        epilog="Exit codes: 0 success, 1 a stage failed, 2 invalid arguments, 130 interrupted.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="resume the previous failed extract from its last checkpoint",
+    )
+
+    filters = argparse.ArgumentParser(add_help=False)
+    filters.add_argument(
+        "--game-types",
+        type=parse_game_types,
+        default=None,
+        help="comma-separated game types: regular, playoffs (default: both)",
+    )
+    filters.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print what would be done without fetching, loading or building anything",
+    )
+    seasons = argparse.ArgumentParser(add_help=False)
+    seasons.add_argument(
+        "--seasons",
+        type=parse_seasons,
+        default=None,
+        help="comma-separated start years, season IDs or ranges, e.g. 2019-2023,2024 (default: all)",
+    )
+    incremental = argparse.ArgumentParser(add_help=False)
+    incremental.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only extract seasons not yet loaded into nhldb and only rebuild the newest model season",
+    )
+    extracting = argparse.ArgumentParser(add_help=False)
+    extracting.add_argument(
+        "--resume",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="resume the previous failed extract from its last checkpoint",
+    )
+    extracting.add_argument(
+        "--stream",
+        action="store_true",
+        help="load each season into nhldb while the next ones are being extracted",
+    )
+
+    commands = parser.add_subparsers(dest="command")
+    migrate = commands.add_parser(
+        "migrate",
+        help="create nhldb if needed and apply the pending schema migrations",
+    )
+    migrate.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="drop nhldb and rebuild it from scratch; every season must be loaded again",
+    )
+    migrate.add_argument(
+        "--partition",
+        action="store_true",
+        help="partition raw.season_stats by game type (regular season, playoffs)",
+    )
+    migrate.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="print what would be done without changing nhldb",
+    )
+    commands.add_parser(
+        "extract",
+        parents=[seasons, filters, incremental, extracting],
+        help="extract the NHL API and naturalstattrick.com data into the NHL_Data snapshot",
+    )
+    commands.add_parser(
+        "load",
+        parents=[seasons, filters],
+        help="load the NHL_Data snapshot into nhldb and add it to the snapshot store; with "
+        "--seasons or --game-types the snapshot is kept in place for further loads",
+    )
+    commands.add_parser(
+        "models",
+        parents=[filters, incremental],
+        help="build the cumulative models",
+    )
+    commands.add_parser(
+        "all",
+        parents=[seasons, filters, incremental, extracting],
+        help="extract, load, then store the snapshot and build the models concurrently",
+    )
+
+    return parser
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Run stages
+###########################################################################################################################################
+
+
+def run_command(args: argparse.Namespace) -> None:
+    """
+    Runs the stages of a subcommand. In 'all', the load overlaps the extract with --stream, and the
+    snapshot store and the cumulative models run concurrently once the load has finished.
+
+    A 'load' of only some seasons or game types does not store the snapshot, because storing it
+    removes it from the main snapshot directory and a later partial load would find nothing.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    from .Progress_Reporting.Progress_Reporting_NHL import get_reporter
+
+    seasons = getattr(args, "seasons", None)
+    incremental = getattr(args, "incremental", False)
+    stream = getattr(args, "stream", False)
+
+    if args.command == "migrate":
+        from .Create_Tables.Create_Tables_NHL import setup_database
+
+        with get_reporter().stage("migrate"):
+            setup_database(
+                rebuild=args.rebuild, partition=args.partition, dry_run=args.dry_run
+            )
+
+    if args.command in ("extract", "all"):
+        from .Extract_API_NHL_Data.API_Web_Scraper_NHL import extract
+
+        if stream and not args.dry_run:
+            from .Transform_Load.Transform_Load_NHL import BatchLoader
+
+        with get_reporter().stage("extract"):
+            extract(
+                incremental=incremental,
+                sinks=[BatchLoader()] if stream and not args.dry_run else None,
+                resume=args.resume,
+                seasons=seasons,
+                game_type_ids=args.game_types,
+                dry_run=args.dry_run,
+            )
+
+    if args.command == "models":
+        # The models only need psycopg2, so this stage does not import pandas
+        from .Create_Cumulative_Data_Model.Create_Cumulative_Models import (
+            build_cumulative_models,
+        )
+
+        build_cumulative_models(
+            incremental=incremental,
+            game_type_ids=args.game_types,
+            dry_run=args.dry_run,
+        )
+
+    if args.command in ("load", "all"):
+        from .Transform_Load.Transform_Load_NHL import transform_load
+
+        # extract() always writes every season, so only a partial 'load' keeps the snapshot
+        partial_load = args.command == "load" and (
+            seasons is not None or args.game_types is not None
+        )
+        if partial_load:
+            print("Partial load: the snapshot is kept in place and not stored")
+        # A dry run of 'all' extracts nothing, so there is no new snapshot to inspect
+        planned_snapshot = args.command == "all" and args.dry_run
+        if planned_snapshot:
+            print(
+                "Would load the extracted snapshot into nhldb and add it to the snapshot store"
+            )
+        transform_load(
+            incremental=incremental,
+            load=(args.command == "load" or not stream) and not planned_snapshot,
+            store=not partial_load and not planned_snapshot,
+            models=args.command == "all",
+            seasons=seasons,
+            game_type_ids=args.game_types,
+            dry_run=args.dry_run,
+        )
+
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the command line interface. Without a subcommand, the interactive pipeline runs.
+
+    Args:
+        argv (Optional[List[str]]): The arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: The exit code: 0 on success, 1 if a stage failed, 130 if interrupted.
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        if args.command is None:
+            interactive(resume=args.resume)
+        else:
+            run_command(args)
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        print(
+            "ETL failed: " + (str(e) or e.__class__.__name__),
+            file=sys.stderr,
+        )
+        return EXIT_FAILURE
+    finally:
+        # Close the shared nhldb pool if a stage connected through it
+        pool_module = sys.modules.get(__package__ + ".Database.Connection_Pool_NHL")
+        if pool_module is not None:
+            pool_module.close_pool()
+
+    return EXIT_SUCCESS
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import io
+from typing import Dict, List
+
+import pandas as pd
+import psycopg2 as ps
+from psycopg2 import sql
+
+from ..SQL_Queries.SQL_Queries import (
+    staging_table_copy,
+    staging_table_create,
+    staging_table_insert,
+    staging_table_upsert,
+)
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Bulk load a DataFrame through COPY
+###########################################################################################################################################
+
+
+def copy_dataframe(
+    df: pd.DataFrame, staging_table: str, cur: ps.extensions.cursor
+) -> None:
+    """
+    Streams a DataFrame into a table with COPY FROM STDIN in CSV format.
+
+    Args:
+        df (pd.DataFrame): The rows to copy; its column names must match the table's columns.
+        staging_table (str): The name of the table to copy into.
+        cur (ps.extensions.cursor): The database cursor.
+    """
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    query = sql.SQL(staging_table_copy).format(
+        staging_table=sql.Identifier(staging_table),
+        columns=sql.SQL(", ").join(map(sql.Identifier, df.columns)),
+    )
+    cur.copy_expert(query.as_string(cur), buffer)
+
+    return None
+
+
+def bulk_load_data(
+    df: pd.DataFrame,
+    table: str,
+    conflict_columns: List[str],
+    conn: ps.extensions.connection,
+    cur: ps.extensions.cursor,
+    update: bool = True,
+) -> Dict[str, int]:
+    """
+    Bulk loads a DataFrame into a raw table within a single transaction:
+      - Creates a temporary staging table shaped like the target table.
+      - Streams every row into the staging table with COPY.
+      - Upserts the staged rows into the target table on its primary key. Existing rows are
+        only rewritten when at least one value IS DISTINCT FROM the staged row, so reloading
+        the same data touches nothing.
+
+    Args:
+        df (pd.DataFrame): The rows to load; its column names must match the table's columns.
+        table (str): The schema-qualified target table (e.g. "raw.season_stats").
+        conflict_columns (List[str]): The primary key columns used to detect existing rows.
+        conn (ps.extensions.connection): The database connection.
+        cur (ps.extensions.cursor): The database cursor.
+        update (bool): Whether existing rows are updated (True) or left untouched (False).
+
+    Returns:
+        Dict[str, int]: The number of 'inserted', 'updated' and 'unchanged' rows.
+    """
+    schema_name, table_name = table.split(".")
+    staging_table = f"{table_name}_staging"
+    target = sql.Identifier(schema_name, table_name)
+    staging = sql.Identifier(staging_table)
+    columns = sql.SQL(", ").join(map(sql.Identifier, df.columns))
+    value_columns = [column for column in df.columns if column not in conflict_columns]
+    update_columns = sql.SQL(", ").join(
+        sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column))
+        for column in value_columns
+    )
+    target_columns = sql.SQL(", ").join(
+        sql.Identifier("target", column) for column in value_columns
+    )
+    excluded_columns = sql.SQL(", ").join(
+        sql.Identifier("excluded", column) for column in value_columns
+    )
+
+    try:
+        cur.execute(
+            sql.SQL(staging_table_create).format(staging_table=staging, table=target)
+        )
+        copy_dataframe(df=df, staging_table=staging_table, cur=cur)
+        cur.execute(
+            sql.SQL(staging_table_upsert if update else staging_table_insert).format(
+                table=target,
+                staging_table=staging,
+                columns=columns,
+                conflict_columns=sql.SQL(", ").join(
+                    map(sql.Identifier, conflict_columns)
+                ),
+                update_columns=update_columns,
+                target_columns=target_columns,
+                excluded_columns=excluded_columns,
+                existing_keys=sql.SQL(", ").join(
+                    sql.Identifier("existing", column) for column in conflict_columns
+                ),
+                written_keys=sql.SQL(", ").join(
+                    sql.Identifier("written", column) for column in conflict_columns
+                ),
+            )
+        )
+        written = [inserted for (inserted,) in cur.fetchall()]
+        conn.commit()
+    except ps.Error:
+        conn.rollback()
+        raise
+
+    inserted_count = sum(written)
+    counts = {
+        "inserted": inserted_count,
+        "updated": len(written) - inserted_count,
+        "unchanged": df.shape[0] - len(written),
+    }
+
+    return counts
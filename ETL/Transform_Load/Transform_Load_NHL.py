@@ -1,34 +1,38 @@
+import datetime
+import os
+import re
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
 import pandas as pd
 import psycopg2 as ps
 
-pd.set_option("display.max_rows", None)
-pd.set_option("display.max_columns", None)
-
-import warnings
+from .. import MAIN_SNAPSHOT_DIR, SNAPSHOT_STORE_EXPORT_DIR
+from ..Create_Cumulative_Data_Model.Create_Cumulative_Models import (
+    build_cumulative_models,
+)
+from ..Database.Connection_Pool_NHL import ConnectionPool, get_pool
+from ..Progress_Reporting.Progress_Reporting_NHL import ProgressReporter, get_reporter
+from ..Snapshot_Store.Snapshot_Delta_Store_NHL import (
+    SnapshotStore,
+    import_dated_snapshots,
+)
+from ..Snapshot_Store.Snapshot_Format_NHL import (
+    SNAPSHOT_EXTENSIONS,
+    find_snapshot,
+    read_snapshot,
+)
+from ..SQL_Queries.Season_Stats_Columns_NHL import (
+    season_stats_dtypes,
+    season_stats_value_columns,
+)
+from .Bulk_Load_NHL import bulk_load_data
 
 warnings.filterwarnings("ignore")
 
-import datetime
-import os
-import re
-import shutil
-import sys
-import time
-
-# Get the current working directory (the directory of the running script)
-current_dir = os.getcwd()
-# Add the target directory to the system path
-sys.path.append(os.path.abspath(os.path.join(current_dir, "SQL_Queries")))
-from SQL_Queries import *
-
-sys.path.append(
-    os.path.abspath(os.path.join(current_dir, "Create_Cumulative_Data_Model"))
-)
-from Create_Cumulative_Models import *
-from dotenv import load_dotenv
-
-load_dotenv()
-DB_PASSWORD = os.getenv("DB_PASSWORD")
+# Game type names in the snapshot's game_type column, by game type ID
+SNAPSHOT_GAME_TYPES = {2: "Regular Season", 3: "Playoffs"}
 
 
 ###########################################################################################################################################
@@ -36,32 +40,46 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 ###########################################################################################################################################
 
 
-def process_data() -> pd.DataFrame:
+def time_on_ice_seconds(time_on_ice: pd.Series) -> pd.Series:
+    """
+    Converts naturalstattrick.com time on ice ('MM:SS', e.g. '3721:04') to integer seconds.
+    Values that are already numeric (e.g. 0 for seasons without NST data) are kept as seconds.
+
+    Args:
+        time_on_ice (pd.Series): The time on ice column.
+
+    Returns:
+        pd.Series: Time on ice in seconds.
+    """
+    text = time_on_ice.astype(str).str.strip()
+    minutes_seconds = text.str.extract(r"^(\d+):(\d{1,2})$").astype(float)
+    seconds = minutes_seconds[0] * 60 + minutes_seconds[1]
+    seconds = seconds.fillna(pd.to_numeric(text, errors="coerce")).fillna(0)
+
+    return seconds.round().astype("int32")
+
+
+def transform_data(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Transforms the raw NHL season stats data by:
-      - Reading the CSV file containing NHL data.
+    Transforms raw NHL season stats rows (a full snapshot or one streamed season) by:
       - Formatting the season and game type columns.
       - Filling missing values with 0.
+      - Converting time on ice to integer seconds.
+      - Converting columns to the dtypes in the season stats column registry.
       - Reordering columns.
 
+    Args:
+        df (pd.DataFrame): The merged NHL API and naturalstattrick.com rows.
+
     Returns:
         pd.DataFrame: The processed DataFrame containing season and playoff stats.
     """
-    # Import NHL team season stats data frame
-    path = os.path.abspath(os.path.join(current_dir, "..", "..", "NHL_ML_Analysis"))
-    csv_list = []
-    for i in os.listdir(path):
-        # Select file with "NHL" in the name
-        if os.path.isfile(os.path.join(path, i)) and "NHL" in i:
-            csv_list.append(i)
-
-    # Convert CSV file to DataFrame (using the first matching file)
-    df = pd.read_csv(path + "\\" + str(csv_list[0]))
 
     # Define a helper function to format season numbers
     def format_number(number: str) -> str:
         return re.sub(r"(\d)(?=(\d{4})+(?!\d))", r"\1/", str(number))
 
+    df = df.copy()
     df["season_id"] = df["season_id"].astype(str)
     df["season"] = df["season_id"].apply(format_number)
 
@@ -71,7 +89,13 @@ def process_data() -> pd.DataFrame:
     # Fill all NaN values with 0
     df = df.fillna(0)
 
-    # Reorder columns
+    # Store time on ice as integer seconds
+    df["time_on_ice"] = time_on_ice_seconds(df["time_on_ice"])
+
+    # Convert every season stats column to its registry dtype in one pass
+    df = df.astype(season_stats_dtypes())
+
+    # Reorder columns: descriptive columns first, then the stats in raw.season_stats order
     df = df[
         [
             "season",
@@ -80,91 +104,69 @@ def process_data() -> pd.DataFrame:
             "game_type_id",
             "team_full_name",
             "team_id",
-            "faceoff_win_pct",
-            "games_played",
-            "goals_against",
-            "goals_against_per_game",
-            "goals_for",
-            "goals_for_per_game",
-            "losses",
-            "overtime_losses",
-            "penalty_kill_net_pct",
-            "penalty_kill_pct",
-            "points_pct",
-            "points",
-            "power_play_net_pct",
-            "power_play_pct",
-            "regulation_and_overtime_wins",
-            "shots_against_per_game",
-            "shots_for_per_game",
-            "ties",
-            "wins",
-            "wins_in_regulation",
-            "wins_in_shootout",
-            "time_on_ice",
-            "corsi_for",
-            "corsi_against",
-            "corsi_for_pct",
-            "fenwick_for",
-            "fenwick_against",
-            "fenwick_for_pct",
-            "shots_for",
-            "shots_against",
-            "shots_for_pct",
-            "goals_for_pct",
-            "expected_goals_for",
-            "expected_goals_against",
-            "expected_goals_for_pct",
-            "scoring_chances_for",
-            "scoring_chances_against",
-            "scoring_chances_for_pct",
-            "scoring_chances_shots_for",
-            "scoring_chances_shots_against",
-            "scoring_chances_shots_for_pct",
-            "scoring_chances_goals_for",
-            "scoring_chances_goals_against",
-            "scoring_chances_goals_for_pct",
-            "scoring_chances_shooting_pct",
-            "scoring_chances_save_pct",
-            "high_danger_chances_for",
-            "high_danger_chances_against",
-            "high_danger_chances_for_pct",
-            "high_danger_shots_for",
-            "high_danger_shots_against",
-            "high_danger_shots_for_pct",
-            "high_danger_goals_for",
-            "high_danger_goals_against",
-            "high_danger_goals_for_pct",
-            "high_danger_shooting_pct",
-            "high_danger_save_pct",
-            "medium_danger_chances_for",
-            "medium_danger_chances_against",
-            "medium_danger_chances_for_pct",
-            "medium_danger_shots_for",
-            "medium_danger_shots_against",
-            "medium_danger_shots_for_pct",
-            "medium_danger_goals_for",
-            "medium_danger_goals_against",
-            "medium_danger_goals_for_pct",
-            "medium_danger_shooting_pct",
-            "medium_danger_save_pct",
-            "low_danger_chances_for",
-            "low_danger_chances_against",
-            "low_danger_chances_for_pct",
-            "low_danger_shots_for",
-            "low_danger_shots_against",
-            "low_danger_shots_for_pct",
-            "low_danger_goals_for",
-            "low_danger_goals_against",
-            "low_danger_goals_for_pct",
-            "low_danger_shooting_pct",
-            "low_danger_save_pct",
-            "shooting_pct",
-            "save_pct",
-            "pdo_rating",
         ]
+        + [column.name for column in season_stats_value_columns()]
     ]
 
+    return df
+
+
+def read_rows(
+    snapshot_path: str,
+    columns: Optional[List[str]] = None,
+    seasons: Optional[Iterable[int]] = None,
+    game_type_ids: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """
+    Reads the raw rows of some seasons and game types from a snapshot. The filters are pushed down
+    to read_snapshot, so a partial load never reads the seasons it skips from a Parquet snapshot.
+
+    Args:
+        snapshot_path (str): The snapshot path.
+        columns (Optional[List[str]]): The columns to read. Defaults to every column.
+        seasons (Optional[Iterable[int]]): The season IDs to keep (e.g. 20232024). Defaults to every season.
+        game_type_ids (Optional[Iterable[int]]): The game type IDs to keep (2 = regular season,
+            3 = playoffs). Defaults to both.
+
+    Returns:
+        pd.DataFrame: The selected rows.
+    """
+    return read_snapshot(
+        snapshot_path,
+        columns=columns,
+        season_ids=seasons,
+        game_types=(
+            [SNAPSHOT_GAME_TYPES[i] for i in game_type_ids]
+            if game_type_ids is not None
+            else None
+        ),
+    )
+
+
+def process_data(
+    seasons: Optional[Iterable[int]] = None,
+    game_type_ids: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """
+    Reads the NHL_Data snapshot (Parquet, Arrow or CSV) and transforms it with transform_data.
+
+    Args:
+        seasons (Optional[Iterable[int]]): The season IDs to process. Defaults to every season.
+        game_type_ids (Optional[Iterable[int]]): The game type IDs to process. Defaults to both.
+
+    Returns:
+        pd.DataFrame: The processed DataFrame containing season and playoff stats.
+    """
+    # Import NHL team season stats data frame
+    snapshot_path = find_snapshot(MAIN_SNAPSHOT_DIR)
+    if snapshot_path is None:
+        raise FileNotFoundError(f"No NHL_Data snapshot found in {MAIN_SNAPSHOT_DIR}")
+
+    # Read the selected rows of the snapshot (Parquet, Arrow or CSV) into a DataFrame
+    df = transform_data(
+        read_rows(snapshot_path, seasons=seasons, game_type_ids=game_type_ids)
+    )
+
     print("Processed season stats data")
 
     return df
@@ -250,154 +252,293 @@ def season_stats_data(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def insert_teams_data(
-    teams_df: pd.DataFrame, conn: ps.extensions.connection, cur: ps.extensions.cursor
-) -> None:
+    teams_df: pd.DataFrame,
+    conn: ps.extensions.connection,
+    cur: ps.extensions.cursor,
+) -> Dict[str, int]:
     """
-    Inserts teams data line by line into the nhldb 'teams' table.
+    Bulk loads teams data into the nhldb 'teams' table through COPY in a single transaction.
+    Rows that already exist are left untouched, and the inserted/unchanged counts are reported.
 
     Args:
         teams_df (pd.DataFrame): DataFrame containing teams data.
         conn (ps.extensions.connection): The database connection.
         cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        Dict[str, int]: The inserted/updated/unchanged row counts; empty if the load failed.
     """
+    counts: Dict[str, int] = {}
     try:
-        count = 0
-        for index, row in teams_df.iterrows():
-            cur.execute(teams_table_insert, list(row))
-            conn.commit()
-            count += 1
-            print(
-                "Teams data inserted line-by-line into nhldb successfully " + str(count)
-            )
+        counts = bulk_load_data(
+            df=teams_df,
+            table="raw.teams",
+            conflict_columns=["team_id"],
+            conn=conn,
+            cur=cur,
+            update=False,
+        )
+        print(
+            "Teams data bulk loaded into nhldb successfully: "
+            + ", ".join(f"{key} {value}" for key, value in counts.items())
+        )
     except ps.Error as e:
         print("\n Error:")
         print(e)
     print("Columns inserted: " + str(teams_df.shape[1]))
 
-    return None
+    return counts
 
 
 def insert_season_data(
-    season_df: pd.DataFrame, conn: ps.extensions.connection, cur: ps.extensions.cursor
-) -> None:
+    season_df: pd.DataFrame,
+    conn: ps.extensions.connection,
+    cur: ps.extensions.cursor,
+) -> Dict[str, int]:
     """
-    Inserts season data line by line into the nhldb 'season' table.
+    Bulk loads season data into the nhldb 'season' table through COPY in a single transaction.
+    Rows that already exist are left untouched, and the inserted/unchanged counts are reported.
 
     Args:
         season_df (pd.DataFrame): DataFrame containing season data.
         conn (ps.extensions.connection): The database connection.
         cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        Dict[str, int]: The inserted/updated/unchanged row counts; empty if the load failed.
     """
+    counts: Dict[str, int] = {}
     try:
-        count = 0
-        for index, row in season_df.iterrows():
-            cur.execute(season_table_insert, list(row))
-            conn.commit()
-            count += 1
-            print(
-                "Season data inserted line-by-line into nhldb successfully "
-                + str(count)
-            )
+        counts = bulk_load_data(
+            df=season_df,
+            table="raw.season",
+            conflict_columns=["season_id"],
+            conn=conn,
+            cur=cur,
+            update=False,
+        )
+        print(
+            "Season data bulk loaded into nhldb successfully: "
+            + ", ".join(f"{key} {value}" for key, value in counts.items())
+        )
     except ps.Error as e:
         print("\n Error:")
         print(e)
     print("Columns inserted: " + str(season_df.shape[1]))
 
-    return None
+    return counts
 
 
 def insert_game_type_data(
     game_type_df: pd.DataFrame,
     conn: ps.extensions.connection,
     cur: ps.extensions.cursor,
-) -> None:
+) -> Dict[str, int]:
     """
-    Inserts game type data line by line into the nhldb 'game_type' table.
+    Bulk loads game type data into the nhldb 'game_type' table through COPY in a single transaction.
+    Rows that already exist are left untouched, and the inserted/unchanged counts are reported.
 
     Args:
         game_type_df (pd.DataFrame): DataFrame containing game type data.
         conn (ps.extensions.connection): The database connection.
         cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        Dict[str, int]: The inserted/updated/unchanged row counts; empty if the load failed.
     """
+    counts: Dict[str, int] = {}
     try:
-        count = 0
-        for index, row in game_type_df.iterrows():
-            cur.execute(game_type_table_insert, list(row))
-            conn.commit()
-            count += 1
-            print(
-                "Game type data inserted line-by-line into nhldb successfully "
-                + str(count)
-            )
+        counts = bulk_load_data(
+            df=game_type_df,
+            table="raw.game_type",
+            conflict_columns=["game_type_id"],
+            conn=conn,
+            cur=cur,
+            update=False,
+        )
+        print(
+            "Game type data bulk loaded into nhldb successfully: "
+            + ", ".join(f"{key} {value}" for key, value in counts.items())
+        )
     except ps.Error as e:
         print("\n Error:")
         print(e)
     print("Columns inserted: " + str(game_type_df.shape[1]))
 
-    return None
+    return counts
 
 
 def insert_season_stats_data(
     season_stats_df: pd.DataFrame,
     conn: ps.extensions.connection,
     cur: ps.extensions.cursor,
-) -> None:
+) -> Dict[str, int]:
     """
-    Inserts season stats data line by line into the nhldb 'season_stats' table.
+    Bulk loads season stats data into the nhldb 'season_stats' table through COPY in a single transaction.
+    Rows that already exist are only rewritten when their values changed, and the
+    inserted/updated/unchanged counts are reported.
 
     Args:
         season_stats_df (pd.DataFrame): DataFrame containing season statistics.
         conn (ps.extensions.connection): The database connection.
         cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        Dict[str, int]: The inserted/updated/unchanged row counts; empty if the load failed.
     """
+    counts: Dict[str, int] = {}
     try:
-        count = 0
-        for index, row in season_stats_df.iterrows():
-            cur.execute(season_stats_table_insert, list(row))
-            conn.commit()
-            count += 1
-            print(
-                "Season stats data inserted line-by-line into nhldb successfully "
-                + str(count)
-            )
+        counts = bulk_load_data(
+            df=season_stats_df,
+            table="raw.season_stats",
+            conflict_columns=["team_id", "season_id", "game_type_id"],
+            conn=conn,
+            cur=cur,
+            update=True,
+        )
+        print(
+            "Season stats data bulk loaded into nhldb successfully: "
+            + ", ".join(f"{key} {value}" for key, value in counts.items())
+        )
     except ps.Error as e:
         print("\n Error:")
         print(e)
     print("Columns inserted: " + str(season_stats_df.shape[1]))
 
-    return None
+    return counts
+
+
+def load_batch(
+    df: pd.DataFrame,
+    conn: ps.extensions.connection,
+    cur: ps.extensions.cursor,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Transforms and bulk loads a batch of raw rows (e.g. one streamed season) into every nhldb table,
+    dimension tables first so the season stats keys always resolve.
+
+    Args:
+        df (pd.DataFrame): The merged NHL API and naturalstattrick.com rows.
+        conn (ps.extensions.connection): The database connection.
+        cur (ps.extensions.cursor): The database cursor.
+
+    Returns:
+        Dict[str, Dict[str, int]]: The inserted/updated/unchanged row counts per table.
+    """
+    df = transform_data(df)
+
+    return {
+        "raw.teams": insert_teams_data(process_teams_data(df), conn=conn, cur=cur),
+        "raw.season": insert_season_data(process_season_data(df), conn=conn, cur=cur),
+        "raw.game_type": insert_game_type_data(
+            process_game_type_data(df), conn=conn, cur=cur
+        ),
+        "raw.season_stats": insert_season_stats_data(
+            season_stats_data(df), conn=conn, cur=cur
+        ),
+    }
+
+
+class BatchLoader:
+    """
+    A sink for streamed extracts that loads each batch into nhldb as soon as it arrives, so loading
+    overlaps with fetching the remaining seasons. Counts are summed per table across batches.
+
+    Each batch borrows a pooled connection only while it is loaded, so the extract's own queries
+    and other stages can use the pool in between.
+
+    Args:
+        connection_pool (Optional[ConnectionPool]): The nhldb pool. Defaults to the shared pool.
+        reporter (Optional[ProgressReporter]): Where progress events are sent. Defaults to the shared reporter.
+    """
+
+    def __init__(
+        self,
+        connection_pool: Optional[ConnectionPool] = None,
+        reporter: Optional[ProgressReporter] = None,
+    ) -> None:
+        self.connection_pool = connection_pool or get_pool()
+        self.reporter = reporter or get_reporter()
+        self.counts: Dict[str, Dict[str, int]] = {}
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Transforms and loads one batch.
+
+        Args:
+            df (pd.DataFrame): The merged NHL API and naturalstattrick.com rows.
+        """
+        with self.reporter.stage("load batch") as stage:
+            with self.connection_pool.connection() as conn, conn.cursor() as cur:
+                batch_counts = load_batch(df, conn=conn, cur=cur)
+            for table, counts in batch_counts.items():
+                if not counts:
+                    raise RuntimeError("load " + table + " failed; see the error above")
+                table_counts = self.counts.setdefault(table, {})
+                for key, value in counts.items():
+                    table_counts[key] = table_counts.get(key, 0) + value
+            stage.rows = df.shape[0]
+
+        return None
+
+    def close(self, success: bool = True) -> Dict[str, Dict[str, int]]:
+        """
+        Finishes the load; the connections stay in the pool for the following stages.
+
+        Args:
+            success (bool): Whether every batch was written; loaded batches are kept either way.
+
+        Returns:
+            Dict[str, Dict[str, int]]: The inserted/updated/unchanged row counts per table.
+        """
+        return self.counts
 
 
 ###########################################################################################################################################
-# NEW CODE BLOCK - Store CSV file
+# NEW CODE BLOCK - Store snapshot files
 ###########################################################################################################################################
 
 
 def store_data(main_file_search_path: str, prefix: str, store_export_path: str) -> None:
     """
-    Moves CSV files with the specified prefix from the main file search path to the export directory,
-    organizing them into a folder named with the current date.
+    Adds the loaded NHL_Data snapshot to the snapshot store under the current date, then removes the
+    snapshot files (Parquet, Arrow or CSV) with the specified prefix from the main file search path.
+
+    The store keeps one base plus per-date row-level deltas, so a day in which only the current season
+    changed costs kilobytes instead of a full copy. Full snapshots in older dated folders are imported
+    into the store first and left in place.
 
     Args:
         main_file_search_path (str): The directory where the files are located.
-        prefix (str): The prefix that identifies which files to move.
-        store_export_path (str): The target directory where files will be stored.
+        prefix (str): The prefix that identifies which files to store.
+        store_export_path (str): The directory holding the dated folders and the Snapshot_Store directory.
+
+    Raises:
+        Exception: If the snapshot could not be stored; the snapshot files are then left in place.
     """
-    files = [f for f in os.listdir(main_file_search_path) if f.startswith(prefix)]
-    if len(files) > 0:
+    snapshot_path = find_snapshot(main_file_search_path)
+    if snapshot_path is not None and os.path.basename(snapshot_path).startswith(prefix):
         try:
-            date_dir = os.path.join(
-                store_export_path, datetime.datetime.now().strftime("%Y-%m-%d")
+            store = SnapshotStore(os.path.join(store_export_path, "Snapshot_Store"))
+            for date in import_dated_snapshots(store, store_export_path):
+                print("Snapshot imported: " + date)
+            date = datetime.datetime.now().strftime("%Y-%m-%d")
+            counts = store.add(date, read_snapshot(snapshot_path))
+            print(
+                "Snapshot stored: "
+                + date
+                + " ("
+                + ", ".join(f"{key} {value}" for key, value in counts.items())
+                + ")"
             )
-            os.makedirs(date_dir, exist_ok=True)
-            for file in files:
-                shutil.move(
-                    os.path.join(main_file_search_path, file),
-                    os.path.join(date_dir, file),
-                )
-                print("CSV stored")
-        except Exception:
-            pass
+            for file in os.listdir(main_file_search_path):
+                if file.startswith(prefix) and file.endswith(
+                    tuple(SNAPSHOT_EXTENSIONS.values())
+                ):
+                    os.remove(os.path.join(main_file_search_path, file))
+        except Exception as e:
+            print("Snapshot not stored: " + str(e))
+            raise
     else:
         pass
 
@@ -405,111 +546,228 @@ def store_data(main_file_search_path: str, prefix: str, store_export_path: str)
 
 
 ###########################################################################################################################################
-# NEW CODE BLOCK - Run ETL pipeline
+# NEW CODE BLOCK - ETL stages
 ###########################################################################################################################################
 
 
-def transform_load(password: str = DB_PASSWORD) -> None:
+def load_snapshot(
+    conn: ps.extensions.connection,
+    cur: ps.extensions.cursor,
+    reporter: ProgressReporter,
+    seasons: Optional[Iterable[int]] = None,
+    game_type_ids: Optional[Iterable[int]] = None,
+) -> None:
     """
-    Executes the ETL pipeline:
-      - Connects to the 'nhldb' database.
-      - Processes raw season and playoff data.
-      - Processes individual tables (teams, season, game_type, season_stats).
-      - Inserts data into nhldb tables.
-      - Moves CSV files to the export directory.
-      - Creates cumulative data models for regular season and playoffs.
+    Processes the NHL_Data snapshot into the nhldb tables and bulk loads them, reporting how many
+    rows were inserted, updated or left unchanged per table.
 
     Args:
-        password (str): The database password. Defaults to DB_PASSWORD from environment variables.
+        conn (ps.extensions.connection): The database connection.
+        cur (ps.extensions.cursor): The database cursor.
+        reporter (ProgressReporter): Where progress events are sent.
+        seasons (Optional[Iterable[int]]): The season IDs to load. Defaults to every season.
+        game_type_ids (Optional[Iterable[int]]): The game type IDs to load. Defaults to both.
+    """
+    with reporter.stage("process data") as stage:
+        # Process season and playoff data
+        df = process_data(seasons=seasons, game_type_ids=game_type_ids)
+
+        # Process teams table
+        teams_df = process_teams_data(df=df)
+
+        # Process season table
+        season_df = process_season_data(df=df)
+
+        # Process game type table
+        game_type_df = process_game_type_data(df=df)
+
+        # Process season_stats table
+        season_stats_df = season_stats_data(df=df)
+        stage.rows = df.shape[0]
+
+    # Load each table, reporting how many rows were inserted, updated or left unchanged
+    for name, insert_function, table_df in (
+        ("load raw.teams", insert_teams_data, teams_df),
+        ("load raw.season", insert_season_data, season_df),
+        ("load raw.game_type", insert_game_type_data, game_type_df),
+        ("load raw.season_stats", insert_season_stats_data, season_stats_df),
+    ):
+        with reporter.stage(name) as stage:
+            counts = insert_function(table_df, conn=conn, cur=cur)
+            if not counts:
+                raise RuntimeError(name + " failed; see the error above")
+            stage.rows = table_df.shape[0]
+            stage.message = ", ".join(f"{key} {value}" for key, value in counts.items())
 
-    Returns:
-        None
+    return None
+
+
+def store_snapshot(reporter: ProgressReporter) -> None:
     """
-    # Connect to database
-    try:
-        conn = ps.connect(
-            f"""
-            host=localhost
-            dbname=nhldb
-            user=postgres
-            password={password}
-            """
+    Adds the loaded NHL_Data snapshot to the dated snapshot store.
+
+    Args:
+        reporter (ProgressReporter): Where progress events are sent.
+    """
+    with reporter.stage("store data"):
+        store_data(
+            main_file_search_path=MAIN_SNAPSHOT_DIR,
+            prefix="NHL",
+            store_export_path=SNAPSHOT_STORE_EXPORT_DIR,
         )
-        cur = conn.cursor()
-        print("Successfully connected to nhldb")
-    except ps.Error as e:
-        print("\n Database Error:")
-        print(e)
-        return
 
-    # Process season and playoff data
-    df = process_data()
+    return None
 
-    # Process teams table
-    teams_df = process_teams_data(df=df)
 
-    # Process season table
-    season_df = process_season_data(df=df)
+def print_transform_load_plan(
+    load: bool,
+    store: bool,
+    models: bool,
+    incremental: bool,
+    seasons: Optional[Iterable[int]],
+    game_type_ids: Optional[Iterable[int]],
+) -> None:
+    """
+    Prints what transform_load would do, without connecting to nhldb or changing any file. Like
+    the real run, a load without a snapshot fails.
 
-    # Process game type table
-    game_type_df = process_game_type_data(df=df)
+    Args:
+        load (bool): Whether the snapshot would be loaded.
+        store (bool): Whether the snapshot would be stored.
+        models (bool): Whether the cumulative models would be built.
+        incremental (bool): Whether the models would be built incrementally.
+        seasons (Optional[Iterable[int]]): The season IDs that would be loaded.
+        game_type_ids (Optional[Iterable[int]]): The game type IDs that would be loaded and modelled.
+
+    Raises:
+        FileNotFoundError: If a load is planned and there is no NHL_Data snapshot.
+    """
+    snapshot_path = find_snapshot(MAIN_SNAPSHOT_DIR)
+    if load and snapshot_path is None:
+        raise FileNotFoundError(f"No NHL_Data snapshot found in {MAIN_SNAPSHOT_DIR}")
+    if load or store:
+        print("Snapshot: " + str(snapshot_path))
+    if load:
+        rows = read_rows(
+            snapshot_path,
+            columns=["season_id"],
+            seasons=seasons,
+            game_type_ids=game_type_ids,
+        ).shape[0]
+        print("Would load into nhldb: " + str(rows) + " rows")
+    if store:
+        print("Would add the snapshot to the snapshot store")
+    if models:
+        build_cumulative_models(
+            incremental=incremental, game_type_ids=game_type_ids, dry_run=True
+        )
 
-    # Process season_stats table
-    season_stats_df = season_stats_data(df=df)
+    return None
 
-    # Give operator time to scan the event
-    print("Loading...")
-    time.sleep(5)
 
-    # Insert teams data
-    insert_teams_data(teams_df=teams_df, conn=conn, cur=cur)
-    print("Loading...")
-    time.sleep(5)
+###########################################################################################################################################
+# NEW CODE BLOCK - Run ETL pipeline
+###########################################################################################################################################
 
-    # Insert season data
-    insert_season_data(season_df=season_df, conn=conn, cur=cur)
-    print("Loading...")
-    time.sleep(5)
 
-    # Insert game type data
-    insert_game_type_data(game_type_df=game_type_df, conn=conn, cur=cur)
-    print("Loading...")
-    time.sleep(5)
+def transform_load(
+    connection_pool: Optional[ConnectionPool] = None,
+    incremental: bool = False,
+    reporter: Optional[ProgressReporter] = None,
+    load: bool = True,
+    store: bool = True,
+    models: bool = True,
+    seasons: Optional[Iterable[int]] = None,
+    game_type_ids: Optional[Iterable[int]] = None,
+    dry_run: bool = False,
+) -> None:
+    """
+    Executes the ETL pipeline:
+      - Borrows a connection to the 'nhldb' database from the pool.
+      - Processes raw season and playoff data.
+      - Processes individual tables (teams, season, game_type, season_stats).
+      - Bulk loads data into nhldb tables.
+      - Adds the snapshot to the dated snapshot store and creates the cumulative data models for
+        regular season and playoffs. Both only depend on the load, so they run concurrently.
 
-    # Insert season_stats data
-    insert_season_stats_data(season_stats_df=season_stats_df, conn=conn, cur=cur)
-    print("Loading...")
-    time.sleep(5)
+    Every stage reports start/end events with row counts and durations to the progress
+    reporter, so operators can follow the run without the pipeline pausing.
 
-    # Store CSV file
-    store_data(
-        main_file_search_path=os.path.abspath(
-            os.path.join(current_dir, "..", "..", "NHL_ML_Analysis")
-        ),
-        prefix="NHL",
-        store_export_path=os.path.abspath(
-            os.path.join(current_dir, "..", "..", r"NHL_ML_Analysis\ETL\NHL_Data")
-        ),
-    )
+    Args:
+        connection_pool (Optional[ConnectionPool]): The nhldb pool the load and the models connect
+            through. Defaults to the shared pool.
+        incremental (bool): Whether the cumulative models only rebuild their newest season and append missing ones.
+        reporter (Optional[ProgressReporter]): Where progress events are sent. Defaults to the shared reporter.
+        load (bool): Whether to process and load the snapshot; False when extract() already streamed
+            every season into nhldb, so only the snapshot is stored and the models are built.
+        store (bool): Whether to add the snapshot to the snapshot store.
+        models (bool): Whether to build the cumulative models.
+        seasons (Optional[Iterable[int]]): The season IDs to load. Defaults to every season.
+        game_type_ids (Optional[Iterable[int]]): The game type IDs to load and model. Defaults to both.
+        dry_run (bool): Whether to only print what would be done.
 
-    print("Working on creating cumulative data models")
+    Returns:
+        None
 
-    # Create cumulative models for regular season and playoffs
-    create_team_stats_cumulative_regular_season_model(conn=conn, cur=cur)
-    create_team_stats_cumulative_playoffs_model(conn=conn, cur=cur)
+    Raises:
+        ps.Error: If nhldb cannot be reached or a load fails.
+        Exception: The first failure of the store or model stages, after both have finished.
+    """
+    reporter = reporter or get_reporter()
+    seasons = list(seasons) if seasons is not None else None
+    game_type_ids = list(game_type_ids) if game_type_ids is not None else None
+
+    if dry_run:
+        print_transform_load_plan(
+            load=load,
+            store=store,
+            models=models,
+            incremental=incremental,
+            seasons=seasons,
+            game_type_ids=game_type_ids,
+        )
+        return None
 
-    print(
-        """Cumulative data models complete:
-          - Regular Season Team Stats
-          - Playoffs Teams Stats
-        """
-    )
+    connection_pool = connection_pool or get_pool()
 
-    conn.close()
-    print("nhldb connection closed")
+    # Process and load the snapshot, unless the extract already streamed it into nhldb. The
+    # connection goes back to the pool before the models borrow theirs
+    if load:
+        try:
+            with connection_pool.connection() as conn, conn.cursor() as cur:
+                print("Successfully connected to nhldb")
+                load_snapshot(
+                    conn=conn,
+                    cur=cur,
+                    reporter=reporter,
+                    seasons=seasons,
+                    game_type_ids=game_type_ids,
+                )
+        except ps.OperationalError as e:
+            print("\n Database Error:")
+            print(e)
+            raise
+
+    # Store the snapshot and build the models concurrently; neither depends on the other
+    stages: List[Callable[[], None]] = []
+    if store:
+        stages.append(lambda: store_snapshot(reporter=reporter))
+    if models:
+        stages.append(
+            lambda: build_cumulative_models(
+                connection_pool=connection_pool,
+                reporter=reporter,
+                incremental=incremental,
+                game_type_ids=game_type_ids,
+            )
+        )
+    with ThreadPoolExecutor(max_workers=max(len(stages), 1)) as executor:
+        futures = [executor.submit(stage) for stage in stages]
+    errors = [future.exception() for future in futures if future.exception()]
+    if errors:
+        raise errors[0]
 
     return None
 
 
-if __name__ == "__main__":
-    transform_load()
+# Run the load with `python -m ETL load`; this module uses package-relative imports
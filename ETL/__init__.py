@@ -0,0 +1,17 @@
+import os
+
+###########################################################################################################################################
+# NEW CODE BLOCK - ETL paths
+###########################################################################################################################################
+
+# The ETL directory; data paths are resolved from it, so the pipeline runs from any working directory
+ETL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The directory extract() writes the NHL_Data snapshot to and the ETL process loads it from: the
+# repository root, unless the NHL_SNAPSHOT_DIR environment variable names another directory
+MAIN_SNAPSHOT_DIR = os.path.abspath(
+    os.environ.get("NHL_SNAPSHOT_DIR") or os.path.dirname(ETL_DIR)
+)
+
+# The directory holding the dated NHL_Data snapshots and the Snapshot_Store directory
+SNAPSHOT_STORE_EXPORT_DIR = os.path.join(ETL_DIR, "NHL_Data")
@@ -0,0 +1,6 @@
+import sys
+
+from .Start_ETL import main
+
+# python -m ETL [command] runs the same command line as Start_ETL.py
+sys.exit(main())
@@ -0,0 +1,56 @@
+import re
+
+from ETL.SQL_Queries.Migration_Schemas_NHL import (
+    V2_INFORMATION_SCHEMA_TYPES,
+    V2_SEASON_STATS_TYPES,
+    v1_season_stats_table_create,
+    v2_compact_types_alter,
+)
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Version 2 compact types
+###########################################################################################################################################
+
+
+def version_1_column_types():
+    """
+    Returns:
+        dict: The information_schema data_type of every raw.season_stats column created by version 1.
+    """
+    information_schema_types = {
+        "int": "integer",
+        "float": "double precision",
+        "varchar": "character varying",
+    }
+    return {
+        name: information_schema_types[sql_type]
+        for name, sql_type in re.findall(
+            r"^\s+(\w+) (\w+) NOT NULL", v1_season_stats_table_create, re.M
+        )
+    }
+
+
+def test_compact_types_alter_converts_the_version_1_layout():
+    query = v2_compact_types_alter(version_1_column_types())
+
+    assert query.count("ALTER COLUMN") == len(V2_SEASON_STATS_TYPES)
+    assert "SPLIT_PART(time_on_ice, ':', 1)" in query
+    assert "ALTER COLUMN wins TYPE smallint USING ROUND(wins)::smallint" in query
+
+
+def test_compact_types_alter_only_converts_columns_not_yet_compact():
+    column_types = version_1_column_types()
+    column_types.update(
+        {
+            name: V2_INFORMATION_SCHEMA_TYPES[sql_type]
+            for name, sql_type in V2_SEASON_STATS_TYPES
+        }
+    )
+
+    assert v2_compact_types_alter(column_types) is None
+
+    column_types["corsi_for"] = "double precision"
+    query = v2_compact_types_alter(column_types)
+
+    assert query.count("ALTER COLUMN") == 1
+    assert "ALTER COLUMN corsi_for TYPE smallint" in query
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from ETL.Extract_API_NHL_Data.Normalize_Data_NHL import normalize_nst_data
+from ETL.Extract_API_NHL_Data.Table_Parser_NHL import parse_team_table
+from ETL.SQL_Queries.Season_Stats_Columns_NHL import (
+    SEASON_STATS_COLUMNS,
+    renamed_columns_nst,
+)
+
+###########################################################################################################################################
+# NEW CODE BLOCK - naturalstattrick.com page fixture
+###########################################################################################################################################
+
+# naturalstattrick.com headers of the registry columns, in registry order
+NST_HEADERS = [column.nst_name for column in SEASON_STATS_COLUMNS if column.nst_name]
+
+
+def team_table_html():
+    """
+    Builds a naturalstattrick.com page with a two-team table#teams: every stat is 55.5 except
+    TOI, and the second team's CF% is missing ('-').
+
+    Returns:
+        str: The page source.
+    """
+    teams = ["St. Louis Blues", "Montréal Canadiens"]
+
+    def cell(header, row):
+        if header == "TOI":
+            return "3721:04"
+        if header == "CF%" and row == 1:
+            return "-"
+        return "55.5"
+
+    head = "".join(f"<th>{header}</th>" for header in ["", "Team"] + NST_HEADERS)
+    body = "".join(
+        f"<tr><td>{row + 1}</td><td>{team}</td>"
+        + "".join(f"<td>{cell(header, row)}</td>" for header in NST_HEADERS)
+        + "</tr>"
+        for row, team in enumerate(teams)
+    )
+
+    return (
+        "<html><body><table id='teams'>"
+        f"<thead><tr>{head}</tr></thead><tbody>{body}</tbody>"
+        "</table></body></html>"
+    )
+
+
+def renamed_team_table(df):
+    """
+    Adds the season and game type and drops the rank column as natural_statrick_season_data
+    does, then renames the columns.
+
+    Args:
+        df (pd.DataFrame): The parsed team table.
+
+    Returns:
+        pd.DataFrame: The frame normalize_nst_data receives during extract.
+    """
+    df = df.drop(columns=["Column_0"])
+    df["Season"] = "20232024"
+    df["GameType"] = "Playoffs"
+
+    return df.rename(columns=renamed_columns_nst())
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Parser output through normalization
+###########################################################################################################################################
+
+
+def test_normalize_nst_data_accepts_parsed_team_table():
+    parsed = parse_team_table(team_table_html())
+    assert pd.api.types.is_float_dtype(parsed["CF%"])
+
+    df = normalize_nst_data(renamed_team_table(parsed))
+
+    assert df["team"].tolist() == ["St Louis Blues", "Montreal Canadiens"]
+    assert df["season"].tolist() == [20232024, 20232024]
+    assert df["games_played"].tolist() == [55.5, 55.5]
+    assert np.allclose(df["corsi_for_pct"], [0.555, 0.0])
+    assert df["time_on_ice"].tolist() == ["3721:04", "3721:04"]
+
+
+def test_normalize_nst_data_typed_and_text_input_agree():
+    parsed = parse_team_table(team_table_html())
+    text = parsed.astype(str).replace("nan", "-")
+
+    typed_df = normalize_nst_data(renamed_team_table(parsed))
+    text_df = normalize_nst_data(renamed_team_table(text))
+
+    pd.testing.assert_frame_equal(typed_df, text_df, check_dtype=False)
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from ETL.Snapshot_Store.Snapshot_Delta_Store_NHL import SnapshotStore, diff_frames
+
+###########################################################################################################################################
+# NEW CODE BLOCK - Snapshot fixtures
+###########################################################################################################################################
+
+
+def snapshot(time_on_ice):
+    """
+    Builds a two-team snapshot whose first team has the given time on ice.
+
+    Args:
+        time_on_ice: The first team's time_on_ice (a string or pd.NA).
+
+    Returns:
+        pd.DataFrame: The snapshot, with time_on_ice as a pandas 'string' column.
+    """
+    return pd.DataFrame(
+        {
+            "team_id": [1, 2],
+            "season_id": [20242025, 20242025],
+            "game_type": pd.array(["Regular Season", "Regular Season"], dtype="string"),
+            "wins": [10, 12],
+            "time_on_ice": pd.array([time_on_ice, "11:00"], dtype="string"),
+        }
+    )
+
+
+###########################################################################################################################################
+# NEW CODE BLOCK - One-sided missing values
+###########################################################################################################################################
+
+
+@pytest.mark.parametrize("old_value, new_value", [(pd.NA, "12:00"), ("12:00", pd.NA)])
+def test_diff_frames_one_sided_na_in_string_column(old_value, new_value):
+    diff = diff_frames(snapshot(old_value), snapshot(new_value))
+
+    assert diff["changed"]["team_id"].tolist() == [1]
+    assert diff["added"].empty and diff["removed"].empty
+
+
+def test_diff_frames_na_on_both_sides_is_unchanged():
+    diff = diff_frames(snapshot(pd.NA), snapshot(pd.NA))
+
+    assert diff["changed"].empty
+
+
+@pytest.mark.parametrize("old_value, new_value", [(pd.NA, "12:00"), ("12:00", pd.NA)])
+def test_store_view_returns_one_sided_na_change(tmp_path, old_value, new_value):
+    store = SnapshotStore(str(tmp_path))
+    store.add("2025-01-01", snapshot(old_value))
+    counts = store.add("2025-01-02", snapshot(new_value))
+    view = store.view("2025-01-02")
+
+    assert counts["changed"] == 1
+    assert view.loc[view["team_id"] == 1, "time_on_ice"].isna().item() == pd.isna(
+        new_value
+    )
+    if not pd.isna(new_value):
+        assert view.loc[view["team_id"] == 1, "time_on_ice"].item() == new_value